@@ -1,17 +1,63 @@
 import { NextRequest } from 'next/server';
 import { randomUUID } from 'node:crypto';
-import { spawn } from 'node:child_process';
-import path from 'node:path';
-import { createSession, setMetrics, setSnapshot, appendLog, updateSession } from '@/lib/sessionStore';
-import { emitSessionEvent } from '@/lib/eventBus';
-import { OrchestrateRequest, StreamEvent, TournamentSnapshot } from '@/lib/types';
+import { createSession, getSession } from '@/lib/sessionStore';
+import { cancelSession, submitSession } from '@/lib/orchestratorWorker';
+import { OrchestrateRequest } from '@/lib/types';
 import { evaluatePolicy } from '@/lib/policy';
 
 export const runtime = 'nodejs';
 
+// Payload keys the orchestrator accepts from clients. Server-side settings
+// (evaluator, checkpoint location) come from the worker's environment.
+const FORWARDED_KEYS = [
+  'task',
+  'mode',
+  'variants',
+  'seed',
+  'keyframeInterval',
+  'evaluationTimeout',
+  'artifacts',
+  'cache',
+  'trace',
+  'profile',
+  'traceAllocations',
+  'checkpointInterval',
+  'resume',
+  'islands',
+  'migrationInterval',
+  'migrants',
+  'topology',
+  'broker',
+  'racing',
+  'eta',
+  'budgetUsd',
+  'budgetEvaluations',
+  'surrogate',
+  'weights',
+  'mutationWorkers'
+];
+
+// Checkpoints are keyed by session id, so a resume must name the session it continues.
+const SESSION_ID = /^[A-Za-z0-9_-]+$/;
+
+function forwardedPayload(body: Record<string, unknown>) {
+  return Object.fromEntries(FORWARDED_KEYS.filter((key) => key in body).map((key) => [key, body[key]]));
+}
+
 export async function POST(request: NextRequest) {
   const body = (await request.json()) as OrchestrateRequest;
-  const sessionId = randomUUID();
+  let sessionId: string = randomUUID();
+  if (body.resume === true) {
+    if (typeof body.sessionId !== 'string' || !SESSION_ID.test(body.sessionId)) {
+      return new Response(JSON.stringify({ error: 'resume requires a sessionId matching [A-Za-z0-9_-]+' }), {
+        status: 400
+      });
+    }
+    if (getSession(body.sessionId)?.status === 'pending') {
+      return new Response(JSON.stringify({ error: 'Session is still running' }), { status: 409 });
+    }
+    sessionId = body.sessionId;
+  }
 
   const policyCheck = evaluatePolicy({ mode: body.mode, tool: 'openai', costEstimateUsd: body.variants * 0.5 });
   if (!policyCheck.allowed) {
@@ -19,56 +65,16 @@ export async function POST(request: NextRequest) {
   }
 
   createSession(sessionId);
-
-  const scriptPath = path.join(process.cwd(), 'orchestrator_py', 'runner_entry.py');
-  const python = spawn('python', [scriptPath], {
-    env: { ...process.env, SESSION_ID: sessionId },
-    stdio: ['pipe', 'pipe', 'pipe']
-  });
-
-  python.stdin.write(JSON.stringify(body));
-  python.stdin.end();
-
-  python.stdout.on('data', (chunk: Buffer) => {
-    const lines = chunk.toString().split('\n').filter(Boolean);
-    lines.forEach((line) => {
-      try {
-        const event = JSON.parse(line) as StreamEvent;
-        if (event.type === 'graph') {
-          const snapshot = event.payload as TournamentSnapshot;
-          setSnapshot(sessionId, snapshot);
-        }
-        if (event.type === 'metric') {
-          setMetrics(sessionId, event.payload as { name: string; value: number; unit?: string }[]);
-        }
-        if (event.type === 'log') {
-          appendLog(sessionId, String(event.payload));
-        }
-        if (event.type === 'complete') {
-          updateSession(sessionId, { status: 'complete' });
-        }
-        emitSessionEvent(sessionId, event);
-      } catch (error) {
-        console.error('Failed to parse orchestrator event', error);
-      }
-    });
-  });
-
-  python.stderr.on('data', (chunk: Buffer) => {
-    const message = chunk.toString();
-    appendLog(sessionId, message);
-    const event: StreamEvent = { type: 'log', payload: message };
-    emitSessionEvent(sessionId, event);
-  });
-
-  python.on('exit', (code) => {
-    if (code !== 0) {
-      const message = `Orchestrator exited with code ${code}`;
-      updateSession(sessionId, { status: 'error', errorMessage: message });
-      const event: StreamEvent = { type: 'error', payload: message };
-      emitSessionEvent(sessionId, event);
-    }
-  });
+  submitSession(sessionId, forwardedPayload(body as unknown as Record<string, unknown>) as OrchestrateRequest);
 
   return Response.json({ sessionId });
 }
+
+export async function DELETE(request: NextRequest) {
+  const sessionId = new URL(request.url).searchParams.get('sessionId');
+  if (!sessionId) {
+    return new Response('sessionId required', { status: 400 });
+  }
+  cancelSession(sessionId);
+  return Response.json({ sessionId, status: 'cancelling' });
+}
@@ -8,7 +8,15 @@ import { MetricsPanel } from '@/components/graph/MetricsPanel';
 import { VersionGraph } from '@/components/graph/VersionGraph';
 import { VersionInspector } from '@/components/inspector/VersionInspector';
 import { streamSession } from '@/lib/api';
-import { AgentMetric, OrchestratorMode, StreamEvent, TournamentSnapshot, VersionNode } from '@/lib/types';
+import { applyGraphDelta } from '@/lib/graphDelta';
+import {
+  AgentMetric,
+  OrchestratorMode,
+  StreamEvent,
+  TournamentDelta,
+  TournamentSnapshot,
+  VersionNode
+} from '@/lib/types';
 import toast, { Toaster } from 'react-hot-toast';
 import { ResizablePanel, ResizablePanelGroup, ResizableHandle } from 'react-resizable-panels';
 
@@ -34,6 +42,10 @@ export default function Home() {
     const disconnect = streamSession(sessionId, (event: StreamEvent) => {
       if (event.type === 'graph') {
         setSnapshot(event.payload as TournamentSnapshot);
+      } else if (event.type === 'graph_delta') {
+        setSnapshot(
+          (current) => applyGraphDelta(current, event.payload as TournamentDelta) ?? current
+        );
       } else if (event.type === 'log') {
         setLogLines((lines) => [...lines.slice(-200), String(event.payload)]);
       } else if (event.type === 'metric') {
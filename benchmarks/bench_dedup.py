@@ -0,0 +1,77 @@
+"""Near-duplicate filtering throughput for the patent pipeline's idea pool.
+
+Builds a synthetic pool of ``--pool`` unit vectors drawn around
+``--pool / --cluster`` centres and times ``DedupEngine`` (FAISS and NumPy
+backends) against the per-pair Python loop it replaced. The loop is only run
+up to ``--loop-max`` ideas; every engine result is checked against it where
+both ran.
+
+    python benchmarks/bench_dedup.py --pool 1000 10000 30000 --dim 256
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from patentgen.dedup import DedupEngine  # noqa: E402
+
+THRESHOLD = 0.92
+
+
+def pool(size: int, dim: int, cluster: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((max(1, size // cluster), dim)).astype(np.float32)
+    vectors = centres[rng.integers(0, len(centres), size)] + 0.02 * rng.standard_normal((size, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def python_loop(vectors: np.ndarray) -> list:
+    used: list = []
+    for idx in range(len(vectors)):
+        if any(float(np.dot(vectors[idx], vectors[j])) > THRESHOLD for j in used):
+            continue
+        used.append(idx)
+    return used
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool", type=int, nargs="+", default=[1000, 10_000, 30_000])
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--cluster", type=int, default=4, help="mean ideas per near-duplicate cluster")
+    parser.add_argument("--loop-max", type=int, default=3000)
+    args = parser.parse_args()
+    results = []
+    for size in args.pool:
+        vectors = pool(size, args.dim, args.cluster)
+        row = {"pool": size, "dim": args.dim}
+        reference = None
+        if size <= args.loop_max:
+            reference, row["python_loop_s"] = timed(python_loop, vectors)
+        for backend in ("faiss", "numpy"):
+            engine = DedupEngine(THRESHOLD, backend=backend)
+            kept, row[f"{backend}_s"] = timed(engine.add, vectors)
+            if reference is not None:
+                row[f"{backend}_matches_loop"] = kept == reference
+            row["kept"] = len(kept)
+            row["largest_cluster"] = engine.report()["largest_cluster"]
+        results.append(row)
+    print(json.dumps({"results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Bytes and latency per iteration for full graph snapshots versus graph deltas.
+
+Each iteration rescores a fixed fraction of the population, then encodes the
+graph both as a full snapshot (the pre-delta protocol) and as the event the
+``GraphDiffer`` would send, serializing each with ``json.dumps``.
+
+    python benchmarks/bench_graph_delta.py --sizes 100 1000 10000 --changed 0.05 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from orchestrator_py.graph import GraphDiffer  # noqa: E402
+from orchestrator_py.population import PopulationStore  # noqa: E402
+
+
+def bench(size: int, changed: float, iterations: int, keyframe_interval: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    store = PopulationStore.random(size, rng)
+    differ = GraphDiffer(mode="SAFE", keyframe_interval=keyframe_interval)
+    full_encoder = GraphDiffer(mode="SAFE")
+    differ.next_event(store, [])
+
+    full_bytes = delta_bytes = 0
+    full_seconds = delta_seconds = 0.0
+    touched = max(1, int(size * changed))
+    for _ in range(iterations):
+        rows = rng.choice(size, size=touched, replace=False)
+        store.scores[rows, 0] = rng.uniform(0, 1, size=touched).astype(np.float32)
+
+        started = time.perf_counter()
+        full_bytes += len(json.dumps(full_encoder.snapshot(store, [])))
+        full_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        _, payload = differ.next_event(store, [])
+        delta_bytes += len(json.dumps(payload))
+        delta_seconds += time.perf_counter() - started
+
+    return {
+        "population": size,
+        "changed_fraction": changed,
+        "full_bytes_per_iter": full_bytes // iterations,
+        "delta_bytes_per_iter": delta_bytes // iterations,
+        "full_ms_per_iter": full_seconds / iterations * 1000,
+        "delta_ms_per_iter": delta_seconds / iterations * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--changed", type=float, nargs="+", default=[0.05, 0.5])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--keyframe-interval", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+    results = [
+        bench(size, changed, args.iterations, args.keyframe_interval, args.seed)
+        for size in args.sizes
+        for changed in args.changed
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Reproducible benchmarks for the orchestrator hot paths.
+
+Sweeps population sizes with a fixed seed and times each case, recording best
+and mean wall time, throughput (items per second), peak traced memory and the
+bytes written to the event stream. Results are written as JSON (by default to
+``benchmarks/results/<git-sha>.json``) so two commits can be compared:
+
+    python benchmarks/bench_hot_paths.py
+    python benchmarks/bench_hot_paths.py --sizes 10 1000 --cases mutate emit_graph_delta
+    python benchmarks/bench_hot_paths.py --compare benchmarks/results/<base>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from orchestrator_py.config import Mode, OrchestrateSpec, Settings  # noqa: E402
+from orchestrator_py.graph import GraphDiffer  # noqa: E402
+from orchestrator_py.orchestrator import TournamentOrchestrator  # noqa: E402
+from orchestrator_py.ranking import Leaderboard, pareto_front  # noqa: E402
+from orchestrator_py.util.events import BufferedSink, EventEmitter, StreamSink  # noqa: E402
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000]
+SEED = 20240601
+# Keep a full sweep to a few minutes: repeat small cases more often.
+TIME_BUDGET_ITEMS = 200_000
+
+
+class CountingStream:
+    """Write-only text stream that discards data and counts bytes."""
+
+    def __init__(self) -> None:
+        self.bytes = 0
+
+    def write(self, text: str) -> int:
+        self.bytes += len(text.encode())
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def make_orchestrator(size: int, stream: CountingStream) -> TournamentOrchestrator:
+    spec = OrchestrateSpec(task="bench", mode=Mode.POWER, variants=size, seed=SEED, session_id="bench")
+    emitter = EventEmitter(session_id="bench", sink=StreamSink(stream))
+    return TournamentOrchestrator(spec=spec, settings=Settings.from_env(), emitter=emitter)
+
+
+# Each case factory returns (setup, run): ``setup`` prepares fresh state outside
+# the timed region and returns the argument ``run`` is timed on.
+Case = Tuple[Callable[[], Any], Callable[[Any], Any]]
+
+
+def case_initial_population(size: int, stream: CountingStream) -> Case:
+    orchestrator = make_orchestrator(size, stream)
+    return (lambda: None), (lambda _: orchestrator._initial_population())
+
+
+def case_mutate(size: int, stream: CountingStream) -> Case:
+    orchestrator = make_orchestrator(size, stream)
+    population = orchestrator._initial_population()
+    return (lambda: population), orchestrator._mutate
+
+
+def case_emit_graph_snapshot(size: int, stream: CountingStream) -> Case:
+    orchestrator = make_orchestrator(size, stream)
+    population = orchestrator._initial_population()
+
+    def setup() -> Any:
+        orchestrator.graph = GraphDiffer(mode=orchestrator.spec.mode.value)
+        return population
+
+    return setup, orchestrator._emit_graph
+
+
+def case_emit_graph_delta(size: int, stream: CountingStream) -> Case:
+    orchestrator = make_orchestrator(size, stream)
+    population = orchestrator._initial_population()
+    orchestrator.graph = GraphDiffer(mode=orchestrator.spec.mode.value, keyframe_interval=10**9)
+    orchestrator._emit_graph(population)
+
+    def setup() -> Any:
+        return orchestrator._mutate(population, 1)
+
+    return setup, orchestrator._emit_graph
+
+
+def case_summary_metrics(size: int, stream: CountingStream) -> Case:
+    orchestrator = make_orchestrator(size, stream)
+    population = orchestrator._initial_population()
+    return (lambda: population), orchestrator._summary_metrics
+
+
+def case_composite(size: int, stream: CountingStream) -> Case:
+    orchestrator = make_orchestrator(size, stream)
+    population = orchestrator._initial_population()
+    vectors = [candidate.score for candidate in population.candidates()]
+    return (lambda: vectors), (lambda items: [vector.composite for vector in items])
+
+
+def case_composite_batch(size: int, stream: CountingStream) -> Case:
+    orchestrator = make_orchestrator(size, stream)
+    population = orchestrator._initial_population()
+    return (lambda: population), (lambda store: store.composite())
+
+
+def case_leaderboard_update(size: int, stream: CountingStream) -> Case:
+    orchestrator = make_orchestrator(size, stream)
+    population = orchestrator._initial_population()
+    board = Leaderboard(population.composite())
+    rows = np.random.default_rng(SEED).integers(0, size, size=size)
+    keys = np.random.default_rng(SEED + 1).uniform(0, 1, size=size)
+
+    def run(_: Any) -> None:
+        for row, key in zip(rows.tolist(), keys.tolist()):
+            board.update(row, key)
+        board.top(5)
+
+    return (lambda: None), run
+
+
+def case_pareto_front(size: int, stream: CountingStream) -> Case:
+    orchestrator = make_orchestrator(size, stream)
+    population = orchestrator._initial_population()
+    return (lambda: population.scores), pareto_front
+
+
+def _node_records(size: int) -> List[Dict[str, Any]]:
+    orchestrator = make_orchestrator(size, CountingStream())
+    population = orchestrator._initial_population()
+    differ = GraphDiffer(mode=orchestrator.spec.mode.value)
+    return [differ.node(population, row) for row in range(size)]
+
+
+def case_emitter_stream(size: int, stream: CountingStream) -> Case:
+    records = _node_records(size)
+    emitter = EventEmitter(session_id="bench", sink=StreamSink(stream))
+
+    def run(items: List[Dict[str, Any]]) -> None:
+        for record in items:
+            emitter.emit_log(record)
+
+    return (lambda: records), run
+
+
+def case_emitter_buffered(size: int, stream: CountingStream) -> Case:
+    records = _node_records(size)
+
+    def run(items: List[Dict[str, Any]]) -> None:
+        sink = BufferedSink(stream)
+        emitter = EventEmitter(session_id="bench", sink=sink)
+        for record in items:
+            emitter.emit_log(record)
+        sink.close()
+
+    return (lambda: records), run
+
+
+CASES: Dict[str, Callable[[int, CountingStream], Case]] = {
+    "initial_population": case_initial_population,
+    "mutate": case_mutate,
+    "emit_graph_snapshot": case_emit_graph_snapshot,
+    "emit_graph_delta": case_emit_graph_delta,
+    "summary_metrics": case_summary_metrics,
+    "composite": case_composite,
+    "composite_batch": case_composite_batch,
+    "leaderboard_update": case_leaderboard_update,
+    "pareto_front": case_pareto_front,
+    "emitter_stream": case_emitter_stream,
+    "emitter_buffered": case_emitter_buffered,
+}
+
+
+def measure(name: str, size: int, repeats: Optional[int]) -> Dict[str, Any]:
+    stream = CountingStream()
+    setup, run = CASES[name](size, stream)
+    repeats = repeats or max(3, min(50, TIME_BUDGET_ITEMS // max(size, 1)))
+
+    timings = []
+    bytes_before = stream.bytes
+    for _ in range(repeats):
+        argument = setup()
+        gc.collect()
+        started = time.perf_counter()
+        run(argument)
+        timings.append(time.perf_counter() - started)
+    emitted = (stream.bytes - bytes_before) / repeats
+
+    argument = setup()
+    gc.collect()
+    tracemalloc.start()
+    run(argument)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        "case": name,
+        "size": size,
+        "repeats": repeats,
+        "best_s": best,
+        "mean_s": statistics.fmean(timings),
+        "throughput_per_s": size / best if best else None,
+        "peak_bytes": peak,
+        "bytes_emitted": int(emitted),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: Dict[str, Any], baseline_path: Path, threshold: float) -> int:
+    baseline = json.loads(baseline_path.read_text())
+    previous = {(entry["case"], entry["size"]): entry for entry in baseline["results"]}
+    regressions = 0
+    print(f"{'case':<22}{'size':>8}{'base ms':>12}{'new ms':>12}{'ratio':>8}")
+    for entry in current["results"]:
+        old = previous.get((entry["case"], entry["size"]))
+        if old is None:
+            continue
+        ratio = entry["best_s"] / old["best_s"] if old["best_s"] else float("inf")
+        flag = "  REGRESSION" if ratio > 1 + threshold else ""
+        regressions += bool(flag)
+        print(
+            f"{entry['case']:<22}{entry['size']:>8}{old['best_s'] * 1000:>12.3f}"
+            f"{entry['best_s'] * 1000:>12.3f}{ratio:>8.2f}{flag}"
+        )
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--repeats", type=int, help="override the per-size repeat count")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/<sha>.json)")
+    parser.add_argument("--compare", type=Path, help="baseline results file to diff against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="slowdown ratio flagged as regression")
+    args = parser.parse_args()
+
+    revision = git_revision()
+    results = []
+    for size in args.sizes:
+        for name in args.cases:
+            entry = measure(name, size, args.repeats)
+            results.append(entry)
+            print(
+                f"{name:<22} n={size:<7} best={entry['best_s'] * 1000:10.3f} ms "
+                f"peak={entry['peak_bytes'] / 1e6:8.2f} MB emitted={entry['bytes_emitted']}",
+                file=sys.stderr,
+            )
+    report = {
+        "meta": {
+            "revision": revision,
+            "seed": SEED,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+    output = args.output or ROOT / "benchmarks" / "results" / f"{revision}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"wrote {output}", file=sys.stderr)
+    if args.compare:
+        sys.exit(compare(report, args.compare, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Import-time cost of the orchestrator and the patent pipeline.
+
+Each target is imported in a fresh interpreter ``--repeats`` times; the report
+gives the median wall time of the import itself (interpreter start-up
+excluded), the heavy third-party modules it pulled in, and the slowest
+top-level imports by cumulative time from ``python -X importtime``.
+
+    python benchmarks/bench_import.py --repeats 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+TARGETS = {
+    "orchestrator_py.orchestrator": "import orchestrator_py.orchestrator",
+    "orchestrator_py.worker": "import orchestrator_py.worker",
+    "mega_patent_generator": "import mega_patent_generator",
+}
+HEAVY = ("numpy", "faiss", "openai", "requests", "trafilatura", "readability", "httpx")
+
+PROBE = """
+import sys, time
+sys.path[:0] = [{root!r}, {scripts!r}]
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(elapsed, ",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def _probe(statement: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    code = PROBE.format(root=str(ROOT), scripts=str(ROOT / "scripts"), statement=statement, heavy=HEAVY)
+    flags = ["-X", "importtime"] if importtime else []
+    return subprocess.run([sys.executable, *flags, "-c", code], capture_output=True, text=True, check=True, cwd="/")
+
+
+def _top_level(stderr: str) -> list[dict]:
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not name.startswith(" ") and "." not in name.strip():
+            rows.append({"module": name.strip(), "cumulative_ms": int(cumulative) / 1000})
+    return rows
+
+
+def bench(name: str, statement: str, repeats: int, startup: set[str]) -> dict:
+    timings = []
+    heavy = ""
+    for _ in range(repeats):
+        elapsed, _, heavy = _probe(statement).stdout.strip().partition(" ")
+        timings.append(float(elapsed) * 1000)
+    # Modules a bare interpreter (and the probe itself) already loads are start-up cost.
+    imported = [row for row in _top_level(_probe(statement, importtime=True).stderr) if row["module"] not in startup]
+    return {
+        "target": name,
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "heavy_modules": heavy.split(",") if heavy else [],
+        "slowest_top_level": sorted(imported, key=lambda row: -row["cumulative_ms"])[:5],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--targets", nargs="+", choices=sorted(TARGETS), default=list(TARGETS))
+    args = parser.parse_args()
+    startup = {row["module"] for row in _top_level(_probe("pass", importtime=True).stderr)}
+    results = [bench(name, TARGETS[name], args.repeats, startup) for name in args.targets]
+    print(json.dumps({"python": sys.version.split()[0], "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
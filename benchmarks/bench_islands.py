@@ -0,0 +1,83 @@
+"""Island-model throughput (evaluated candidates per second) as islands scale.
+
+Every island evaluates ``--variants`` sandboxed CPU-bound artifacts per
+iteration, so with enough cores candidates/second should grow close to
+linearly with the island count.
+
+    python benchmarks/bench_islands.py --islands 1 2 4 --variants 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from orchestrator_py.config import Mode, OrchestrateSpec, Settings  # noqa: E402
+from orchestrator_py.islands import IslandTournament, _iterations  # noqa: E402
+from orchestrator_py.util.events import EventEmitter, StreamSink  # noqa: E402
+
+ARTIFACT = """
+def work(n):
+    total = 0
+    for i in range(n):
+        total += i * i % 7
+    return total
+
+def test_work():
+    assert work({size}) >= 0
+"""
+
+
+def bench(islands: int, variants: int, size: int, topology: str) -> dict:
+    spec = OrchestrateSpec(
+        task="bench islands",
+        mode=Mode.SAFE,
+        variants=variants,
+        seed=7,
+        session_id=f"bench-{islands}",
+        evaluator="sandbox",
+        artifacts=[ARTIFACT.format(size=size)],
+        evaluation_cache=False,
+        islands=islands,
+        topology=topology,
+    )
+    output = io.StringIO()
+    tournament = IslandTournament(spec, Settings.from_env(), emitter=EventEmitter(spec.session_id, sink=StreamSink(output)))
+    started = time.perf_counter()
+    tournament.run()
+    elapsed = time.perf_counter() - started
+    candidates = islands * variants * _iterations(spec)
+    return {
+        "islands": islands,
+        "candidates": candidates,
+        "seconds": elapsed,
+        "candidates_per_second": candidates / elapsed,
+        "migrations": tournament.migrations,
+        "bytes_emitted": len(output.getvalue()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    cores = os.cpu_count() or 1
+    parser.add_argument("--islands", type=int, nargs="+", default=sorted({1, max(1, cores // 4), max(1, cores // 2)}))
+    parser.add_argument("--variants", type=int, default=16)
+    parser.add_argument("--size", type=int, default=200_000, help="loop iterations per candidate")
+    parser.add_argument("--topology", choices=("ring", "full"), default="ring")
+    args = parser.parse_args()
+    results = [bench(islands, args.variants, args.size, args.topology) for islands in args.islands]
+    base = results[0]["candidates_per_second"] / results[0]["islands"]
+    for result in results:
+        result["scaling_efficiency"] = result["candidates_per_second"] / (base * result["islands"])
+    print(json.dumps({"cpu_count": cores, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Candidates per second through the sandbox process pool as workers scale.
+
+Each candidate artifact is a CPU-bound snippet with a couple of tests; the
+pool is warmed before timing so worker start-up is excluded.
+
+    python benchmarks/bench_sandbox.py --candidates 200 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from orchestrator_py.evaluation.sandbox import SandboxEvaluator  # noqa: E402
+
+ARTIFACT = """
+def work(n):
+    total = 0
+    for i in range(n):
+        total += i * i % 7
+    return total
+
+def test_work():
+    assert work({size}) >= 0
+
+def test_small():
+    assert work(3) == 5
+"""
+
+
+async def bench(workers: int, candidates: int, size: int) -> dict:
+    evaluator = SandboxEvaluator(workers=workers)
+    source = ARTIFACT.format(size=size)
+    try:
+        await asyncio.gather(*(evaluator.run("pass") for _ in range(workers)))
+        started = time.perf_counter()
+        results = await asyncio.gather(*(evaluator.run(source) for _ in range(candidates)))
+        elapsed = time.perf_counter() - started
+    finally:
+        evaluator.close()
+    return {
+        "workers": workers,
+        "candidates": candidates,
+        "seconds": elapsed,
+        "candidates_per_second": candidates / elapsed,
+        "failures": sum(not result["ok"] for result in results),
+        "peak_rss_mb": max(result["peak_rss_mb"] for result in results),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    cores = os.cpu_count() or 1
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, max(1, cores // 2), cores}))
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--size", type=int, default=200_000, help="loop iterations per candidate")
+    args = parser.parse_args()
+    results = [asyncio.run(bench(workers, args.candidates, args.size)) for workers in args.workers]
+    print(json.dumps({"cpu_count": cores, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Compare per-request interpreter spawns against the warm orchestrator worker.
+
+Measures, for each session, the latency until the first event arrives and until
+the ``complete`` event arrives. Cold mode spawns ``runner_entry.py`` once per
+session exactly like the original API route; warm mode starts one
+``runner_entry.py --worker`` process and streams frames into it.
+
+    python benchmarks/bench_worker.py --sessions 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+ENTRY = ROOT / "orchestrator_py" / "runner_entry.py"
+
+
+def _payload(index: int, variants: int) -> dict:
+    return {"task": f"bench session {index}", "mode": "SAFE", "variants": variants, "seed": index}
+
+
+def run_cold(sessions: int, variants: int) -> list[dict]:
+    results = []
+    for index in range(sessions):
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, str(ENTRY)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            env={**os.environ, "SESSION_ID": f"cold-{index}"},
+        )
+        assert process.stdin is not None and process.stdout is not None
+        process.stdin.write(json.dumps(_payload(index, variants)))
+        process.stdin.close()
+        first_event = None
+        for line in process.stdout:
+            now = time.perf_counter()
+            if first_event is None:
+                first_event = now - started
+            if json.loads(line)["type"] == "complete":
+                break
+        process.wait()
+        results.append({"first_event_s": first_event, "complete_s": time.perf_counter() - started})
+    return results
+
+
+def run_warm(sessions: int, variants: int) -> list[dict]:
+    process = subprocess.Popen(
+        [sys.executable, str(ENTRY), "--worker", "--max-sessions", "1"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+    )
+    assert process.stdin is not None and process.stdout is not None
+    results = []
+    try:
+        for index in range(sessions):
+            session_id = f"warm-{index}"
+            started = time.perf_counter()
+            process.stdin.write(json.dumps({"sessionId": session_id, "payload": _payload(index, variants)}) + "\n")
+            process.stdin.flush()
+            first_event = None
+            for line in process.stdout:
+                event = json.loads(line)
+                if event["sessionId"] != session_id:
+                    continue
+                now = time.perf_counter()
+                if first_event is None:
+                    first_event = now - started
+                if event["type"] in ("complete", "error"):
+                    break
+            results.append({"first_event_s": first_event, "complete_s": time.perf_counter() - started})
+    finally:
+        process.stdin.close()
+        process.wait()
+    return results
+
+
+def summarize(results: list[dict]) -> dict:
+    first = [entry["first_event_s"] for entry in results]
+    complete = [entry["complete_s"] for entry in results]
+    return {
+        "sessions": len(results),
+        "first_event_median_ms": statistics.median(first) * 1000,
+        "first_event_max_ms": max(first) * 1000,
+        "complete_median_ms": statistics.median(complete) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--variants", type=int, default=1)
+    args = parser.parse_args()
+    report = {
+        "cold": summarize(run_cold(args.sessions, args.variants)),
+        "warm": summarize(run_warm(args.sessions, args.variants)),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
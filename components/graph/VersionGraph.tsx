@@ -23,6 +23,8 @@ function mapNodes(nodes: VersionNode[]): Node[] {
           ? '#dc2626'
           : node.status === 'running'
           ? '#2563eb'
+          : node.status === 'pruned'
+          ? '#78716c'
           : '#334155',
       color: 'white',
       padding: 12,
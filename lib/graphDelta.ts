@@ -0,0 +1,41 @@
+import { TournamentDelta, TournamentSnapshot, VersionNode } from './types';
+
+// Applies a graph_delta event to the last known snapshot. Returns null when the
+// delta does not build on that snapshot (a delta was missed); callers should keep
+// their current state and wait for the next full `graph` keyframe to resync.
+export function applyGraphDelta(
+  snapshot: TournamentSnapshot | null,
+  delta: TournamentDelta
+): TournamentSnapshot | null {
+  if (!snapshot || snapshot.seq !== delta.baseSeq) {
+    return null;
+  }
+
+  const removedNodes = new Set(delta.nodes.remove);
+  const nodes = new Map<string, VersionNode>();
+  snapshot.nodes.forEach((node) => {
+    if (!removedNodes.has(node.id)) nodes.set(node.id, node);
+  });
+  delta.nodes.upsert.forEach((node) => nodes.set(node.id, node));
+
+  const removedEdges = new Set(delta.edges.remove);
+  const edges = new Map(
+    snapshot.edges.filter((edge) => !removedEdges.has(edge.id)).map((edge) => [edge.id, edge])
+  );
+  delta.edges.upsert.forEach((edge) => edges.set(edge.id, edge));
+
+  const leaderboardIds = delta.leaderboard ?? snapshot.leaderboard.map((node) => node.id);
+  const leaderboard = leaderboardIds
+    .map((id) => nodes.get(id))
+    .filter((node): node is VersionNode => node !== undefined);
+
+  return {
+    seq: delta.seq,
+    nodes: Array.from(nodes.values()),
+    edges: Array.from(edges.values()),
+    leaderboard,
+    pareto: delta.pareto ?? snapshot.pareto,
+    lineage: snapshot.lineage,
+    metrics: delta.metrics ?? snapshot.metrics
+  };
+}
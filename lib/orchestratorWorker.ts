@@ -0,0 +1,86 @@
+import { ChildProcessWithoutNullStreams, spawn } from 'node:child_process';
+import path from 'node:path';
+import readline from 'node:readline';
+import { appendLog, applySnapshotDelta, setMetrics, setSnapshot, updateSession } from './sessionStore';
+import { emitSessionEvent } from './eventBus';
+import { OrchestrateRequest, StreamEvent, TournamentDelta, TournamentSnapshot } from './types';
+
+let worker: ChildProcessWithoutNullStreams | null = null;
+const activeSessions = new Set<string>();
+
+export function handleOrchestratorEvent(sessionId: string, event: StreamEvent) {
+  if (event.type === 'graph') {
+    setSnapshot(sessionId, event.payload as TournamentSnapshot);
+  }
+  if (event.type === 'graph_delta') {
+    applySnapshotDelta(sessionId, event.payload as TournamentDelta);
+  }
+  if (event.type === 'metric') {
+    setMetrics(sessionId, event.payload as { name: string; value: number; unit?: string }[]);
+  }
+  if (event.type === 'log') {
+    appendLog(sessionId, String(event.payload));
+  }
+  if (event.type === 'complete') {
+    updateSession(sessionId, { status: 'complete' });
+    activeSessions.delete(sessionId);
+  }
+  if (event.type === 'error') {
+    updateSession(sessionId, { status: 'error', errorMessage: String(event.payload) });
+    activeSessions.delete(sessionId);
+  }
+  emitSessionEvent(sessionId, event);
+}
+
+function failActiveSessions(message: string) {
+  activeSessions.forEach((sessionId) => {
+    handleOrchestratorEvent(sessionId, { type: 'error', payload: message, sessionId });
+  });
+  activeSessions.clear();
+}
+
+function ensureWorker() {
+  if (worker) {
+    return worker;
+  }
+  const scriptPath = path.join(process.cwd(), 'orchestrator_py', 'runner_entry.py');
+  const child = spawn('python', [scriptPath, '--worker'], {
+    env: { ...process.env },
+    stdio: ['pipe', 'pipe', 'pipe']
+  });
+
+  readline.createInterface({ input: child.stdout }).on('line', (line) => {
+    if (!line) return;
+    try {
+      const event = JSON.parse(line) as StreamEvent;
+      if (event.sessionId && activeSessions.has(event.sessionId)) {
+        handleOrchestratorEvent(event.sessionId, event);
+      }
+    } catch (error) {
+      console.error('Failed to parse orchestrator event', error);
+    }
+  });
+
+  child.stderr.on('data', (chunk: Buffer) => {
+    console.error(`[orchestrator] ${chunk.toString()}`);
+  });
+
+  child.on('exit', (code) => {
+    worker = null;
+    failActiveSessions(`Orchestrator worker exited with code ${code}`);
+  });
+
+  worker = child;
+  return child;
+}
+
+export function submitSession(sessionId: string, body: OrchestrateRequest) {
+  const child = ensureWorker();
+  activeSessions.add(sessionId);
+  child.stdin.write(`${JSON.stringify({ sessionId, payload: body })}\n`);
+}
+
+export function cancelSession(sessionId: string) {
+  if (!worker || !activeSessions.has(sessionId)) return;
+  worker.stdin.write(`${JSON.stringify({ sessionId, cancel: true })}\n`);
+}
@@ -1,4 +1,5 @@
-import { TournamentSnapshot } from './types';
+import { applyGraphDelta } from './graphDelta';
+import { TournamentDelta, TournamentSnapshot } from './types';
 
 type SessionData = {
   snapshot: TournamentSnapshot | null;
@@ -37,6 +38,15 @@ export function setSnapshot(sessionId: string, snapshot: TournamentSnapshot) {
   session.snapshot = snapshot;
 }
 
+export function applySnapshotDelta(sessionId: string, delta: TournamentDelta) {
+  const session = sessions.get(sessionId);
+  if (!session) return;
+  const next = applyGraphDelta(session.snapshot, delta);
+  if (next) {
+    session.snapshot = next;
+  }
+}
+
 export function setMetrics(sessionId: string, metrics: { name: string; value: number; unit?: string }[]) {
   const session = sessions.get(sessionId);
   if (!session) return;
@@ -20,30 +20,65 @@ export interface VersionNode {
   id: string;
   parentIds: string[];
   summary: string;
-  status: 'pending' | 'running' | 'passed' | 'failed';
+  status: 'pending' | 'running' | 'passed' | 'failed' | 'pruned';
   score: VersionScoreVector;
   costUsd: number;
   mode: OrchestratorMode;
   createdAt: string;
 }
 
+export interface VersionEdge {
+  id: string;
+  source: string;
+  target: string;
+}
+
 export interface TournamentSnapshot {
+  seq?: number;
   nodes: VersionNode[];
-  edges: { id: string; source: string; target: string }[];
+  edges: VersionEdge[];
   leaderboard: VersionNode[];
+  pareto?: string[];
+  lineage?: { nodes: string[]; edges: VersionEdge[] };
   metrics: AgentMetric[];
 }
 
+export interface TournamentDelta {
+  seq: number;
+  baseSeq: number;
+  nodes: { upsert: VersionNode[]; remove: string[] };
+  edges: { upsert: VersionEdge[]; remove: string[] };
+  leaderboard?: string[];
+  pareto?: string[];
+  metrics?: AgentMetric[];
+}
+
+export interface TraceSpan {
+  name: string;
+  startMs: number;
+  durationMs: number;
+  allocKb?: number;
+}
+
+export interface TraceEvent {
+  spans?: TraceSpan[];
+  counters?: Record<string, number>;
+  profile?: Record<string, unknown>;
+}
+
 export interface OrchestrateRequest {
   task: string;
   mode: OrchestratorMode;
   variants: number;
   seed?: number;
+  resume?: boolean;
+  sessionId?: string;
 }
 
 export interface StreamEvent {
-  type: 'graph' | 'log' | 'metric' | 'complete' | 'error';
+  type: 'graph' | 'graph_delta' | 'log' | 'metric' | 'complete' | 'error' | 'trace';
   payload: unknown;
+  sessionId?: string;
 }
 
 export interface RunRequest {
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 
 class Mode(str, Enum):
@@ -13,6 +14,20 @@ class Mode(str, Enum):
     POWER = "POWER"
 
 
+# Candidates evaluated at once within a session.
+MODE_CONCURRENCY = {Mode.SAFE: 2, Mode.GUARDED: 4, Mode.POWER: 8}
+# Shares of the worker's evaluation slots when sessions compete (weighted fair queuing).
+MODE_WEIGHTS = {Mode.SAFE: 1.0, Mode.GUARDED: 2.0, Mode.POWER: 4.0}
+# Slots all sessions of a mode may hold at once, and the USD cost of the
+# candidates they may have in flight together.
+MODE_SLOT_QUOTA = {Mode.SAFE: 4, Mode.GUARDED: 8, Mode.POWER: 12}
+MODE_COST_QUOTA_USD = {Mode.SAFE: 10.0, Mode.GUARDED: 40.0, Mode.POWER: 120.0}
+# Island processes one session may start.
+MODE_MAX_ISLANDS = {Mode.SAFE: 2, Mode.GUARDED: 4, Mode.POWER: 8}
+# Threads one session may mutate on.
+MODE_MAX_MUTATION_WORKERS = {Mode.SAFE: 2, Mode.GUARDED: 4, Mode.POWER: 8}
+
+
 @dataclass
 class Settings:
     openai_api_key: str | None
@@ -28,8 +43,6 @@ class Settings:
 
     @classmethod
     def from_env(cls) -> "Settings":
-        import os
-
         return cls(
             openai_api_key=os.getenv("OPENAI_API_KEY"),
             supabase_url=os.getenv("SUPABASE_URL"),
@@ -51,13 +64,72 @@ class OrchestrateSpec:
     variants: int
     seed: int | None
     session_id: str
+    keyframe_interval: int = 10
+    evaluator: str | None = None
+    evaluation_timeout: float | None = None
+    artifacts: List[str] = field(default_factory=list)
+    evaluation_cache: bool = True
+    trace: bool = False
+    profile: bool = False
+    trace_allocations: bool = False
+    checkpoint_dir: str | None = None
+    checkpoint_interval: int = 1
+    resume: bool = False
+    islands: int = 1
+    migration_interval: int = 1
+    migrants: int = 2
+    topology: str = "ring"
+    broker: str = "local"
+    racing: bool = False
+    eta: float = 2.0
+    budget_usd: float | None = None
+    budget_evaluations: int | None = None
+    surrogate: bool = False
+    weights: Dict[str, float] | None = None
+    mutation_workers: int = 1
 
     @classmethod
     def from_request(cls, payload: Dict[str, Any], session_id: str) -> "OrchestrateSpec":
+        mode = Mode(payload["mode"])
+        mutation_workers = int(payload.get("mutationWorkers", 1))
+        if mutation_workers < 1:
+            raise ValueError(f"mutationWorkers must be at least 1, got {mutation_workers}")
         return cls(
             task=payload["task"],
-            mode=Mode(payload["mode"]),
+            mode=mode,
             variants=int(payload["variants"]),
             seed=(int(payload["seed"]) if payload.get("seed") is not None else None),
             session_id=session_id,
+            keyframe_interval=int(payload.get("keyframeInterval", 10)),
+            # Evaluators may execute artifacts, so only the server picks one.
+            evaluator=os.environ.get("ORCHESTRATOR_EVALUATOR") or None,
+            evaluation_timeout=(
+                float(payload["evaluationTimeout"]) if payload.get("evaluationTimeout") is not None else None
+            ),
+            artifacts=[str(artifact) for artifact in payload.get("artifacts", [])],
+            evaluation_cache=bool(payload.get("cache", True)),
+            trace=bool(payload.get("trace", False)),
+            profile=bool(payload.get("profile", False)),
+            trace_allocations=bool(payload.get("traceAllocations", False)),
+            checkpoint_dir=os.environ.get("ORCHESTRATOR_CHECKPOINT_DIR") or None,
+            checkpoint_interval=int(payload.get("checkpointInterval", 1)),
+            resume=bool(payload.get("resume", False)),
+            islands=min(max(1, int(payload.get("islands", 1))), MODE_MAX_ISLANDS[mode]),
+            migration_interval=int(payload.get("migrationInterval", 1)),
+            migrants=int(payload.get("migrants", 2)),
+            topology=str(payload.get("topology", "ring")),
+            broker=str(payload.get("broker", "local")),
+            racing=bool(payload.get("racing", False)),
+            eta=float(payload.get("eta", 2.0)),
+            budget_usd=(float(payload["budgetUsd"]) if payload.get("budgetUsd") is not None else None),
+            budget_evaluations=(
+                int(payload["budgetEvaluations"]) if payload.get("budgetEvaluations") is not None else None
+            ),
+            surrogate=bool(payload.get("surrogate", False)),
+            weights=payload.get("weights"),
+            mutation_workers=min(mutation_workers, MODE_MAX_MUTATION_WORKERS[mode]),
         )
+
+    @property
+    def concurrency(self) -> int:
+        return MODE_CONCURRENCY[self.mode]
@@ -0,0 +1,208 @@
+"""Content-addressed memoization of candidate evaluations.
+
+Results are keyed by ``sha256(evaluator version, artifact)``, so a mutation that
+reproduces an earlier artifact — or two candidates that share one — is scored
+once. Only the dimensions measured from the artifact are cached; each hit
+merges them into the requesting candidate's own ``ScoreVector``, so candidates
+that share an artifact keep their other dimensions. Lookups go through an
+in-memory LRU tier shared by every session in the process, then an optional
+on-disk tier (one JSON file per key) that persists across runs.
+``CachedEvaluator`` reads and writes the disk tier in worker threads so file
+I/O never blocks the event loop. Concurrent requests for the same key share a
+single disk lookup and evaluation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .evaluator import Evaluator
+from .scoring import SCORE_DIMENSIONS, ScoreVector
+
+if TYPE_CHECKING:
+    from ..population import VersionCandidate
+
+DEFAULT_CAPACITY = 4096
+# Part of every key, so entries written in an older layout are never read back.
+CACHE_FORMAT = "measured-1"
+
+Measurement = Dict[str, float]
+
+
+def content_key(evaluator_version: str, artifact: str) -> str:
+    hasher = hashlib.sha256()
+    hasher.update(CACHE_FORMAT.encode())
+    hasher.update(b"\0")
+    hasher.update(evaluator_version.encode())
+    hasher.update(b"\0")
+    hasher.update(artifact.encode())
+    return hasher.hexdigest()
+
+
+class EvaluationCache:
+    def __init__(self, directory: Optional[Path] = None, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.directory = directory
+        self.capacity = capacity
+        self._memory: "OrderedDict[str, Measurement]" = OrderedDict()
+        self._lock = threading.Lock()
+        if directory is not None:
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str, disk: bool = True) -> tuple[Optional[Measurement], str]:
+        """``(measured dimensions, tier)``; with ``disk=False`` only the in-memory tier is consulted."""
+        with self._lock:
+            measured = self._memory.get(key)
+            if measured is not None:
+                self._memory.move_to_end(key)
+                return measured, "memory"
+        if self.directory is None or not disk:
+            return None, "miss"
+        try:
+            stored = json.loads(self._path(key).read_text())
+            measured = {name: float(stored[name]) for name in SCORE_DIMENSIONS if name in stored}
+            if len(measured) != len(stored):
+                raise ValueError(f"Unknown score dimensions in {key}")
+        except (OSError, ValueError, TypeError, AttributeError):
+            return None, "miss"
+        self._remember(key, measured)
+        return measured, "disk"
+
+    def put(self, key: str, measured: Measurement, disk: bool = True) -> None:
+        self._remember(key, measured)
+        if disk:
+            self.write(key, measured)
+
+    def write(self, key: str, measured: Measurement) -> None:
+        """Persist ``measured`` to the disk tier, if there is one."""
+        if self.directory is None:
+            return
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        handle, temp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(handle, "w") as stream:
+            json.dump(measured, stream)
+        os.replace(temp, path)
+
+    def _remember(self, key: str, measured: Measurement) -> None:
+        with self._lock:
+            self._memory[key] = measured
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.capacity:
+                self._memory.popitem(last=False)
+
+
+_SHARED: Dict[Optional[str], EvaluationCache] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_cache(directory: Optional[str] = None) -> EvaluationCache:
+    """Process-wide cache per directory, so warm-worker sessions share hits."""
+    directory = directory if directory is not None else os.environ.get("ORCHESTRATOR_CACHE_DIR")
+    with _SHARED_LOCK:
+        if directory not in _SHARED:
+            _SHARED[directory] = EvaluationCache(Path(directory) if directory else None)
+        return _SHARED[directory]
+
+
+def _changed(previous: ScoreVector, score: ScoreVector) -> Measurement:
+    return {
+        name: value
+        for name, value, before in zip(SCORE_DIMENSIONS, score.values.tolist(), previous.values.tolist())
+        if value != before
+    }
+
+
+class CachedEvaluator:
+    """Wraps an ``Evaluator`` with an ``EvaluationCache``.
+
+    The wrapped evaluator's ``measure`` supplies the dimensions to cache; for
+    evaluators without one, the dimensions its score changed are cached.
+    Candidates without an artifact have no content to address and always go to
+    the wrapped evaluator.
+    """
+
+    def __init__(self, inner: Evaluator, cache: EvaluationCache) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.version = inner.version
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._inflight: Dict[str, "asyncio.Future[Measurement]"] = {}
+
+    async def evaluate(self, candidate: "VersionCandidate") -> ScoreVector:
+        if not candidate.artifact:
+            return await self.inner.evaluate(candidate)
+        return candidate.score.replace(**await self._measured(candidate))
+
+    async def _measure(self, candidate: "VersionCandidate") -> Measurement:
+        measure = getattr(self.inner, "measure", None)
+        if measure is not None:
+            return await measure(candidate)
+        return _changed(candidate.score, await self.inner.evaluate(candidate))
+
+    async def _measured(self, candidate: "VersionCandidate") -> Measurement:
+        key = content_key(self.version, candidate.artifact)
+        measured, _ = self.cache.get(key, disk=False)
+        if measured is not None:
+            self.hits += 1
+            return measured
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+        future: "asyncio.Future[Measurement]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        fresh = False
+        try:
+            if self.cache.directory is not None:
+                measured, _ = await asyncio.to_thread(self.cache.get, key)
+            if measured is not None:
+                self.hits += 1
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                measured = await self._measure(candidate)
+                fresh = True
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                future.exception()  # waiters re-raise it; avoid "never retrieved" warnings
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        future.set_result(measured)
+        if fresh:
+            self.cache.put(key, measured, disk=False)
+            if self.cache.directory is not None:
+                await asyncio.to_thread(self.cache.write, key, measured)
+        return measured
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        lookups = self.hits + self.misses
+        metrics = [
+            {"name": "eval_cache_hits", "value": float(self.hits)},
+            {"name": "eval_cache_disk_hits", "value": float(self.disk_hits)},
+            {"name": "eval_cache_misses", "value": float(self.misses)},
+            {"name": "eval_cache_hit_rate", "value": self.hits / lookups if lookups else 0.0},
+        ]
+        return metrics + list(getattr(self.inner, "metrics", list)())
+
+    def close(self) -> None:
+        close = getattr(self.inner, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,78 @@
+"""Pluggable candidate evaluators for the asyncio tournament engine."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional, Protocol, runtime_checkable
+
+from .scoring import ScoreVector
+
+if TYPE_CHECKING:
+    from ..config import OrchestrateSpec
+    from ..population import VersionCandidate
+
+
+@runtime_checkable
+class Evaluator(Protocol):
+    """Scores one candidate. Implementations should be I/O-friendly coroutines;
+    ``version`` identifies the scoring logic so cached results can be keyed on it.
+
+    Evaluators may also define ``async measure(candidate) -> Dict[str, float]``
+    returning only the dimensions derived from the candidate's artifact;
+    ``evaluate`` is then the candidate's score with those replaced, and the
+    evaluation cache stores just the measured dimensions.
+    """
+
+    version: str
+
+    async def evaluate(self, candidate: "VersionCandidate") -> ScoreVector:
+        ...
+
+
+@dataclass
+class EvaluationResult:
+    row: int
+    status: str
+    score: Optional[ScoreVector] = None
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+class SyntheticEvaluator:
+    """Re-scores a candidate as its current score after a fixed latency.
+
+    Useful for exercising concurrency, timeouts and streaming without any
+    external service.
+    """
+
+    version = "synthetic-1"
+
+    def __init__(self, latency: float = 0.05) -> None:
+        self.latency = latency
+
+    async def measure(self, candidate: "VersionCandidate") -> Dict[str, float]:
+        await asyncio.sleep(self.latency)
+        return {}
+
+    async def evaluate(self, candidate: "VersionCandidate") -> ScoreVector:
+        return candidate.score.replace(**await self.measure(candidate))
+
+
+def build_evaluator(spec: "OrchestrateSpec") -> Optional[Evaluator]:
+    evaluator: Evaluator
+    if spec.evaluator is None:
+        return None
+    if spec.evaluator == "synthetic":
+        evaluator = SyntheticEvaluator()
+    elif spec.evaluator == "sandbox":
+        from .sandbox import SandboxEvaluator
+
+        evaluator = SandboxEvaluator(workers=spec.concurrency)
+    else:
+        raise ValueError(f"Unknown evaluator: {spec.evaluator}")
+    if spec.evaluation_cache:
+        from .cache import CachedEvaluator, shared_cache
+
+        evaluator = CachedEvaluator(evaluator, shared_cache())
+    return evaluator
@@ -0,0 +1,303 @@
+"""Process-pool sandbox that scores candidates by executing their artifacts.
+
+Workers are forked up front and stay warm between tasks. Each task runs in a
+fresh namespace under per-task CPU-time and address-space limits; the worker
+measures wall time, CPU time and peak RSS and the parent folds them into the
+``performance`` and ``memory`` dimensions of the candidate's ``ScoreVector``.
+A worker is recycled after ``tasks_per_worker`` tasks, and killed and replaced
+if it overruns its wall-clock budget or dies.
+
+Workers drop every environment variable outside ``WORKER_ENVIRONMENT`` before
+running anything, so API keys and service URLs in the server's environment
+are not visible to candidate code. The rlimits bound resource use; they are
+not a security boundary. Candidate code still runs as the server's user with
+its filesystem and network access, so only enable this evaluator (via
+``ORCHESTRATOR_EVALUATOR=sandbox``) for trusted artifacts or inside a
+container or VM that provides real isolation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import resource
+import signal
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+
+from .scoring import ScoreVector
+
+if TYPE_CHECKING:
+    from ..population import VersionCandidate
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# Environment variables a worker keeps; everything else is removed at startup.
+WORKER_ENVIRONMENT = ("PATH", "LANG", "LC_ALL", "LC_CTYPE", "TZ", "TMPDIR")
+
+
+@dataclass(frozen=True)
+class SandboxLimits:
+    cpu_seconds: float = 2.0
+    memory_mb: int = 512
+    wall_seconds: float = 10.0
+    tasks_per_worker: int = 100
+
+
+class CpuLimitExceeded(Exception):
+    pass
+
+
+def _raise_cpu_limit(signum: int, frame: Any) -> None:
+    raise CpuLimitExceeded("CPU time limit exceeded")
+
+
+def _cpu_time() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _virtual_memory_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[0]) * _PAGE_SIZE
+    except OSError:
+        return None
+
+
+def _reset_peak_rss() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w") as handle:
+            handle.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as handle:
+            for line in handle:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_artifact(source: str, limits: SandboxLimits) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"ok": False, "tests_passed": 0, "tests_total": 0, "error": None}
+    cpu_before = _cpu_time()
+    soft_cpu, hard_cpu = resource.getrlimit(resource.RLIMIT_CPU)
+    soft_as, hard_as = resource.getrlimit(resource.RLIMIT_AS)
+    cpu_limit = int(cpu_before + limits.cpu_seconds) + 1
+    if hard_cpu != resource.RLIM_INFINITY:
+        cpu_limit = min(cpu_limit, hard_cpu)
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, hard_cpu))
+    baseline = _virtual_memory_bytes()
+    if baseline is not None:
+        as_limit = baseline + limits.memory_mb * 1024 * 1024
+        if hard_as != resource.RLIM_INFINITY:
+            as_limit = min(as_limit, hard_as)
+        resource.setrlimit(resource.RLIMIT_AS, (as_limit, hard_as))
+    _reset_peak_rss()
+    started = time.perf_counter()
+    try:
+        namespace: Dict[str, Any] = {"__name__": "candidate"}
+        exec(compile(source, "<candidate>", "exec"), namespace)
+        tests = [value for name, value in namespace.items() if name.startswith("test_") and callable(value)]
+        result["tests_total"] = len(tests)
+        for test in tests:
+            try:
+                test()
+                result["tests_passed"] += 1
+            except (CpuLimitExceeded, MemoryError):
+                raise
+            except Exception:
+                pass
+        result["ok"] = True
+    except CpuLimitExceeded as exc:
+        result["error"] = str(exc)
+    except MemoryError:
+        result["error"] = "Memory limit exceeded"
+    except Exception:
+        result["error"] = traceback.format_exc(limit=3)
+    finally:
+        resource.setrlimit(resource.RLIMIT_AS, (soft_as, hard_as))
+        resource.setrlimit(resource.RLIMIT_CPU, (soft_cpu, hard_cpu))
+    result["wall_seconds"] = time.perf_counter() - started
+    result["cpu_seconds"] = _cpu_time() - cpu_before
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def _scrub_environment() -> None:
+    kept = {name: os.environ[name] for name in WORKER_ENVIRONMENT if name in os.environ}
+    os.environ.clear()
+    os.environ.update(kept)
+
+
+def _worker_main(connection: Connection, limits: SandboxLimits) -> None:
+    _scrub_environment()
+    signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while True:
+        try:
+            source = connection.recv()
+        except EOFError:
+            return
+        if source is None:
+            return
+        connection.send(_run_artifact(source, limits))
+
+
+class _Worker:
+    def __init__(self, context: Any, limits: SandboxLimits) -> None:
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child, limits), daemon=True)
+        self.process.start()
+        child.close()
+        self.tasks = 0
+
+    def run(self, source: str, timeout: float) -> Optional[Dict[str, Any]]:
+        self.tasks += 1
+        try:
+            self.connection.send(source)
+            if self.connection.poll(timeout):
+                return self.connection.recv()
+        except (EOFError, OSError):
+            pass
+        return None
+
+    def stop(self, force: bool = False) -> None:
+        if not force:
+            try:
+                self.connection.send(None)
+            except OSError:
+                force = True
+        if force and self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+        self.connection.close()
+
+
+class SandboxEvaluator:
+    """``Evaluator`` that runs candidate artifacts in a warm process pool."""
+
+    version = "sandbox-1"
+
+    def __init__(self, workers: Optional[int] = None, limits: Optional[SandboxLimits] = None) -> None:
+        self.limits = limits or SandboxLimits()
+        self.size = workers or os.cpu_count() or 1
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._idle: List[_Worker] = [_Worker(self._context, self.limits) for _ in range(self.size)]
+        self._busy: Set[_Worker] = set()
+        self._threads = ThreadPoolExecutor(self.size, thread_name_prefix="sandbox")
+        self._available: Optional[asyncio.Semaphore] = None
+        self._closed = False
+        self.completed = 0
+        self.failures = 0
+        self.recycled = 0
+        self.wall_seconds = 0.0
+        self.peak_rss_mb = 0.0
+
+    async def measure(self, candidate: "VersionCandidate") -> Dict[str, float]:
+        return self.measured(await self.run(candidate.artifact))
+
+    async def evaluate(self, candidate: "VersionCandidate") -> ScoreVector:
+        return candidate.score.replace(**await self.measure(candidate))
+
+    async def run(self, source: str) -> Dict[str, Any]:
+        if self._closed:
+            raise RuntimeError("SandboxEvaluator is closed")
+        if self._available is None:
+            self._available = asyncio.Semaphore(self.size)
+        async with self._available:
+            worker = self._idle.pop()
+            self._busy.add(worker)
+            call = self._threads.submit(worker.run, source, self.limits.wall_seconds)
+            try:
+                measurement = await asyncio.wrap_future(call)
+            except BaseException:
+                # The thread may still be blocked on the pipe: kill the process so it
+                # returns, and only close the pipe once it has.
+                worker.process.kill()
+                call.add_done_callback(lambda _: worker.stop(force=True))
+                self._busy.discard(worker)
+                self._replace(None)
+                raise
+            self._busy.discard(worker)
+            if measurement is None:
+                worker.stop(force=True)
+                self._replace(None)
+                measurement = {
+                    "ok": False,
+                    "tests_passed": 0,
+                    "tests_total": 0,
+                    "error": "Wall-clock limit exceeded or worker died",
+                    "wall_seconds": self.limits.wall_seconds,
+                    "cpu_seconds": self.limits.cpu_seconds,
+                    "peak_rss_mb": float(self.limits.memory_mb),
+                }
+            elif worker.tasks >= self.limits.tasks_per_worker:
+                worker.stop()
+                self._replace(None)
+                self.recycled += 1
+            else:
+                self._replace(worker)
+        self.completed += 1
+        self.failures += 0 if measurement["ok"] else 1
+        self.wall_seconds += measurement["wall_seconds"]
+        self.peak_rss_mb = max(self.peak_rss_mb, measurement["peak_rss_mb"])
+        return measurement
+
+    def _replace(self, worker: Optional[_Worker]) -> None:
+        """Return ``worker`` (or a fresh one for ``None``) to the idle pool, unless closed."""
+        if self._closed:
+            if worker is not None:
+                worker.stop()
+            return
+        self._idle.append(worker if worker is not None else _Worker(self._context, self.limits))
+
+    def measured(self, measurement: Dict[str, Any]) -> Dict[str, float]:
+        """The dimensions a run determines; without tests, correctness and tests are left out."""
+        if not measurement["ok"]:
+            return {"correctness": 0.0, "tests": 0.0, "performance": 0.0, "memory": 0.0}
+        dimensions = {
+            "performance": max(0.0, 1.0 - measurement["cpu_seconds"] / self.limits.cpu_seconds),
+            "memory": max(0.0, 1.0 - measurement["peak_rss_mb"] / self.limits.memory_mb),
+        }
+        total = measurement["tests_total"]
+        if total:
+            dimensions["correctness"] = dimensions["tests"] = measurement["tests_passed"] / total
+        return dimensions
+
+    def score(self, previous: ScoreVector, measurement: Dict[str, Any]) -> ScoreVector:
+        return previous.replace(**self.measured(measurement))
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        if not self.completed:
+            return []
+        return [
+            {"name": "sandbox_avg_wall_ms", "value": self.wall_seconds / self.completed * 1000, "unit": "ms"},
+            {"name": "sandbox_peak_rss", "value": self.peak_rss_mb, "unit": "MB"},
+            {"name": "sandbox_failures", "value": float(self.failures)},
+        ]
+
+    def close(self) -> None:
+        """Stop every worker, first killing busy ones and joining the threads driving them."""
+        self._closed = True
+        busy, self._busy = list(self._busy), set()
+        for worker in busy:
+            worker.process.kill()
+        self._threads.shutdown(wait=True)
+        for worker in busy:
+            worker.stop(force=True)
+        for worker in self._idle:
+            worker.stop()
+        self._idle = []
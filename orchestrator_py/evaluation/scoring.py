@@ -1,43 +1,133 @@
-"""Scoring utilities for tournament candidates."""
+"""Scoring utilities for tournament candidates.
+
+A ``ScoreVector`` keeps its dimensions in one float64 array (in
+``SCORE_DIMENSIONS`` order) and caches its composite until a dimension or its
+weights are assigned; ``values`` is a read-only view, so the cache cannot be
+bypassed. Composite weights can be overridden per session with
+``resolve_weights``; ``composite_batch`` scores a whole ``(n, dimensions)``
+block with one matrix-vector product, which is how populations are ranked.
+"""
 
 from __future__ import annotations
 
-from dataclasses import dataclass
 from random import Random
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+
+SCORE_DIMENSIONS = ("correctness", "tests", "performance", "memory", "readability", "security", "cost")
+COMPOSITE_WEIGHTS = (0.4, 0.15, 0.15, 0.1, 0.1, 0.1, -0.05)
+
+DEFAULT_WEIGHTS = np.asarray(COMPOSITE_WEIGHTS, dtype=np.float64)
+DEFAULT_WEIGHTS.flags.writeable = False
+
+
+def resolve_weights(overrides: Optional[Mapping[str, float]] = None) -> np.ndarray:
+    """Composite weights with per-dimension ``overrides`` applied."""
+    if not overrides:
+        return DEFAULT_WEIGHTS
+    unknown = set(overrides) - set(SCORE_DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Unknown score dimensions in weights: {', '.join(sorted(unknown))}")
+    weights = DEFAULT_WEIGHTS.copy()
+    for name, value in overrides.items():
+        weights[SCORE_DIMENSIONS.index(name)] = float(value)
+    weights.flags.writeable = False
+    return weights
+
+
+def composite_batch(scores: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """Composite of every row of ``scores`` in the block's own dtype."""
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    return scores @ weights.astype(scores.dtype, copy=False)
+
+
+def _dimension(index: int) -> property:
+    def get(self: "ScoreVector") -> float:
+        return float(self._values[index])
+
+    def assign(self: "ScoreVector", value: float) -> None:
+        self._values[index] = value
+        self._composite = None
+
+    return property(get, assign)
 
 
-@dataclass
 class ScoreVector:
-    correctness: float
-    tests: float
-    performance: float
-    memory: float
-    readability: float
-    security: float
-    cost: float
+    __slots__ = ("_values", "_weights", "_composite")
+
+    def __init__(
+        self,
+        correctness: float,
+        tests: float,
+        performance: float,
+        memory: float,
+        readability: float,
+        security: float,
+        cost: float,
+        weights: Optional[np.ndarray] = None,
+    ) -> None:
+        self._values = np.array(
+            (correctness, tests, performance, memory, readability, security, cost), dtype=np.float64
+        )
+        self._weights = DEFAULT_WEIGHTS if weights is None else weights
+        self._composite: Optional[float] = None
+
+    @classmethod
+    def from_array(cls, values: np.ndarray, weights: Optional[np.ndarray] = None) -> "ScoreVector":
+        vector = cls.__new__(cls)
+        vector._values = np.array(values, dtype=np.float64)
+        vector._weights = DEFAULT_WEIGHTS if weights is None else weights
+        vector._composite = None
+        return vector
+
+    @property
+    def values(self) -> np.ndarray:
+        """Read-only view of the dimensions; assign through the named properties."""
+        view = self._values.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def weights(self) -> np.ndarray:
+        return self._weights
+
+    @weights.setter
+    def weights(self, weights: np.ndarray) -> None:
+        self._weights = weights
+        self._composite = None
+
+    correctness = _dimension(0)
+    tests = _dimension(1)
+    performance = _dimension(2)
+    memory = _dimension(3)
+    readability = _dimension(4)
+    security = _dimension(5)
+    cost = _dimension(6)
 
     @property
     def composite(self) -> float:
-        return (
-            self.correctness * 0.4
-            + self.tests * 0.15
-            + self.performance * 0.15
-            + self.memory * 0.1
-            + self.readability * 0.1
-            + self.security * 0.1
-            - self.cost * 0.05
-        )
+        if self._composite is None:
+            self._composite = float(self._values @ self._weights)
+        return self._composite
+
+    def replace(self, **changes: float) -> "ScoreVector":
+        vector = ScoreVector.from_array(self._values, self._weights)
+        for name, value in changes.items():
+            setattr(vector, name, value)
+        return vector
+
+    def to_dict(self) -> Dict[str, float]:
+        return dict(zip(SCORE_DIMENSIONS, self.values.tolist()))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ScoreVector):
+            return NotImplemented
+        return bool(np.array_equal(self.values, other.values))
 
-    def to_dict(self) -> dict[str, float]:
-        return {
-            "correctness": self.correctness,
-            "tests": self.tests,
-            "performance": self.performance,
-            "memory": self.memory,
-            "readability": self.readability,
-            "security": self.security,
-            "cost": self.cost,
-        }
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.to_dict().items())
+        return f"ScoreVector({fields})"
 
     @classmethod
     def random(cls, rng: Random) -> "ScoreVector":
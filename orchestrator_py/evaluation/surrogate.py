@@ -0,0 +1,112 @@
+"""Online ridge-regression surrogate that pre-screens candidates before evaluation.
+
+Features are a candidate's pre-evaluation score columns and cost (plus a bias
+term); the target is the composite score its evaluation returns. The model
+keeps the sufficient statistics ``XᵀX + λI`` and ``Xᵀy``, so observing a batch
+is two small matrix products and a prediction inverts a 9×9 matrix. The
+predictive standard deviation is the residual spread scaled by
+``sqrt(1 + xᵀ A⁻¹ x)``.
+
+A candidate is skipped when even ``prediction + confidence · std`` falls below
+the leaderboard cutoff. Every ``audit_every``-th rejection is evaluated anyway,
+and the share of audited skips that really landed below the cutoff is reported
+as the surrogate's hit rate.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from ..population import PopulationStore
+from .scoring import SCORE_DIMENSIONS
+
+DEFAULT_CONFIDENCE = 2.0
+FEATURES = len(SCORE_DIMENSIONS) + 2
+
+
+def features(population: PopulationStore, rows: np.ndarray) -> np.ndarray:
+    block = np.empty((len(rows), FEATURES), dtype=np.float64)
+    block[:, :-2] = population.scores[rows]
+    block[:, -2] = population.cost_usd[rows]
+    block[:, -1] = 1.0
+    return block
+
+
+class SurrogateScreen:
+    def __init__(
+        self,
+        dimensions: int = FEATURES,
+        ridge: float = 1e-2,
+        confidence: float = DEFAULT_CONFIDENCE,
+        warmup: int = 16,
+        audit_every: int = 10,
+    ) -> None:
+        self.confidence = confidence
+        self.warmup = warmup
+        self.audit_every = audit_every
+        self._gram = np.eye(dimensions) * ridge
+        self._moment = np.zeros(dimensions)
+        self._residuals = 0.0
+        self._residual_count = 0
+        self.observations = 0
+        self.rejections = 0
+        self.skipped = 0
+        self.audits = 0
+        self.audit_hits = 0
+        self._pending_audits: Dict[int, float] = {}
+
+    @property
+    def ready(self) -> bool:
+        # Without out-of-sample residuals there is no noise estimate to be confident with.
+        return self.observations >= self.warmup and self._residual_count > 0
+
+    def predict(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Predicted composite and its standard deviation for each feature row."""
+        inverse = np.linalg.inv(self._gram)
+        mean = x @ (inverse @ self._moment)
+        leverage = np.einsum("ij,jk,ik->i", x, inverse, x)
+        noise = self._residuals / max(1, self._residual_count)
+        return mean, np.sqrt(noise * (1.0 + leverage))
+
+    def observe(self, x: np.ndarray, y: np.ndarray) -> None:
+        if len(y):
+            if self.observations:
+                # One-step-ahead residuals estimate the noise without refitting.
+                predicted, _ = self.predict(x)
+                self._residuals += float(((y - predicted) ** 2).sum())
+                self._residual_count += len(y)
+            self._gram += x.T @ x
+            self._moment += x.T @ y
+            self.observations += len(y)
+
+    def screen(self, population: PopulationStore, rows: np.ndarray, cutoff: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Split ``rows`` into those to evaluate and those confidently below ``cutoff``."""
+        if not self.ready or not len(rows):
+            return rows, rows[:0]
+        mean, std = self.predict(features(population, rows))
+        skip = mean + self.confidence * std < cutoff
+        for index in np.flatnonzero(skip).tolist():
+            self.rejections += 1
+            if self.rejections % self.audit_every == 0:
+                self._pending_audits[int(rows[index])] = cutoff
+                skip[index] = False
+        self.skipped += int(skip.sum())
+        return rows[~skip], rows[skip]
+
+    def settle(self, rows: np.ndarray, composites: np.ndarray) -> None:
+        """Score the audits among freshly evaluated ``rows``."""
+        for row, composite in zip(rows.tolist(), composites.tolist()):
+            cutoff = self._pending_audits.pop(row, None)
+            if cutoff is not None:
+                self.audits += 1
+                self.audit_hits += int(composite < cutoff)
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "surrogate_observations", "value": float(self.observations)},
+            {"name": "surrogate_evaluations_avoided", "value": float(self.skipped)},
+            {"name": "surrogate_audits", "value": float(self.audits)},
+            {"name": "surrogate_hit_rate", "value": self.audit_hits / self.audits if self.audits else 0.0},
+        ]
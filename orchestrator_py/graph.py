@@ -0,0 +1,209 @@
+"""Graph snapshot and delta encoding for the tournament event stream.
+
+The first graph event of a session is a full ``graph`` snapshot. Subsequent
+iterations emit ``graph_delta`` events that only carry nodes and edges whose
+columns changed, plus the leaderboard when its ranking moved. Between
+iterations, partial deltas stream individual evaluation results and omit
+``metrics``. Every ``keyframe_interval`` iterations a full snapshot is sent
+again so consumers that missed a delta can resync. Each event carries a
+``seq`` number and deltas name the ``baseSeq`` they apply to.
+
+The leaderboard (top rows by composite score) is kept in an incremental
+``Leaderboard`` updated only for rows whose scores changed, and snapshots list
+the ids on the Pareto front under ``pareto``; deltas, partial ones included,
+carry ``pareto`` only when the front moved. When a ``LineageStore`` is attached, snapshots also carry
+the ``lineage`` subgraph of the leaderboard's ancestors.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .lineage import LineageStore
+from .population import PopulationStore
+from .ranking import Leaderboard, pareto_front
+
+DEFAULT_KEYFRAME_INTERVAL = 10
+LEADERBOARD_SIZE = 5
+LINEAGE_DEPTH = 8
+
+
+def _timestamp(epoch: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch))
+
+
+def _edge(store: PopulationStore, row: int, parent: int) -> Dict[str, str]:
+    source = store.identifier(parent)
+    target = store.identifier(row)
+    return {"id": f"{source}->{target}", "source": source, "target": target}
+
+
+class GraphDiffer:
+    def __init__(
+        self,
+        mode: str,
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+        lineage: Optional[LineageStore] = None,
+    ) -> None:
+        self.mode = mode
+        self.lineage = lineage
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.seq = 0
+        self._since_keyframe = 0
+        self._scores: Optional[np.ndarray] = None
+        self._cost: Optional[np.ndarray] = None
+        self._status: Optional[np.ndarray] = None
+        self._parent: Optional[np.ndarray] = None
+        self._leaderboard: List[str] = []
+        self._board: Optional[Leaderboard] = None
+        self._pareto: List[str] = []
+
+    def node(self, store: PopulationStore, row: int) -> Dict[str, Any]:
+        candidate = store.candidate(row)
+        return {
+            "id": candidate.identifier,
+            "parentIds": candidate.parent_ids,
+            "summary": candidate.summary,
+            "status": candidate.status,
+            "score": candidate.score.to_dict(),
+            "costUsd": candidate.cost_usd,
+            "mode": self.mode,
+            "createdAt": _timestamp(float(store.created_at[row])),
+        }
+
+    def leaderboard_rows(self, store: PopulationStore, changed: Optional[np.ndarray] = None) -> List[int]:
+        """Top rows by composite, refreshing the board for ``changed`` rows
+        (``None`` rebuilds it from scratch)."""
+        board = self._board
+        if board is None or changed is None or len(board) != len(store) or len(changed) * 8 > len(store):
+            self._board = board = Leaderboard(store.composite())
+        elif len(changed):
+            board.update_many(changed.tolist(), store.composite(changed).astype(np.float64))
+        return board.top(LEADERBOARD_SIZE)
+
+    def pareto_ids(self, store: PopulationStore) -> List[str]:
+        return [store.identifier(row) for row in pareto_front(store.scores).tolist()]
+
+    def next_event(self, store: PopulationStore, metrics: List[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+        if self._scores is None or self._since_keyframe >= self.keyframe_interval:
+            return "graph", self.snapshot(store, metrics)
+        return "graph_delta", self.delta(store, metrics)
+
+    def snapshot(self, store: PopulationStore, metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+        nodes = {row: self.node(store, row) for row in store.order.tolist()}
+        edges = [
+            _edge(store, row, parent)
+            for row, parent in enumerate(store.parent.tolist())
+            if parent >= 0
+        ]
+        leaderboard = self.leaderboard_rows(store)
+        self._pareto = self.pareto_ids(store)
+        snapshot = {
+            "seq": self.seq,
+            "nodes": list(nodes.values()),
+            "edges": edges,
+            "leaderboard": [nodes[row] for row in leaderboard],
+            "pareto": self._pareto,
+            "metrics": metrics,
+        }
+        if self.lineage is not None:
+            seeds = [self.lineage.index_of(store.identifier(row)) for row in leaderboard]
+            snapshot["lineage"] = self.lineage.subgraph(seeds, depth=LINEAGE_DEPTH)
+        self._leaderboard = [store.identifier(row) for row in leaderboard]
+        self._remember(store)
+        self._since_keyframe = 0
+        return snapshot
+
+    def delta(self, store: PopulationStore, metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+        assert self._scores is not None and self._cost is not None
+        assert self._status is not None and self._parent is not None
+        previous = len(self._cost)
+        shared = min(previous, len(store))
+        changed_mask = (
+            (self._scores[:shared] != store.scores[:shared]).any(axis=1)
+            | (self._cost[:shared] != store.cost_usd[:shared])
+            | (self._status[:shared] != store.status[:shared])
+            | (self._parent[:shared] != store.parent[:shared])
+        )
+        changed_rows = np.flatnonzero(changed_mask)
+        changed = changed_rows.tolist()
+        added = list(range(shared, len(store)))
+        removed = list(range(shared, previous))
+
+        upsert_edges = []
+        remove_edges = []
+        for row in np.flatnonzero(self._parent[:shared] != store.parent[:shared]).tolist():
+            if self._parent[row] >= 0:
+                remove_edges.append(_edge(store, row, int(self._parent[row]))["id"])
+            if store.parent[row] >= 0:
+                upsert_edges.append(_edge(store, row, int(store.parent[row])))
+        for row in added:
+            if store.parent[row] >= 0:
+                upsert_edges.append(_edge(store, row, int(store.parent[row])))
+        for row in removed:
+            if self._parent[row] >= 0:
+                remove_edges.append(_edge(store, row, int(self._parent[row]))["id"])
+
+        delta: Dict[str, Any] = {
+            "seq": self.seq,
+            "baseSeq": self.seq - 1,
+            "nodes": {
+                "upsert": [self.node(store, row) for row in changed + added],
+                "remove": [store.identifier(row) for row in removed],
+            },
+            "edges": {"upsert": upsert_edges, "remove": remove_edges},
+            "metrics": metrics,
+        }
+        leaderboard = [store.identifier(row) for row in self.leaderboard_rows(store, changed_rows)]
+        if leaderboard != self._leaderboard:
+            delta["leaderboard"] = leaderboard
+            self._leaderboard = leaderboard
+        if changed or added or removed:
+            self._update_pareto(store, delta)
+        self._remember(store)
+        self._since_keyframe += 1
+        return delta
+
+    def partial(self, store: PopulationStore, rows: List[int]) -> Dict[str, Any]:
+        """Delta for just ``rows``, used to stream results between iterations."""
+        assert self._scores is not None and self._cost is not None
+        assert self._status is not None and self._parent is not None
+        index = np.asarray(rows, dtype=np.int64)
+        changed = index[
+            (self._scores[index] != store.scores[index]).any(axis=1)
+            | (self._cost[index] != store.cost_usd[index])
+            | (self._status[index] != store.status[index])
+        ]
+        delta: Dict[str, Any] = {
+            "seq": self.seq,
+            "baseSeq": self.seq - 1,
+            "nodes": {"upsert": [self.node(store, row) for row in changed.tolist()], "remove": []},
+            "edges": {"upsert": [], "remove": []},
+        }
+        leaderboard = [store.identifier(row) for row in self.leaderboard_rows(store, changed)]
+        if leaderboard != self._leaderboard:
+            delta["leaderboard"] = leaderboard
+            self._leaderboard = leaderboard
+        if len(changed):
+            self._update_pareto(store, delta)
+        self._scores[index] = store.scores[index]
+        self._cost[index] = store.cost_usd[index]
+        self._status[index] = store.status[index]
+        self.seq += 1
+        return delta
+
+    def _update_pareto(self, store: PopulationStore, delta: Dict[str, Any]) -> None:
+        pareto = self.pareto_ids(store)
+        if pareto != self._pareto:
+            delta["pareto"] = pareto
+            self._pareto = pareto
+
+    def _remember(self, store: PopulationStore) -> None:
+        self._scores = store.scores.copy(order="F")
+        self._cost = store.cost_usd.copy()
+        self._status = store.status.copy()
+        self._parent = store.parent.copy()
+        self.seq += 1
@@ -0,0 +1,473 @@
+"""Island-model tournaments: sub-populations evolving in parallel processes.
+
+Each island is a process running its own ``PopulationStore`` for ``variants``
+candidates. Every ``migration_interval`` iterations an island sends its best
+``migrants`` candidates to its neighbours on the migration ``topology``, and
+those replace the receivers' worst candidates. After every iteration an island
+publishes its columns to the coordinator, which folds them into one merged
+store and streams a single graph through the session's ``EventEmitter``
+(island ``k``'s row ``r`` appears as ``i{k}-v{r+1}``).
+
+Coordination goes through a ``Broker``: ``LocalBroker`` uses multiprocessing
+queues, and ``RedisBroker`` uses Redis lists at ``Settings.redis_url``, so
+islands can also run as separate processes on other nodes. Messages are JSON
+with NumPy columns packed as base64.
+
+When the session has an ``EvaluationScheduler``, every island evaluation first
+asks the coordinator for a slot (``acquire`` on the events channel, answered
+on the island's ``grant`` channel), so islands share the worker's evaluation
+slots with every other session. The coordinator gives up, terminating the
+island processes, once ``deadline`` seconds pass or an island fails.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import contextlib
+import json
+import multiprocessing
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from .config import OrchestrateSpec, Settings
+from .evaluation.evaluator import build_evaluator
+from .evaluation.scoring import ScoreVector, resolve_weights
+from .graph import GraphDiffer
+from .population import PopulationStore
+from .scheduler import EvaluationScheduler
+from .util.events import EventEmitter
+
+TOPOLOGIES = ("ring", "full")
+EVENTS_CHANNEL = "events"
+# Wall-clock budget for a whole island session, after which the islands are terminated.
+DEFAULT_DEADLINE_SECONDS = 3600.0
+
+
+def neighbours(index: int, count: int, topology: str) -> List[int]:
+    if count < 2:
+        return []
+    if topology == "ring":
+        return [(index + 1) % count]
+    if topology == "full":
+        return [other for other in range(count) if other != index]
+    raise ValueError(f"Unknown migration topology: {topology}")
+
+
+def pack(array: np.ndarray) -> Dict[str, Any]:
+    array = np.ascontiguousarray(array)
+    return {"dtype": array.dtype.str, "shape": list(array.shape), "data": base64.b64encode(array.data).decode()}
+
+
+def unpack(packed: Dict[str, Any]) -> np.ndarray:
+    data = base64.b64decode(packed["data"])
+    return np.frombuffer(data, dtype=np.dtype(packed["dtype"])).reshape(packed["shape"])
+
+
+class Broker(Protocol):
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        ...
+
+    def drain(self, channel: str, timeout: float = 0.0) -> List[Dict[str, Any]]:
+        """Every queued message, waiting up to ``timeout`` seconds for the first."""
+        ...
+
+
+class LocalBroker:
+    """Multiprocessing queues, one per channel; channels are fixed up front so
+    child processes inherit them."""
+
+    def __init__(self, channels: Sequence[str], context: Any = None) -> None:
+        context = context or multiprocessing.get_context()
+        self._queues = {channel: context.Queue() for channel in channels}
+
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        self._queues[channel].put(json.dumps(message))
+
+    def drain(self, channel: str, timeout: float = 0.0) -> List[Dict[str, Any]]:
+        queue = self._queues[channel]
+        messages = []
+        try:
+            messages.append(queue.get(timeout=timeout) if timeout else queue.get_nowait())
+            while True:
+                messages.append(queue.get_nowait())
+        except Exception:  # queue.Empty
+            pass
+        return [json.loads(message) for message in messages]
+
+
+class RedisBroker:
+    """Redis lists under ``namespace``; the client is created lazily in each process."""
+
+    def __init__(self, url: str, namespace: str) -> None:
+        self.url = url
+        self.namespace = namespace
+        self._client: Any = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"url": self.url, "namespace": self.namespace, "_client": None}
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            try:
+                import redis
+            except ImportError as exc:
+                raise RuntimeError("The redis package is required for the Redis broker") from exc
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+    def _key(self, channel: str) -> str:
+        return f"{self.namespace}:{channel}"
+
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        self.client.rpush(self._key(channel), json.dumps(message))
+
+    def drain(self, channel: str, timeout: float = 0.0) -> List[Dict[str, Any]]:
+        key = self._key(channel)
+        raw: List[bytes] = []
+        if timeout:
+            first = self.client.blpop([key], timeout=timeout)
+            if first is None:
+                return []
+            raw.append(first[1])
+        pipeline = self.client.pipeline()
+        pipeline.lrange(key, 0, -1)
+        pipeline.delete(key)
+        raw.extend(pipeline.execute()[0])
+        return [json.loads(message) for message in raw]
+
+    def clear(self, channels: Sequence[str]) -> None:
+        self.client.delete(*(self._key(channel) for channel in channels))
+
+
+def build_broker(spec: OrchestrateSpec, settings: Settings, context: Any = None) -> Broker:
+    channels = [EVENTS_CHANNEL]
+    for index in range(spec.islands):
+        channels += [f"island:{index}", f"grant:{index}"]
+    if spec.broker == "local":
+        return LocalBroker(channels, context)
+    if spec.broker == "redis":
+        if not settings.redis_url:
+            raise ValueError("The Redis broker requires UPSTASH_REDIS_URL")
+        broker = RedisBroker(settings.redis_url, namespace=f"orchestrator:{spec.session_id}")
+        broker.clear(channels)
+        return broker
+    raise ValueError(f"Unknown island broker: {spec.broker}")
+
+
+def _iterations(spec: OrchestrateSpec) -> int:
+    return min(5, spec.variants)
+
+
+class _SlotClient:
+    """Borrows the coordinator's scheduler slots, one per evaluation, over the broker."""
+
+    def __init__(self, index: int, broker: Broker) -> None:
+        self.index = index
+        self.broker = broker
+        self._waiters: Dict[int, "asyncio.Future[None]"] = {}
+        self._requests = 0
+        self._reader: Optional[asyncio.Task] = None
+
+    @contextlib.asynccontextmanager
+    async def slot(self, cost: float) -> AsyncIterator[None]:
+        request = self._requests
+        self._requests += 1
+        self._waiters[request] = asyncio.get_running_loop().create_future()
+        self.broker.publish(EVENTS_CHANNEL, {"island": self.index, "acquire": request, "cost": cost})
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.ensure_future(self._read())
+        try:
+            await self._waiters[request]
+            yield
+        finally:
+            del self._waiters[request]
+            self.broker.publish(EVENTS_CHANNEL, {"island": self.index, "release": request})
+
+    async def _read(self) -> None:
+        while self._waiters:
+            for message in await asyncio.to_thread(self.broker.drain, f"grant:{self.index}", 0.05):
+                waiter = self._waiters.get(message["grant"])
+                if waiter is not None and not waiter.done():
+                    waiter.set_result(None)
+
+
+async def _evaluate(
+    store: PopulationStore, evaluator: Any, spec: OrchestrateSpec, slots: Optional[_SlotClient]
+) -> None:
+    semaphore = asyncio.Semaphore(spec.concurrency)
+
+    async def evaluate_row(row: int) -> None:
+        async with semaphore:
+            slot = slots.slot(float(store.cost_usd[row])) if slots is not None else contextlib.nullcontext()
+            async with slot:
+                try:
+                    candidate = store.candidate(row)
+                    score = await asyncio.wait_for(evaluator.evaluate(candidate), spec.evaluation_timeout)
+                except Exception:
+                    store.mark(row, "failed")
+                else:
+                    store.apply_score(row, score)
+
+    await asyncio.gather(*(evaluate_row(row) for row in range(len(store))))
+
+
+def _migrate_in(store: PopulationStore, messages: List[Dict[str, Any]]) -> List[List[int]]:
+    """Replace the worst rows with incoming migrants; returns ``[row, source]`` pairs."""
+    migrants = [
+        (source, scores, artifact)
+        for message in messages
+        for source, scores, artifact in zip(
+            message["sources"], unpack(message["scores"]), message["artifacts"]
+        )
+    ]
+    if not migrants:
+        return []
+    worst = np.argsort(store.composite(), kind="stable")[: len(migrants)].tolist()
+    moved = []
+    for row, (source, scores, artifact) in zip(worst, migrants):
+        store.apply_score(row, ScoreVector(*scores.tolist()))
+        store.artifacts[row] = artifact
+        moved.append([row, source])
+    return moved
+
+
+def island_main(index: int, spec: OrchestrateSpec, broker: Broker, scheduled: bool = False) -> None:
+    """Entry point of one island process; one event loop serves the island's whole run."""
+    asyncio.run(_island(index, spec, broker, scheduled))
+
+
+async def _island(index: int, spec: OrchestrateSpec, broker: Broker, scheduled: bool) -> None:
+    seed = np.random.SeedSequence(spec.seed).spawn(spec.islands)[index]
+    rng = np.random.default_rng(seed)
+    store = PopulationStore.random(spec.variants, rng)
+    store.weights = resolve_weights(spec.weights)
+    if spec.artifacts:
+        store.artifacts = [spec.artifacts[row % len(spec.artifacts)] for row in range(len(store))]
+    evaluator = build_evaluator(spec)
+    slots = _SlotClient(index, broker) if scheduled else None
+    targets = neighbours(index, spec.islands, spec.topology)
+    offset = index * spec.variants
+    inbox = f"island:{index}"
+    try:
+        for iteration in range(1, _iterations(spec) + 1):
+            messages = broker.drain(inbox)
+            if any(message.get("stop") for message in messages):
+                break
+            store.mutate(rng)
+            if evaluator is not None:
+                await _evaluate(store, evaluator, spec, slots)
+            moved = _migrate_in(store, [message for message in messages if "sources" in message])
+            if targets and iteration % max(1, spec.migration_interval) == 0:
+                best = np.argsort(-store.composite(), kind="stable")[: spec.migrants]
+                migrants = {
+                    "sources": (best + offset).tolist(),
+                    "scores": pack(store.scores[best]),
+                    "artifacts": [store.artifacts[row] for row in best.tolist()],
+                }
+                for target in targets:
+                    broker.publish(f"island:{target}", migrants)
+            broker.publish(
+                EVENTS_CHANNEL,
+                {
+                    "island": index,
+                    "iteration": iteration,
+                    "scores": pack(store.scores),
+                    "cost": pack(store.cost_usd),
+                    "status": pack(store.status),
+                    "migrations": [[row + offset, source] for row, source in moved],
+                },
+            )
+    except Exception as exc:
+        broker.publish(EVENTS_CHANNEL, {"island": index, "error": str(exc)})
+        raise
+    finally:
+        close = getattr(evaluator, "close", None)
+        if close is not None:
+            close()
+    broker.publish(EVENTS_CHANNEL, {"island": index, "done": True})
+
+
+class MergedPopulation(PopulationStore):
+    def __init__(self, islands: int, island_size: int) -> None:
+        super().__init__(islands * island_size)
+        self.island_size = island_size
+
+    def identifier(self, row: int) -> str:
+        island, local = divmod(row, self.island_size)
+        return f"i{island}-v{local + 1}"
+
+
+class IslandTournament:
+    """Coordinates ``spec.islands`` island processes for one session."""
+
+    def __init__(
+        self,
+        spec: OrchestrateSpec,
+        settings: Settings,
+        emitter: Optional[EventEmitter] = None,
+        broker: Optional[Broker] = None,
+        scheduler: Optional[EvaluationScheduler] = None,
+        deadline: float = DEFAULT_DEADLINE_SECONDS,
+    ) -> None:
+        self.spec = spec
+        self.settings = settings
+        self.emitter = emitter or EventEmitter(session_id=spec.session_id)
+        self.scheduler = scheduler
+        self.deadline = deadline
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self.broker = broker or build_broker(spec, settings, self._context)
+        self.graph = GraphDiffer(mode=spec.mode.value, keyframe_interval=spec.keyframe_interval)
+        self.population = MergedPopulation(spec.islands, spec.variants)
+        self.population.weights = resolve_weights(spec.weights)
+        self.migrations = 0
+        self._cancelled = threading.Event()
+        self._started = 0.0
+        self._leases: Dict[Tuple[int, int], asyncio.Task] = {}
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def run(self) -> None:
+        spec = self.spec
+        self.emitter.emit_log(
+            f"Bootstrapping {spec.islands} islands of {spec.variants} candidates for task: {spec.task}"
+        )
+        scheduled = self.scheduler is not None
+        processes = [
+            # Not daemonic: islands may start their own sandbox worker pools.
+            self._context.Process(target=island_main, args=(index, spec, self.broker, scheduled))
+            for index in range(spec.islands)
+        ]
+        if self.scheduler is not None:
+            self.scheduler.register(spec.session_id, spec.mode)
+        self._started = time.perf_counter()
+        failure: Optional[str] = None
+        clean = False
+        try:
+            for process in processes:
+                process.start()
+            failure = asyncio.run(self._coordinate(processes))
+            clean = failure is None and not self._cancelled.is_set()
+        finally:
+            if self.scheduler is not None:
+                self.scheduler.unregister(spec.session_id)
+            for index in range(spec.islands):
+                self.broker.publish(f"island:{index}", {"stop": True})
+            for process in processes:
+                # A failed or overdue island may never read its inbox again.
+                if not clean and process.is_alive():
+                    process.terminate()
+                if process.pid is not None:
+                    process.join(timeout=5)
+                if process.is_alive():
+                    process.kill()
+        if failure is not None:
+            self.emitter.emit_error(failure)
+            return
+        if self._cancelled.is_set():
+            self.emitter.emit_log("Tournament cancelled")
+            self.emitter.emit_complete(status="cancelled")
+            return
+        self.emitter.emit_log("Tournament complete")
+        self.emitter.emit_complete()
+
+    async def _coordinate(self, processes: List[Any]) -> Optional[str]:
+        """Merge island reports until every island is done; returns the failure, if any."""
+        spec = self.spec
+        reported = [0] * spec.islands
+        finished = set()
+        emitted = 0
+        try:
+            while len(finished) < spec.islands:
+                if self._cancelled.is_set():
+                    return None
+                if time.perf_counter() - self._started > self.deadline:
+                    return f"Island tournament exceeded its {self.deadline:g}s deadline"
+                for message in await asyncio.to_thread(self.broker.drain, EVENTS_CHANNEL, 0.1):
+                    island = message["island"]
+                    if "error" in message:
+                        return f"Island {island} failed: {message['error']}"
+                    if "acquire" in message:
+                        self._lease(island, message["acquire"], message["cost"])
+                    elif "release" in message:
+                        self._unlease(island, message["release"])
+                    elif message.get("done"):
+                        finished.add(island)
+                    else:
+                        self._apply(message)
+                        reported[island] = message["iteration"]
+                round_complete = min(reported)
+                if round_complete > emitted:
+                    emitted = round_complete
+                    self.emitter.emit_log(f"Iteration {emitted}: merged {spec.islands} islands")
+                    self._emit()
+                dead = [
+                    index
+                    for index, process in enumerate(processes)
+                    if index not in finished and process.exitcode not in (None, 0)
+                ]
+                if dead:
+                    return f"Island {dead[0]} exited with code {processes[dead[0]].exitcode}"
+            return None
+        finally:
+            for key in list(self._leases):
+                self._unlease(*key)
+
+    def _lease(self, island: int, request: int, cost: float) -> None:
+        """Acquire a scheduler slot for an island's evaluation and tell the island once granted."""
+        assert self.scheduler is not None
+
+        async def grant() -> Any:
+            ticket = await self.scheduler.acquire(self.spec.session_id, cost)
+            self.broker.publish(f"grant:{island}", {"grant": request})
+            return ticket
+
+        self._leases[(island, request)] = asyncio.ensure_future(grant())
+
+    def _unlease(self, island: int, request: int) -> None:
+        task = self._leases.pop((island, request), None)
+        if task is None:
+            return
+        if task.done() and not task.cancelled() and task.exception() is None:
+            self.scheduler.release(task.result())
+        else:
+            # ``acquire`` gives back a slot granted while it is being cancelled.
+            task.cancel()
+
+    def _apply(self, message: Dict[str, Any]) -> None:
+        start = message["island"] * self.spec.variants
+        rows = slice(start, start + self.spec.variants)
+        population = self.population
+        population.scores[rows] = unpack(message["scores"])
+        population.cost_usd[rows] = unpack(message["cost"])
+        population.status[rows] = unpack(message["status"])
+        for row, source in message["migrations"]:
+            population.parent[row] = source
+        self.migrations += len(message["migrations"])
+
+    def _emit(self) -> None:
+        metrics = self._summary_metrics()
+        event, payload = self.graph.next_event(self.population, metrics)
+        if event == "graph":
+            self.emitter.emit_graph(payload)
+        else:
+            self.emitter.emit_graph_delta(payload)
+        self.emitter.emit_metrics(metrics)
+
+    def _summary_metrics(self) -> List[Dict[str, Any]]:
+        population = self.population
+        elapsed = time.perf_counter() - self._started
+        return [
+            {"name": "avg_correctness", "value": float(population.column("correctness").mean())},
+            {"name": "avg_cost", "value": float(population.cost_usd.mean()), "unit": "USD"},
+            {"name": "population", "value": float(len(population))},
+            {"name": "islands", "value": float(self.spec.islands)},
+            {"name": "migrations", "value": float(self.migrations)},
+            {"name": "island_elapsed_ms", "value": elapsed * 1000, "unit": "ms"},
+        ]
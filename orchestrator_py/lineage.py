@@ -0,0 +1,149 @@
+"""Array-backed lineage of every candidate a session has produced.
+
+Candidate ids are interned to dense integers in insertion order and parent
+links are stored CSR-style: the parents of node ``i`` are
+``parents[offsets[i]:offsets[i + 1]]``. Both arrays grow by doubling, so
+registering a generation is a couple of vectorized copies. A child index (the
+transposed CSR) is built lazily for descendant queries. Ancestry walks are
+level-synchronous breadth-first searches that gather a whole frontier per step.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+def _gather(offsets: np.ndarray, values: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """Concatenate ``values[offsets[n]:offsets[n + 1]]`` for every node."""
+    starts = offsets[nodes]
+    lengths = offsets[nodes + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return np.empty(0, dtype=values.dtype)
+    index = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+    return values[index]
+
+
+class LineageStore:
+    def __init__(self, capacity: int = 1024) -> None:
+        self.labels: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._offsets = np.zeros(capacity + 1, dtype=np.int64)
+        self._parents = np.empty(capacity, dtype=np.int32)
+        self._edges = 0
+        self._children: Optional[tuple[np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @classmethod
+    def from_arrays(cls, labels: Sequence[str], offsets: np.ndarray, parents: np.ndarray) -> "LineageStore":
+        store = cls(capacity=max(1, len(parents)))
+        store._append(labels, np.diff(offsets), np.asarray(parents, dtype=np.int32))
+        return store
+
+    @property
+    def offsets(self) -> np.ndarray:
+        return self._offsets[: len(self) + 1]
+
+    @property
+    def parents(self) -> np.ndarray:
+        return self._parents[: self._edges]
+
+    def index_of(self, label: str) -> int:
+        if len(self._index) < len(self.labels):
+            start = len(self._index)
+            self._index.update(zip(self.labels[start:], range(start, len(self.labels))))
+        return self._index[label]
+
+    def add(self, label: str, parents: Iterable[str] = ()) -> int:
+        return self.add_many([label], [[self.index_of(parent) for parent in parents]])[0]
+
+    def add_generation(self, labels: Sequence[str], parents: np.ndarray) -> range:
+        """Register single-parent nodes; ``parents[i]`` is a node index or -1."""
+        parents = np.asarray(parents)
+        present = parents >= 0
+        counts = present.astype(np.int64)
+        return self._append(labels, counts, parents[present])
+
+    def add_many(self, labels: Sequence[str], parents: Sequence[Sequence[int]]) -> range:
+        counts = np.fromiter((len(items) for items in parents), dtype=np.int64, count=len(parents))
+        flat = np.fromiter((parent for items in parents for parent in items), dtype=np.int32, count=int(counts.sum()))
+        return self._append(labels, counts, flat)
+
+    def _append(self, labels: Sequence[str], counts: np.ndarray, flat: np.ndarray) -> range:
+        start = len(self)
+        stop = start + len(labels)
+        if len(flat) and (flat.min() < 0 or flat.max() >= stop):
+            raise ValueError("Parent index out of range")
+        if stop + 1 > len(self._offsets):
+            self._offsets = np.resize(self._offsets, max(stop + 1, 2 * len(self._offsets)))
+        edges = self._edges + len(flat)
+        if edges > len(self._parents):
+            self._parents = np.resize(self._parents, max(edges, 2 * len(self._parents)))
+        self._offsets[start + 1 : stop + 1] = self._edges + np.cumsum(counts)
+        self._parents[self._edges : edges] = flat
+        self._edges = edges
+        self.labels.extend(labels)
+        self._children = None
+        return range(start, stop)
+
+    def _child_index(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._children is None:
+            owners = np.repeat(np.arange(len(self), dtype=np.int32), np.diff(self.offsets))
+            parents = self.parents
+            order = np.argsort(parents, kind="stable")
+            offsets = np.zeros(len(self) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(parents, minlength=len(self)), out=offsets[1:])
+            self._children = (offsets, owners[order])
+        return self._children
+
+    def _walk(self, offsets: np.ndarray, values: np.ndarray, seeds: Iterable[int], depth: Optional[int]) -> np.ndarray:
+        seen = np.zeros(len(self), dtype=bool)
+        frontier = np.unique(np.asarray(list(seeds), dtype=np.int64))
+        level = 0
+        while len(frontier) and (depth is None or level < depth):
+            reached = np.unique(_gather(offsets, values, frontier))
+            frontier = reached[~seen[reached]].astype(np.int64)
+            seen[frontier] = True
+            level += 1
+        return np.flatnonzero(seen)
+
+    def ancestors(self, nodes: Iterable[int], depth: Optional[int] = None) -> np.ndarray:
+        """Proper ancestors of ``nodes`` within ``depth`` generations."""
+        return self._walk(self.offsets, self.parents, nodes, depth)
+
+    def descendants(self, nodes: Iterable[int], depth: Optional[int] = None) -> np.ndarray:
+        offsets, children = self._child_index()
+        return self._walk(offsets, children, nodes, depth)
+
+    def common_ancestors(self, nodes: Iterable[int]) -> np.ndarray:
+        common: Optional[np.ndarray] = None
+        for node in nodes:
+            found = self.ancestors([node])
+            common = found if common is None else np.intersect1d(common, found, assume_unique=True)
+        return common if common is not None else np.empty(0, dtype=np.int64)
+
+    def lowest_common_ancestors(self, nodes: Iterable[int]) -> np.ndarray:
+        """Common ancestors that are not themselves ancestors of another one."""
+        common = self.common_ancestors(nodes)
+        return np.setdiff1d(common, self.ancestors(common), assume_unique=True)
+
+    def subgraph(self, seeds: Iterable[int], depth: Optional[int] = None) -> Dict[str, list]:
+        """``seeds`` with their ancestors up to ``depth``, as ids and edges."""
+        seeds = np.asarray(list(seeds), dtype=np.int64)
+        nodes = np.union1d(seeds, self.ancestors(seeds, depth))
+        member = np.zeros(len(self), dtype=bool)
+        member[nodes] = True
+        counts = np.diff(self.offsets)[nodes]
+        targets = np.repeat(nodes, counts)
+        sources = _gather(self.offsets, self.parents, nodes)
+        keep = member[sources]
+        labels = self.labels
+        edges = []
+        for source, target in zip(sources[keep].tolist(), targets[keep].tolist()):
+            source_id, target_id = labels[source], labels[target]
+            edges.append({"id": f"{source_id}->{target_id}", "source": source_id, "target": target_id})
+        return {"nodes": [labels[node] for node in nodes.tolist()], "edges": edges}
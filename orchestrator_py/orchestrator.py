@@ -2,125 +2,360 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
-import random
+import threading
 import time
-from dataclasses import dataclass
-from typing import Iterable, List
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
 
 from .config import Mode, OrchestrateSpec, Settings
-from .evaluation.scoring import ScoreVector
+from .evaluation.evaluator import EvaluationResult, Evaluator, build_evaluator
+from .evaluation.scoring import resolve_weights
+from .evaluation.surrogate import SurrogateScreen, features
+from .graph import LEADERBOARD_SIZE, GraphDiffer
+from .lineage import LineageStore
+from .population import PopulationStore, VersionCandidate
+from .racing import SuccessiveHalving
+from .scheduler import EvaluationScheduler
+from .storage.checkpoint import Checkpoint, CheckpointError, checkpoint_path, read_checkpoint, write_checkpoint
 from .util.events import EventEmitter
-
-
-@dataclass
-class VersionCandidate:
-    identifier: str
-    parent_ids: List[str]
-    summary: str
-    score: ScoreVector
-    cost_usd: float
-    status: str
+from .util.rng import RngStreams
+from .util.tracing import NULL_TRACER, StackSampler, Tracer
 
 
 class TournamentOrchestrator:
-    def __init__(self, spec: OrchestrateSpec, settings: Settings) -> None:
+    def __init__(
+        self,
+        spec: OrchestrateSpec,
+        settings: Settings,
+        emitter: Optional[EventEmitter] = None,
+        evaluator: Optional[Evaluator] = None,
+        scheduler: Optional[EvaluationScheduler] = None,
+    ) -> None:
         self.spec = spec
+        self.scheduler = scheduler
         self.settings = settings
-        self.emitter = EventEmitter(session_id=spec.session_id)
-        self.random = random.Random(spec.seed)
+        self.emitter = emitter or EventEmitter(session_id=spec.session_id)
+        self._owns_evaluator = evaluator is None
+        self.evaluator = evaluator if evaluator is not None else build_evaluator(spec)
+        self.weights = resolve_weights(spec.weights)
+        self.streams = RngStreams(spec.seed)
+        self.lineage = LineageStore()
+        self.graph = GraphDiffer(
+            mode=spec.mode.value, keyframe_interval=spec.keyframe_interval, lineage=self.lineage
+        )
+        self._cancelled = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._main_task: Optional[asyncio.Task] = None
+        self._evaluations: Dict[str, asyncio.Task] = {}
+        self.tracer = NULL_TRACER
+        self._iteration = 0
+        self._mutation_pool: Optional[ThreadPoolExecutor] = None
+        self.racing: Optional[SuccessiveHalving] = None
+        self.surrogate = SurrogateScreen() if spec.surrogate and self.evaluator is not None else None
 
     def run(self) -> None:
-        self.emitter.emit_log(f"Bootstrapping tournament for task: {self.spec.task}")
-        population = self._initial_population()
+        asyncio.run(self.run_async())
+
+    async def run_async(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._main_task = asyncio.current_task()
+        if self.spec.trace or self.spec.profile:
+            # The sampler watches this thread, which runs the session's loop.
+            sampler = StackSampler() if self.spec.profile else None
+            self.tracer = Tracer(self.emitter, allocations=self.spec.trace_allocations, sampler=sampler)
+        if self.scheduler is not None:
+            self.scheduler.register(self.spec.session_id, self.spec.mode)
+        if self.spec.mutation_workers > 1:
+            self._mutation_pool = ThreadPoolExecutor(self.spec.mutation_workers, thread_name_prefix="mutate")
+        cancelled = False
+        try:
+            await self._tournament()
+        except asyncio.CancelledError:
+            cancelled = True
+        finally:
+            if self.scheduler is not None:
+                self.scheduler.unregister(self.spec.session_id)
+            if self._mutation_pool is not None:
+                self._mutation_pool.shutdown()
+            close = getattr(self.evaluator, "close", None)
+            if self._owns_evaluator and close is not None:
+                close()
+            self.tracer.finish({"events": dict(self.emitter.counts), "sink": self.emitter.sink.stats()})
+        if cancelled:
+            self.emitter.emit_log("Tournament cancelled")
+            self.emitter.emit_complete(status="cancelled")
+            return
+        self.emitter.emit_log("Tournament complete")
+        self.emitter.emit_complete()
+
+    def cancel(self) -> None:
+        """Cancel the tournament; safe to call from any thread."""
+        self._cancelled.set()
+        if self._loop is not None and self._main_task is not None:
+            self._loop.call_soon_threadsafe(self._main_task.cancel)
+
+    def cancel_candidate(self, identifier: str) -> None:
+        task = self._evaluations.get(identifier)
+        if task is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(task.cancel)
+
+    async def _tournament(self) -> None:
+        tracer = self.tracer
+        checkpoint = self._load_checkpoint() if self.spec.resume else None
+        if checkpoint is None:
+            self.emitter.emit_log(f"Bootstrapping tournament for task: {self.spec.task}")
+            if self.spec.seed is None:
+                self.emitter.emit_log(f"No seed given; replay this session with seed {self.streams.entropy}")
+            with tracer.span("initial_population"):
+                population = self._initial_population()
+            start = 1
+        else:
+            self.emitter.emit_log(f"Resuming tournament from checkpoint at iteration {checkpoint.iteration}")
+            population = checkpoint.population
+            start = checkpoint.iteration + 1
         self._emit_graph(population)
         self._emit_metrics(population)
+        tracer.flush()
 
-        for iteration in range(1, min(5, self.spec.variants) + 1):
-            time.sleep(0.2)
-            self.emitter.emit_log(f"Iteration {iteration}: evaluating candidates")
-            population = self._mutate(population)
-            self._emit_graph(population)
-            self._emit_metrics(population)
+        iterations = min(5, self.spec.variants)
+        racing = self.racing = SuccessiveHalving.from_spec(self.spec, len(population), iterations)
+        if racing is not None and checkpoint is not None:
+            racing.resume(population, checkpoint.iteration, checkpoint.racing)
+        for iteration in range(start, iterations + 1):
+            if self._cancelled.is_set():
+                raise asyncio.CancelledError
+            rows: Optional[np.ndarray] = None
+            if racing is not None:
+                rows = racing.promote(population, iteration)
+            if self.surrogate is not None:
+                rows = self._screen(population, np.arange(len(population)) if rows is None else rows)
+            if racing is not None:
+                paid = racing.charge(population, rows)
+                if len(rows) and not len(paid):
+                    racing.skip(population, iterations - iteration)
+                    self.emitter.emit_log(f"Evaluation budget exhausted before iteration {iteration}")
+                    self._emit_graph(population)
+                    self._emit_metrics(population)
+                    break
+                rows = paid
+            if rows is None:
+                self.emitter.emit_log(f"Iteration {iteration}: evaluating candidates")
+            else:
+                pruned = f" ({racing.pruned} pruned)" if racing is not None else ""
+                self.emitter.emit_log(f"Iteration {iteration}: evaluating {len(rows)} candidates{pruned}")
+            observed = features(population, rows) if self.surrogate is not None else None
+            with tracer.span("iteration"):
+                with tracer.span("mutate"):
+                    population = self._mutate(population, iteration, rows)
+                if self.evaluator is not None:
+                    evaluated = list(range(len(population))) if rows is None else rows.tolist()
+                    with tracer.span("evaluate"):
+                        results = await self._evaluate(population, evaluated)
+                    if observed is not None:
+                        self._learn(population, rows, observed, results)
+                self._emit_graph(population)
+                self._emit_metrics(population)
+                if iteration % max(1, self.spec.checkpoint_interval) == 0 or iteration == iterations:
+                    with tracer.span("checkpoint"):
+                        self._save_checkpoint(population, iteration)
+            tracer.count("iterations")
+            tracer.flush()
+            await asyncio.sleep(0)
 
-        self.emitter.emit_log("Tournament complete")
-        self.emitter.emit_complete()
+    async def _evaluate(self, population: PopulationStore, rows: List[int]) -> List[EvaluationResult]:
+        """Evaluate ``rows`` under the mode's concurrency limit, streaming each
+        result as a partial graph delta as soon as it completes."""
+        semaphore = asyncio.Semaphore(self.spec.concurrency)
+        scheduler = self.scheduler
+
+        async def evaluate_row(row: int) -> EvaluationResult:
+            async with semaphore:
+                if scheduler is not None:
+                    ticket = await scheduler.acquire(self.spec.session_id, float(population.cost_usd[row]))
+                started = time.perf_counter()
+                try:
+                    score = await asyncio.wait_for(
+                        self.evaluator.evaluate(self._candidate(population, row)),
+                        timeout=self.spec.evaluation_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    return EvaluationResult(row, "timeout", elapsed=time.perf_counter() - started)
+                except Exception as exc:
+                    return EvaluationResult(row, "failed", elapsed=time.perf_counter() - started, error=str(exc))
+                finally:
+                    if scheduler is not None:
+                        scheduler.release(ticket)
+                return EvaluationResult(row, "scored", score=score, elapsed=time.perf_counter() - started)
+
+        rows_by_task = {asyncio.ensure_future(evaluate_row(row)): row for row in rows}
+        self._evaluations = {population.identifier(row): task for task, row in rows_by_task.items()}
+        results: List[EvaluationResult] = []
+        pending = set(rows_by_task)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled():
+                        result = EvaluationResult(rows_by_task[task], "cancelled")
+                    else:
+                        result = task.result()
+                    self._record(population, result)
+                    results.append(result)
+        finally:
+            for task in pending:
+                task.cancel()
+            # Let cancelled evaluations unwind (and release their scheduler slots) before returning.
+            await asyncio.gather(*pending, return_exceptions=True)
+            self._evaluations = {}
+        return results
+
+    def _screen(self, population: PopulationStore, rows: np.ndarray) -> np.ndarray:
+        """Drop the rows the surrogate is confident cannot reach the leaderboard."""
+        composite = population.composite()
+        rank = max(0, len(composite) - LEADERBOARD_SIZE)
+        cutoff = float(np.partition(composite, rank)[rank])
+        keep, skipped = self.surrogate.screen(population, rows, cutoff)
+        if len(skipped):
+            self.emitter.emit_log(f"Surrogate deferred {len(skipped)} candidates below the leaderboard cutoff")
+        return keep
 
-    def _initial_population(self) -> List[VersionCandidate]:
-        candidates: List[VersionCandidate] = []
-        for index in range(self.spec.variants):
-            candidate = VersionCandidate(
-                identifier=f"v{index+1}",
-                parent_ids=[],
-                summary=f"Variant {index+1}: baseline design",
-                score=ScoreVector.random(self.random),
-                cost_usd=round(self.random.uniform(0.5, 5.0), 2),
-                status="pending",
-            )
-            candidates.append(candidate)
-        return candidates
-
-    def _mutate(self, population: List[VersionCandidate]) -> List[VersionCandidate]:
-        for candidate in population:
-            delta = self.random.uniform(-0.2, 0.4)
-            candidate.score.correctness = min(1.0, max(0.0, candidate.score.correctness + delta))
-            candidate.score.performance = min(1.0, max(0.0, candidate.score.performance + delta / 2))
-            candidate.cost_usd = round(max(0.1, candidate.cost_usd * (1 + self.random.uniform(-0.1, 0.1))), 2)
-            candidate.status = "passed" if candidate.score.correctness > 0.7 else "running"
-        population.sort(key=lambda c: c.score.composite, reverse=True)
+    def _learn(
+        self, population: PopulationStore, rows: np.ndarray, observed: np.ndarray, results: List[EvaluationResult]
+    ) -> None:
+        position = {row: index for index, row in enumerate(rows.tolist())}
+        # Row order, not completion order, keeps the fit independent of scheduling.
+        scored = np.sort([position[result.row] for result in results if result.score is not None]).astype(np.int64)
+        composites = population.composite(rows[scored]).astype(np.float64)
+        self.surrogate.observe(observed[scored], composites)
+        self.surrogate.settle(rows[scored], composites)
+
+    def _record(self, population: PopulationStore, result: EvaluationResult) -> None:
+        self.tracer.count(f"evaluations.{result.status}")
+        if result.score is not None:
+            population.apply_score(result.row, result.score)
+        else:
+            population.mark(result.row, "failed")
+            identifier = population.identifier(result.row)
+            self.emitter.emit_log(f"Evaluation of {identifier} {result.status}: {result.error or 'no result'}")
+        self.emitter.emit_graph_delta(self.graph.partial(population, [result.row]))
+
+    def _checkpoint_file(self) -> Optional[Path]:
+        directory = self.spec.checkpoint_dir
+        return checkpoint_path(directory, self.spec.session_id) if directory else None
+
+    def _checkpoint_spec(self) -> Dict[str, object]:
+        spec = self.spec
+        return {"task": spec.task, "mode": spec.mode.value, "variants": spec.variants, "seed": spec.seed}
+
+    def _save_checkpoint(self, population: PopulationStore, iteration: int) -> None:
+        path = self._checkpoint_file()
+        if path is None:
+            return
+        state = Checkpoint(
+            iteration=iteration,
+            rng_state={"entropy": self.streams.entropy},
+            population=population,
+            lineage=self.lineage,
+            spec=self._checkpoint_spec(),
+            racing=self.racing.state() if self.racing is not None else {},
+        )
+        write_checkpoint(path, state)
+
+    def _load_checkpoint(self) -> Optional[Checkpoint]:
+        path = self._checkpoint_file()
+        if path is None or not path.exists():
+            self.emitter.emit_log("No checkpoint to resume from; starting a new tournament")
+            return None
+        checkpoint = read_checkpoint(path)
+        if checkpoint.spec != self._checkpoint_spec():
+            raise CheckpointError(f"Checkpoint {path} was written for a different tournament")
+        self.streams = RngStreams(checkpoint.rng_state["entropy"])
+        checkpoint.population.weights = self.weights
+        self.lineage = self.graph.lineage = checkpoint.lineage
+        return checkpoint
+
+    def _initial_population(self) -> PopulationStore:
+        population = PopulationStore.random(self.spec.variants, self.streams.initial())
+        population.weights = self.weights
+        if self.spec.artifacts:
+            artifacts = self.spec.artifacts
+            population.artifacts = [artifacts[row % len(artifacts)] for row in range(len(population))]
+        labels = [population.identifier(row) for row in range(len(population))]
+        self.lineage.add_generation(labels, population.parent)
+        return population
+
+    def _mutate(
+        self, population: PopulationStore, iteration: int, rows: Optional[np.ndarray] = None
+    ) -> PopulationStore:
+        """Mutate in fixed-size chunks, each with its own stream, so spreading
+        them over ``mutation_workers`` threads gives bit-identical results."""
+        self._iteration = iteration
+        chunks = list(self.streams.mutation_chunks(iteration, rows, len(population)))
+        if self._mutation_pool is not None and len(chunks) > 1:
+            list(self._mutation_pool.map(lambda chunk: population.mutate(*chunk), chunks))
+        else:
+            for rng, chunk_rows in chunks:
+                population.mutate(rng, chunk_rows)
         return population
 
-    def _emit_graph(self, population: Iterable[VersionCandidate]) -> None:
-        nodes = []
-        edges = []
-        for candidate in population:
-            nodes.append(
-                {
-                    "id": candidate.identifier,
-                    "parentIds": candidate.parent_ids,
-                    "summary": candidate.summary,
-                    "status": candidate.status,
-                    "score": candidate.score.to_dict(),
-                    "costUsd": candidate.cost_usd,
-                    "mode": self.spec.mode.value,
-                    "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                }
-            )
-            for parent_id in candidate.parent_ids:
-                edges.append({
-                    "id": f"{parent_id}->{candidate.identifier}",
-                    "source": parent_id,
-                    "target": candidate.identifier,
-                })
-        leaderboard = sorted(nodes, key=lambda node: node["score"]["correctness"], reverse=True)[:5]
-        snapshot = {
-            "nodes": nodes,
-            "edges": edges,
-            "leaderboard": leaderboard,
-            "metrics": self._summary_metrics(population),
-        }
-        self.emitter.emit_graph(snapshot)
-
-    def _emit_metrics(self, population: Iterable[VersionCandidate]) -> None:
-        metrics = self._summary_metrics(population)
-        self.emitter.emit_metrics(metrics)
-
-    def _summary_metrics(self, population: Iterable[VersionCandidate]):
-        population = list(population)
-        if not population:
+    def _candidate(self, population: PopulationStore, row: int) -> VersionCandidate:
+        candidate = population.candidate(row)
+        candidate.seed = self.streams.candidate_seed(self._iteration, row)
+        return candidate
+
+    def _emit_graph(self, population: PopulationStore) -> None:
+        with self.tracer.span("graph"):
+            event, payload = self.graph.next_event(population, self._summary_metrics(population))
+        with self.tracer.span("emit"):
+            if event == "graph":
+                self.emitter.emit_graph(payload)
+            else:
+                self.emitter.emit_graph_delta(payload)
+
+    def _emit_metrics(self, population: PopulationStore) -> None:
+        with self.tracer.span("metrics"):
+            metrics = self._summary_metrics(population)
+            self.emitter.emit_metrics(metrics)
+
+    def _summary_metrics(self, population: PopulationStore):
+        if not len(population):
             return []
-        avg_correctness = sum(candidate.score.correctness for candidate in population) / len(population)
-        avg_cost = sum(candidate.cost_usd for candidate in population) / len(population)
         return [
-            {"name": "avg_correctness", "value": avg_correctness},
-            {"name": "avg_cost", "value": avg_cost, "unit": "USD"},
+            {"name": "avg_correctness", "value": float(population.column("correctness").mean())},
+            {"name": "avg_cost", "value": float(population.cost_usd.mean()), "unit": "USD"},
             {"name": "population", "value": float(len(population))},
+            *getattr(self.evaluator, "metrics", list)(),
+            *(self.scheduler.metrics(self.spec.session_id) if self.scheduler is not None else []),
+            *(self.racing.metrics() if self.racing is not None else []),
+            *(self.surrogate.metrics() if self.surrogate is not None else []),
         ]
 
 
-def run_from_payload(payload: str, session_id: str) -> None:
+def create_tournament(
+    spec: OrchestrateSpec,
+    settings: Settings,
+    emitter: Optional[EventEmitter] = None,
+    scheduler: Optional[EvaluationScheduler] = None,
+):
+    """A ``TournamentOrchestrator``, or an ``IslandTournament`` when ``spec.islands > 1``."""
+    if spec.islands > 1:
+        from .islands import IslandTournament
+
+        return IslandTournament(spec=spec, settings=settings, emitter=emitter, scheduler=scheduler)
+    return TournamentOrchestrator(spec=spec, settings=settings, emitter=emitter, scheduler=scheduler)
+
+
+def run_from_payload(payload: str, session_id: str, resume: Optional[bool] = None) -> None:
+    """Run one tournament; ``resume`` (or ``"resume": true`` in the payload)
+    continues from the session's last checkpoint when one exists."""
     data = json.loads(payload)
     settings = Settings.from_env()
     spec = OrchestrateSpec.from_request(data, session_id=session_id)
-    orchestrator = TournamentOrchestrator(spec=spec, settings=settings)
-    orchestrator.run()
+    if resume is not None:
+        spec.resume = resume
+    create_tournament(spec, settings).run()
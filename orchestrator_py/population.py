@@ -0,0 +1,157 @@
+"""Column-oriented population storage for the tournament engine.
+
+Scores live in one float32 column per ``ScoreVector`` dimension (a
+Fortran-ordered matrix, so every column is contiguous) alongside cost, status
+and parent-index columns. Mutation, clamping and composite scoring (with the
+session's weights) run as batch NumPy operations; ``VersionCandidate``
+objects are only materialized as views when a caller needs them, e.g. for
+emission.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from .evaluation.scoring import DEFAULT_WEIGHTS, SCORE_DIMENSIONS, ScoreVector, composite_batch
+
+STATUSES = ("pending", "running", "passed", "failed", "pruned")
+STATUS_CODES = {name: code for code, name in enumerate(STATUSES)}
+PASS_THRESHOLD = 0.7
+
+_CORRECTNESS = SCORE_DIMENSIONS.index("correctness")
+_PERFORMANCE = SCORE_DIMENSIONS.index("performance")
+
+
+@dataclass
+class VersionCandidate:
+    identifier: str
+    parent_ids: List[str]
+    summary: str
+    score: ScoreVector
+    cost_usd: float
+    status: str
+    artifact: str = ""
+    seed: Optional[int] = None
+
+
+class PopulationStore:
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.scores = np.zeros((size, len(SCORE_DIMENSIONS)), dtype=np.float32, order="F")
+        self.cost_usd = np.zeros(size, dtype=np.float32)
+        self.status = np.zeros(size, dtype=np.int8)
+        self.parent = np.full(size, -1, dtype=np.int32)
+        self.created_at = np.full(size, time.time(), dtype=np.float64)
+        self.artifacts: List[str] = [""] * size
+        self._weights = DEFAULT_WEIGHTS
+        self._column_weights = DEFAULT_WEIGHTS.astype(np.float32)
+        self._order: Optional[np.ndarray] = np.arange(size, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @classmethod
+    def random(cls, size: int, rng: np.random.Generator) -> "PopulationStore":
+        store = cls(size)
+        low = np.full(len(SCORE_DIMENSIONS), 0.2, dtype=np.float32)
+        high = np.full(len(SCORE_DIMENSIONS), 0.9, dtype=np.float32)
+        high[_CORRECTNESS] = 0.8
+        store.scores[:] = rng.uniform(low, high, size=(size, len(SCORE_DIMENSIONS)))
+        store.cost_usd[:] = np.round(rng.uniform(0.5, 5.0, size=size), 2)
+        store.status[:] = STATUS_CODES["pending"]
+        return store
+
+    @property
+    def weights(self) -> np.ndarray:
+        return self._weights
+
+    @weights.setter
+    def weights(self, weights: np.ndarray) -> None:
+        self._weights = weights
+        # Matches the score columns' dtype so composites need no conversion.
+        self._column_weights = weights.astype(np.float32)
+        self._order = None
+
+    def column(self, name: str) -> np.ndarray:
+        return self.scores[:, SCORE_DIMENSIONS.index(name)]
+
+    def mutate(self, rng: np.random.Generator, rows: Optional[np.ndarray | slice] = None) -> None:
+        """Mutate every row, or only ``rows`` (e.g. the survivors of a race or
+        one chunk of a parallel mutation)."""
+        if rows is not None:
+            self._mutate_rows(rng, rows)
+            return
+        delta = rng.uniform(-0.2, 0.4, size=self.size).astype(np.float32)
+        drift = rng.uniform(-0.1, 0.1, size=self.size).astype(np.float32)
+        correctness = self.scores[:, _CORRECTNESS]
+        performance = self.scores[:, _PERFORMANCE]
+        np.clip(correctness + delta, 0.0, 1.0, out=correctness)
+        np.clip(performance + delta / 2, 0.0, 1.0, out=performance)
+        np.round(np.maximum(0.1, self.cost_usd * (1 + drift)), 2, out=self.cost_usd)
+        self.status[:] = np.where(
+            correctness > PASS_THRESHOLD, STATUS_CODES["passed"], STATUS_CODES["running"]
+        )
+        self._order = None
+
+    def _mutate_rows(self, rng: np.random.Generator, rows: np.ndarray | slice) -> None:
+        count = len(self.status[rows])
+        delta = rng.uniform(-0.2, 0.4, size=count).astype(np.float32)
+        drift = rng.uniform(-0.1, 0.1, size=count).astype(np.float32)
+        correctness = np.clip(self.scores[rows, _CORRECTNESS] + delta, 0.0, 1.0)
+        self.scores[rows, _CORRECTNESS] = correctness
+        self.scores[rows, _PERFORMANCE] = np.clip(self.scores[rows, _PERFORMANCE] + delta / 2, 0.0, 1.0)
+        self.cost_usd[rows] = np.round(np.maximum(0.1, self.cost_usd[rows] * (1 + drift)), 2)
+        self.status[rows] = np.where(
+            correctness > PASS_THRESHOLD, STATUS_CODES["passed"], STATUS_CODES["running"]
+        )
+        self._order = None
+
+    def apply_score(self, row: int, score: ScoreVector, status: Optional[str] = None) -> None:
+        self.scores[row] = score.values
+        if status is None:
+            status = "passed" if score.correctness > PASS_THRESHOLD else "running"
+        self.status[row] = STATUS_CODES[status]
+        self._order = None
+
+    def mark(self, row: int, status: str) -> None:
+        self.status[row] = STATUS_CODES[status]
+
+    def mark_many(self, rows: np.ndarray, status: str) -> None:
+        self.status[rows] = STATUS_CODES[status]
+
+    def composite(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        return composite_batch(self.scores if rows is None else self.scores[rows], self._column_weights)
+
+    @property
+    def order(self) -> np.ndarray:
+        """Rows by descending composite; sorted lazily after scores change."""
+        if self._order is None:
+            self._order = np.argsort(-self.composite(), kind="stable")
+        return self._order
+
+    def rank(self) -> np.ndarray:
+        self._order = None
+        return self.order
+
+    def identifier(self, row: int) -> str:
+        return f"v{row + 1}"
+
+    def candidate(self, row: int) -> VersionCandidate:
+        parent = int(self.parent[row])
+        return VersionCandidate(
+            identifier=self.identifier(row),
+            parent_ids=[self.identifier(parent)] if parent >= 0 else [],
+            summary=f"Variant {row + 1}: baseline design",
+            score=ScoreVector.from_array(self.scores[row], self._weights),
+            cost_usd=round(float(self.cost_usd[row]), 2),
+            status=STATUSES[self.status[row]],
+            artifact=self.artifacts[row],
+        )
+
+    def candidates(self, rows: Optional[np.ndarray] = None) -> Iterator[VersionCandidate]:
+        for row in (self.order if rows is None else rows).tolist():
+            yield self.candidate(row)
@@ -0,0 +1,124 @@
+"""Successive-halving races over tournament iterations under an evaluation budget.
+
+Iterations are the rungs of the race. Every candidate gets one cheap evaluation
+in the first iteration; before each later iteration only the best
+``1 / eta`` of the survivors by composite score are promoted, and the rest are
+marked ``pruned`` and never evaluated again, so evaluation effort concentrates
+on the candidates still worth refining. A session budget in USD (an evaluation
+charges the candidate's ``cost_usd``) or in evaluations caps the race: when it
+cannot pay for a whole rung, only the best candidates it can afford run, and
+the race ends with the rung the budget can no longer pay for at all.
+
+Savings are measured against the exhaustive schedule, which evaluates every
+candidate in every iteration.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .config import OrchestrateSpec
+from .population import STATUS_CODES, PopulationStore
+
+
+class SuccessiveHalving:
+    def __init__(
+        self,
+        size: int,
+        iterations: int,
+        eta: float = 2.0,
+        budget_usd: Optional[float] = None,
+        budget_evaluations: Optional[int] = None,
+    ) -> None:
+        if eta < 1:
+            raise ValueError("eta must be at least 1")
+        self.size = size
+        self.iterations = iterations
+        self.eta = eta
+        self.budget_usd = budget_usd
+        self.budget_evaluations = budget_evaluations
+        self.active = np.arange(size, dtype=np.int64)
+        self.rounds = 0
+        self.evaluations = 0
+        self.spent_usd = 0.0
+        self.pruned = 0
+        self._baseline_usd = 0.0
+
+    @classmethod
+    def from_spec(cls, spec: OrchestrateSpec, size: int, iterations: int) -> Optional["SuccessiveHalving"]:
+        """A race for ``spec``, or ``None`` when it neither races nor has a budget."""
+        if not spec.racing and spec.budget_usd is None and spec.budget_evaluations is None:
+            return None
+        return cls(
+            size,
+            iterations,
+            eta=spec.eta if spec.racing else 1.0,
+            budget_usd=spec.budget_usd,
+            budget_evaluations=spec.budget_evaluations,
+        )
+
+    def state(self) -> Dict[str, Any]:
+        """Budget counters a checkpoint must carry so a resume cannot spend them again."""
+        return {"evaluations": self.evaluations, "spent_usd": self.spent_usd}
+
+    def resume(self, population: PopulationStore, iteration: int, state: Optional[Dict[str, Any]] = None) -> None:
+        """Continue a race whose first ``iteration`` rungs ran before a checkpoint."""
+        self.active = np.flatnonzero(population.status != STATUS_CODES["pruned"])
+        self.pruned = self.size - len(self.active)
+        if state:
+            self.evaluations = int(state["evaluations"])
+            self.spent_usd = float(state["spent_usd"])
+        self.skip(population, iteration)
+
+    def survivors(self, iteration: int) -> int:
+        return max(1, math.ceil(self.size / self.eta ** (iteration - 1)))
+
+    def _prune(self, population: PopulationStore, rows: np.ndarray) -> None:
+        if len(rows):
+            population.mark_many(rows, "pruned")
+            self.active = np.setdiff1d(self.active, rows, assume_unique=True)
+            self.pruned += len(rows)
+
+    def promote(self, population: PopulationStore, iteration: int) -> np.ndarray:
+        """Prune all but the rung's survivors; returns them best first."""
+        order = self.active[np.argsort(-population.composite(self.active), kind="stable")]
+        keep = self.survivors(iteration)
+        self._prune(population, order[keep:])
+        return order[:keep]
+
+    def charge(self, population: PopulationStore, rows: np.ndarray) -> np.ndarray:
+        """Pay for evaluating the best-first ``rows`` in one rung; returns the
+        prefix the budget covers, in row order."""
+        self.rounds += 1
+        self._baseline_usd += float(population.cost_usd.sum(dtype=np.float64))
+        costs = population.cost_usd[rows].astype(np.float64)
+        affordable = len(rows)
+        if self.budget_evaluations is not None:
+            affordable = min(affordable, max(0, self.budget_evaluations - self.evaluations))
+        if self.budget_usd is not None:
+            remaining = self.budget_usd - self.spent_usd
+            affordable = min(affordable, int(np.searchsorted(np.cumsum(costs), remaining, side="right")))
+        self.evaluations += affordable
+        self.spent_usd += float(costs[:affordable].sum())
+        return np.sort(rows[:affordable])
+
+    def skip(self, population: PopulationStore, rounds: int) -> None:
+        """Count ``rounds`` rungs that evaluate nothing toward the baseline."""
+        self.rounds += rounds
+        self._baseline_usd += rounds * float(population.cost_usd.sum(dtype=np.float64))
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        baseline_evaluations = self.size * self.rounds
+        saved = baseline_evaluations - self.evaluations
+        return [
+            {"name": "racing_evaluations", "value": float(self.evaluations)},
+            {"name": "racing_evaluations_saved", "value": float(saved)},
+            {"name": "racing_savings_rate", "value": saved / baseline_evaluations if baseline_evaluations else 0.0},
+            {"name": "racing_spent_usd", "value": self.spent_usd, "unit": "USD"},
+            {"name": "racing_saved_usd", "value": self._baseline_usd - self.spent_usd, "unit": "USD"},
+            {"name": "racing_active", "value": float(len(self.active))},
+            {"name": "racing_pruned", "value": float(self.pruned)},
+        ]
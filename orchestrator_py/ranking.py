@@ -0,0 +1,125 @@
+"""Incremental leaderboard and Pareto-front selection over population scores.
+
+``Leaderboard`` is a max tournament tree over per-row keys: building it is a
+handful of vectorized passes, a single key change is an O(log n) walk to the
+root, and the top ``k`` rows come out of a best-first walk in O(k log n)
+without sorting the population. Ties go to the lower row, matching a stable
+descending sort. The tree is built with NumPy and then held in plain lists,
+which are several times faster than NumPy scalars for the per-node walks.
+
+``pareto_front`` returns the rows no other row dominates across every
+``ScoreVector`` dimension (``cost`` minimized, the rest maximized).
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Iterable, List
+
+import numpy as np
+
+from .evaluation.scoring import SCORE_DIMENSIONS
+
+# Objectives where lower is better; they are negated before comparison.
+MINIMIZED_DIMENSIONS = ("cost",)
+_SIGNS = np.array([-1.0 if name in MINIMIZED_DIMENSIONS else 1.0 for name in SCORE_DIMENSIONS])
+
+
+class Leaderboard:
+    def __init__(self, keys: np.ndarray) -> None:
+        self.rebuild(keys)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def rebuild(self, keys: np.ndarray) -> None:
+        self.size = len(keys)
+        self._leaves = 1 << max(0, self.size - 1).bit_length()
+        padded = np.full(self._leaves, -np.inf)
+        padded[: self.size] = keys
+        winner = np.empty(2 * self._leaves, dtype=np.int64)
+        winner[self._leaves :] = np.arange(self._leaves)
+        level = self._leaves
+        while level > 1:
+            left = winner[level : 2 * level : 2]
+            right = winner[level + 1 : 2 * level : 2]
+            winner[level // 2 : level] = np.where(padded[right] > padded[left], right, left)
+            level //= 2
+        self.keys: List[float] = padded.tolist()
+        self.winner: List[int] = winner.tolist()
+
+    def update(self, row: int, key: float) -> None:
+        keys, winner = self.keys, self.winner
+        keys[row] = key
+        node = (row + self._leaves) >> 1
+        while node:
+            left, right = winner[2 * node], winner[2 * node + 1]
+            winner[node] = right if keys[right] > keys[left] else left
+            node >>= 1
+
+    def update_many(self, rows: Iterable[int], keys: np.ndarray) -> None:
+        for row, key in zip(rows, keys.tolist()):
+            self.update(row, key)
+
+    def top(self, k: int) -> List[int]:
+        if not self.size:
+            return []
+        keys, winner = self.keys, self.winner
+        best = winner[1]
+        heap = [(-keys[best], best, 1)]
+        rows: List[int] = []
+        while heap and len(rows) < k:
+            _, row, node = heapq.heappop(heap)
+            if row >= self.size:
+                break
+            rows.append(row)
+            # Re-offer every subtree hanging off the path from ``node`` down to ``row``.
+            leaf = row + self._leaves
+            depth = leaf.bit_length()
+            while node < self._leaves:
+                child = leaf >> (depth - node.bit_length() - 1)
+                sibling = child ^ 1
+                other = winner[sibling]
+                heapq.heappush(heap, (-keys[other], other, sibling))
+                node = child
+        return rows
+
+
+def _dominated(points: np.ndarray, sums: np.ndarray, others: np.ndarray, other_sums: np.ndarray) -> np.ndarray:
+    """Which ``points`` are dominated by at least one of ``others``."""
+    if not len(points) or not len(others):
+        return np.zeros(len(points), dtype=bool)
+    # One 2-D pass per dimension is far cheaper than a (points, others, dims) cube.
+    covers = others[:, 0][None, :] >= points[:, 0][:, None]
+    for dimension in range(1, points.shape[1]):
+        covers &= others[:, dimension][None, :] >= points[:, dimension][:, None]
+    dominated = (covers & (other_sums[None, :] > sums[:, None])).any(axis=1)
+    # A covering point with an equal sum dominates only if it is not identical.
+    ties = covers & (other_sums[None, :] == sums[:, None])
+    if ties.any():
+        rows, columns = np.nonzero(ties)
+        differs = (others[columns] != points[rows]).any(axis=1)
+        dominated[rows[differs]] = True
+    return dominated
+
+
+def pareto_front(scores: np.ndarray, block: int = 1024, sentinels: int = 64) -> np.ndarray:
+    """Sorted rows of ``scores`` on the first non-dominated front.
+
+    Rows are visited in decreasing order of their objective sum, so a row can
+    only be dominated by rows already visited. Each block is screened first
+    against a few strong front members, which discards most dominated rows
+    cheaply, then against the rest of the front and itself.
+    """
+    points = np.asarray(scores, dtype=np.float64) * _SIGNS
+    sums = points.sum(axis=1)
+    order = np.argsort(-sums, kind="stable")
+    points, sums = points[order], sums[order]
+    front = np.empty(0, dtype=np.int64)
+    for start in range(0, len(points), block):
+        rows = np.arange(start, min(start + block, len(points)))
+        for others in (front[:sentinels], front[sentinels:]):
+            rows = rows[~_dominated(points[rows], sums[rows], points[others], sums[others])]
+        rows = rows[~_dominated(points[rows], sums[rows], points[rows], sums[rows])]
+        front = np.concatenate([front, rows])
+    return np.sort(order[front])
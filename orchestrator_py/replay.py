@@ -0,0 +1,93 @@
+"""Replay a tournament payload and check that every run is bit-identical.
+
+Runs the payload ``--runs`` times for each ``--mutation-workers`` setting and
+hashes the population columns (scores, cost, status, parent) after every graph
+emission. A payload without a ``seed`` uses the entropy drawn by the first run.
+Exits non-zero when any run diverges from the first one.
+
+    python orchestrator_py/replay.py payload.json --mutation-workers 1 4 --runs 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+from typing import Any, Dict, List
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orchestrator_py.config import OrchestrateSpec, Settings
+from orchestrator_py.orchestrator import TournamentOrchestrator
+from orchestrator_py.population import PopulationStore
+from orchestrator_py.util.events import EventEmitter, StreamSink
+
+
+def digest(population: PopulationStore) -> str:
+    hasher = hashlib.sha256()
+    for column in (population.scores, population.cost_usd, population.status, population.parent):
+        hasher.update(column.tobytes(order="A"))
+    return hasher.hexdigest()
+
+
+class RecordingOrchestrator(TournamentOrchestrator):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.digests: List[str] = []
+
+    def _emit_graph(self, population: PopulationStore) -> None:
+        super()._emit_graph(population)
+        self.digests.append(digest(population))
+
+
+def replay(payload: Dict[str, Any], mutation_workers: int, settings: Settings) -> RecordingOrchestrator:
+    spec = OrchestrateSpec.from_request({**payload, "mutationWorkers": mutation_workers}, session_id="replay")
+    emitter = EventEmitter(session_id="replay", sink=StreamSink(io.StringIO()))
+    orchestrator = RecordingOrchestrator(spec, settings, emitter=emitter)
+    orchestrator.run()
+    return orchestrator
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("payload", help="JSON payload file, or - for stdin")
+    parser.add_argument("--mutation-workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--runs", type=int, default=2, help="runs per mutation-worker setting")
+    args = parser.parse_args(argv)
+
+    with (sys.stdin if args.payload == "-" else open(args.payload)) as handle:
+        payload = json.load(handle)
+    settings = Settings.from_env()
+    reference: List[str] | None = None
+    report = []
+    for workers in args.mutation_workers:
+        for run in range(args.runs):
+            orchestrator = replay(payload, workers, settings)
+            if payload.get("seed") is None:
+                payload = {**payload, "seed": orchestrator.streams.entropy}
+            if reference is None:
+                reference = orchestrator.digests
+            diverged = next(
+                (index for index, (ours, theirs) in enumerate(zip(orchestrator.digests, reference)) if ours != theirs),
+                None if len(orchestrator.digests) == len(reference) else min(len(orchestrator.digests), len(reference)),
+            )
+            report.append(
+                {
+                    "mutationWorkers": workers,
+                    "run": run,
+                    "emissions": len(orchestrator.digests),
+                    "final": orchestrator.digests[-1] if orchestrator.digests else None,
+                    "divergedAt": diverged,
+                }
+            )
+    identical = all(entry["divergedAt"] is None for entry in report)
+    print(json.dumps({"seed": payload.get("seed"), "identical": identical, "runs": report}, indent=2))
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,60 @@
-"""Entry point for Node API to invoke orchestrator."""
+"""Entry point for Node API to invoke orchestrator.
+
+Without arguments a single payload is read from stdin and the process exits
+when the session completes. ``--worker`` keeps the interpreter warm and serves
+newline-delimited session frames from stdin (or ``--socket PATH``) until EOF.
+"""
 
 from __future__ import annotations
 
+import argparse
 import os
 import sys
 
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from orchestrator_py.orchestrator import run_from_payload
+from orchestrator_py.scheduler import DEFAULT_SLOTS
+from orchestrator_py.worker import DEFAULT_MAX_SESSIONS, OrchestratorWorker
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--worker", action="store_true", help="serve many framed sessions")
+    parser.add_argument("--socket", help="listen on a Unix socket instead of stdin")
+    parser.add_argument("--resume", action="store_true", help="continue the session from its last checkpoint")
+    parser.add_argument(
+        "--max-sessions",
+        type=int,
+        default=int(os.environ.get("ORCHESTRATOR_MAX_SESSIONS", DEFAULT_MAX_SESSIONS)),
+        help="sessions run concurrently by the worker",
+    )
+    parser.add_argument(
+        "--evaluation-slots",
+        type=int,
+        default=int(os.environ.get("ORCHESTRATOR_EVALUATION_SLOTS", DEFAULT_SLOTS)),
+        help="candidate evaluations in flight across all sessions",
+    )
+    return parser.parse_args(argv)
+
 
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if not args.worker:
+        payload = sys.stdin.read()
+        session_id = os.environ.get("SESSION_ID", "local")
+        run_from_payload(payload, session_id=session_id, resume=True if args.resume else None)
+        return
 
-def main() -> None:
-    payload = sys.stdin.read()
-    session_id = os.environ.get("SESSION_ID", "local")
-    run_from_payload(payload, session_id=session_id)
+    worker = OrchestratorWorker(max_sessions=args.max_sessions, evaluation_slots=args.evaluation_slots)
+    try:
+        if args.socket:
+            worker.serve_socket(args.socket)
+        else:
+            worker.serve_stream(sys.stdin)
+    finally:
+        worker.shutdown()
 
 
 if __name__ == "__main__":
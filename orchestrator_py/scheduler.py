@@ -0,0 +1,186 @@
+"""Evaluation-slot scheduler shared by every session in a worker process.
+
+Sessions run on their own threads and event loops; before evaluating a
+candidate each one asks the scheduler for one of a fixed number of slots.
+Waiting requests are granted by self-clocked weighted fair queuing: a request
+is tagged ``max(virtual time, session's last tag) + 1 / weight`` and the
+eligible head-of-line request with the smallest tag wins, so a SAFE session
+keeps getting its share however many candidates a POWER session queues.
+
+A request is eligible only while its mode is under its slot quota and the
+USD cost its sessions have in flight stays under the mode's cost quota (a
+mode with nothing in flight may always start one candidate).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Mapping, Optional
+
+from .config import MODE_COST_QUOTA_USD, MODE_SLOT_QUOTA, MODE_WEIGHTS, Mode
+
+DEFAULT_SLOTS = 16
+
+
+@dataclass
+class _Ticket:
+    session: "_Session"
+    cost: float
+    tag: float
+    enqueued: float
+    loop: asyncio.AbstractEventLoop
+    future: "asyncio.Future[None]"
+    granted: bool = False
+
+
+@dataclass
+class _Session:
+    session_id: str
+    mode: Mode
+    weight: float
+    last_tag: float = 0.0
+    queue: Deque[_Ticket] = field(default_factory=deque)
+    in_use: int = 0
+    granted: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    peak_depth: int = 0
+
+
+def _resolve(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class EvaluationScheduler:
+    def __init__(
+        self,
+        slots: int = DEFAULT_SLOTS,
+        weights: Mapping[Mode, float] = MODE_WEIGHTS,
+        slot_quota: Mapping[Mode, int] = MODE_SLOT_QUOTA,
+        cost_quota: Mapping[Mode, float] = MODE_COST_QUOTA_USD,
+    ) -> None:
+        self.slots = slots
+        self.weights = dict(weights)
+        self.slot_quota = dict(slot_quota)
+        self.cost_quota = dict(cost_quota)
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, _Session] = {}
+        self._virtual = 0.0
+        self._in_use = 0
+        self._waiting = 0
+        self._peak_waiting = 0
+        self._mode_slots: Dict[Mode, int] = {mode: 0 for mode in Mode}
+        self._mode_cost: Dict[Mode, float] = {mode: 0.0 for mode in Mode}
+
+    def register(self, session_id: str, mode: Mode) -> None:
+        with self._lock:
+            self._sessions[session_id] = _Session(session_id, mode, self.weights[mode])
+
+    def unregister(self, session_id: str) -> None:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                for ticket in session.queue:
+                    ticket.loop.call_soon_threadsafe(ticket.future.cancel)
+            self._dispatch()
+
+    async def acquire(self, session_id: str, cost: float = 0.0) -> _Ticket:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions[session_id]
+            tag = max(self._virtual, session.last_tag) + 1.0 / session.weight
+            session.last_tag = tag
+            ticket = _Ticket(session, cost, tag, time.perf_counter(), loop, loop.create_future())
+            session.queue.append(ticket)
+            self._waiting += 1
+            self._peak_waiting = max(self._peak_waiting, self._waiting)
+            session.peak_depth = max(session.peak_depth, len(session.queue))
+            self._dispatch()
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = ticket.granted
+                if not granted:
+                    session.queue.remove(ticket)
+                    self._waiting -= 1
+                    self._dispatch()
+            if granted:
+                self.release(ticket)
+            raise
+        return ticket
+
+    def release(self, ticket: _Ticket) -> None:
+        with self._lock:
+            mode = ticket.session.mode
+            ticket.session.in_use -= 1
+            self._in_use -= 1
+            self._mode_slots[mode] -= 1
+            self._mode_cost[mode] -= ticket.cost
+            self._dispatch()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, session_id: str, cost: float = 0.0) -> AsyncIterator[None]:
+        ticket = await self.acquire(session_id, cost)
+        try:
+            yield
+        finally:
+            self.release(ticket)
+
+    def _eligible(self, ticket: _Ticket) -> bool:
+        mode = ticket.session.mode
+        if self._mode_slots[mode] >= self.slot_quota[mode]:
+            return False
+        return not self._mode_slots[mode] or self._mode_cost[mode] + ticket.cost <= self.cost_quota[mode]
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiting requests; called with the lock held."""
+        while self._in_use < self.slots:
+            best: Optional[_Ticket] = None
+            for session in self._sessions.values():
+                if session.queue:
+                    head = session.queue[0]
+                    if (best is None or head.tag < best.tag) and self._eligible(head):
+                        best = head
+            if best is None:
+                return
+            session = best.session
+            session.queue.popleft()
+            self._waiting -= 1
+            best.granted = True
+            waited = time.perf_counter() - best.enqueued
+            session.in_use += 1
+            session.granted += 1
+            session.wait_total += waited
+            session.wait_max = max(session.wait_max, waited)
+            self._in_use += 1
+            self._mode_slots[session.mode] += 1
+            self._mode_cost[session.mode] += best.cost
+            self._virtual = max(self._virtual, best.tag)
+            best.loop.call_soon_threadsafe(_resolve, best.future)
+
+    def metrics(self, session_id: str) -> List[Dict[str, Any]]:
+        """Scheduler metrics for one session. ``scheduler_queue_depth``,
+        ``scheduler_peak_queue_depth`` and ``scheduler_slots_in_use`` are
+        worker-wide; the ``scheduler_session_*`` depths and the waits are the
+        session's own."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return []
+            mean_wait = session.wait_total / session.granted if session.granted else 0.0
+            return [
+                {"name": "scheduler_queue_depth", "value": float(self._waiting)},
+                {"name": "scheduler_peak_queue_depth", "value": float(self._peak_waiting)},
+                {"name": "scheduler_session_queue_depth", "value": float(len(session.queue))},
+                {"name": "scheduler_session_peak_queue_depth", "value": float(session.peak_depth)},
+                {"name": "scheduler_slots_in_use", "value": float(self._in_use)},
+                {"name": "scheduler_wait_ms", "value": mean_wait * 1000, "unit": "ms"},
+                {"name": "scheduler_max_wait_ms", "value": session.wait_max * 1000, "unit": "ms"},
+            ]
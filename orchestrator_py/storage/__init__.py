@@ -0,0 +1 @@
+"""Persistence adapters for orchestrator state."""
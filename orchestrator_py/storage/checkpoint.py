@@ -0,0 +1,179 @@
+"""Single-file tournament checkpoints, memory-mapped on load.
+
+Layout: an 8-byte magic, a little-endian ``uint64`` header length, a JSON
+header, then each array at a 64-byte aligned offset. The header records the
+iteration counter, the RNG state (the session's seed entropy), the spec fields
+a resume must agree with, the racing budget counters, and the dtype, shape and
+offset of every array. String lists (lineage labels, artifacts) are stored as
+one UTF-8 blob plus an offsets array.
+
+Checkpoints are written to a temporary file, fsynced and renamed over the
+previous one, so a crash mid-write leaves the last complete checkpoint intact.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from ..lineage import LineageStore
+from ..population import PopulationStore
+
+MAGIC = b"ORCKPT01"
+FORMAT_VERSION = 3
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sQ")
+_SESSION_ID = re.compile(r"[A-Za-z0-9_-]+")
+
+
+class CheckpointError(ValueError):
+    """Raised when a checkpoint is missing, corrupt or belongs to another run."""
+
+
+@dataclass
+class Checkpoint:
+    iteration: int
+    rng_state: Dict[str, Any]
+    population: PopulationStore
+    lineage: LineageStore
+    spec: Dict[str, Any]
+    # ``SuccessiveHalving.state()`` when the session races or has a budget.
+    racing: Dict[str, Any] = field(default_factory=dict)
+
+
+def checkpoint_path(directory: str | os.PathLike, session_id: str) -> Path:
+    """``<directory>/<session_id>.ckpt``; rejects ids that could name a file outside ``directory``."""
+    if not _SESSION_ID.fullmatch(session_id):
+        raise CheckpointError(f"Session id {session_id!r} cannot name a checkpoint")
+    root = Path(directory).resolve()
+    path = (root / f"{session_id}.ckpt").resolve()
+    if path.parent != root:
+        raise CheckpointError(f"Checkpoint for {session_id!r} resolves outside {root}")
+    return path
+
+
+def _encode_strings(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [value.encode() for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _decode_strings(blob: np.ndarray, offsets: np.ndarray) -> List[str]:
+    data = blob.tobytes()
+    bounds = offsets.tolist()
+    return [data[start:stop].decode() for start, stop in zip(bounds, bounds[1:])]
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_checkpoint(path: str | os.PathLike, checkpoint: Checkpoint) -> int:
+    """Atomically replace ``path`` with ``checkpoint``; returns the file size."""
+    population, lineage = checkpoint.population, checkpoint.lineage
+    label_blob, label_offsets = _encode_strings(lineage.labels)
+    artifact_blob, artifact_offsets = _encode_strings(population.artifacts)
+    arrays = {
+        # Scores are column-major in memory; their transpose is C-contiguous.
+        "scores_t": population.scores.T,
+        "cost_usd": population.cost_usd,
+        "status": population.status,
+        "parent": population.parent,
+        "created_at": population.created_at,
+        "lineage_offsets": lineage.offsets,
+        "lineage_parents": lineage.parents,
+        "label_blob": label_blob,
+        "label_offsets": label_offsets,
+        "artifact_blob": artifact_blob,
+        "artifact_offsets": artifact_offsets,
+    }
+    layout: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _align(offset + array.nbytes)
+    header = json.dumps(
+        {
+            "version": FORMAT_VERSION,
+            "iteration": checkpoint.iteration,
+            "rng": checkpoint.rng_state,
+            "spec": checkpoint.spec,
+            "racing": checkpoint.racing,
+            "arrays": layout,
+        }
+    ).encode()
+    data_start = _align(_PREAMBLE.size + len(header))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(path.name + ".tmp")
+    with open(temp, "wb") as handle:
+        handle.write(_PREAMBLE.pack(MAGIC, len(header)))
+        handle.write(header)
+        for name, array in arrays.items():
+            handle.seek(data_start + layout[name]["offset"])
+            handle.write(np.ascontiguousarray(array).data)
+        handle.truncate(data_start + offset)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temp, path)
+    return data_start + offset
+
+
+def read_checkpoint(path: str | os.PathLike) -> Checkpoint:
+    path = Path(path)
+    try:
+        with open(path, "rb") as handle:
+            magic, header_length = _PREAMBLE.unpack(handle.read(_PREAMBLE.size))
+            if magic != MAGIC:
+                raise CheckpointError(f"{path} is not a tournament checkpoint")
+            header = json.loads(handle.read(header_length))
+    except (OSError, struct.error, ValueError) as exc:
+        if isinstance(exc, CheckpointError):
+            raise
+        raise CheckpointError(f"Cannot read checkpoint {path}: {exc}") from exc
+    if header.get("version") != FORMAT_VERSION:
+        raise CheckpointError(f"Unsupported checkpoint version: {header.get('version')}")
+
+    data_start = _align(_PREAMBLE.size + header_length)
+    mapped = np.memmap(path, dtype=np.uint8, mode="r")
+
+    def array(name: str) -> np.ndarray:
+        spec = header["arrays"][name]
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        start = data_start + spec["offset"]
+        view = mapped[start : start + count * dtype.itemsize].view(dtype)
+        return view.reshape(spec["shape"])
+
+    scores = array("scores_t").T
+    population = PopulationStore(scores.shape[0])
+    population.scores[:] = scores
+    population.cost_usd[:] = array("cost_usd")
+    population.status[:] = array("status")
+    population.parent[:] = array("parent")
+    population.created_at[:] = array("created_at")
+    population.artifacts = _decode_strings(array("artifact_blob"), array("artifact_offsets"))
+    population.rank()
+
+    lineage = LineageStore.from_arrays(
+        _decode_strings(array("label_blob"), array("label_offsets")),
+        array("lineage_offsets"),
+        array("lineage_parents"),
+    )
+    return Checkpoint(
+        iteration=int(header["iteration"]),
+        rng_state=header["rng"],
+        population=population,
+        lineage=lineage,
+        spec=header["spec"],
+        racing=header["racing"],
+    )
@@ -2,29 +2,277 @@
 
 from __future__ import annotations
 
+import atexit
 import json
+import os
 import sys
-from dataclasses import dataclass
-from typing import Any, Iterable
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, TextIO, Tuple
+
+Serializer = Callable[[Dict[str, Any]], str]
+
+# Event types that carry the full latest state, so a newer record makes any
+# queued older record of the same session and type redundant.
+COALESCIBLE_EVENTS = frozenset({"graph", "metric"})
+# A ``graph`` keyframe also replaces every graph delta queued before it.
+KEYFRAME_EVENT = "graph"
+DELTA_EVENT = "graph_delta"
+
+
+def json_serializer(record: Dict[str, Any]) -> str:
+    return json.dumps(record)
+
+
+def orjson_serializer(record: Dict[str, Any]) -> str:
+    import orjson
+
+    return orjson.dumps(record, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+def get_serializer(name: str | None = None) -> Serializer:
+    name = name or os.environ.get("ORCHESTRATOR_SERIALIZER", "json")
+    if name == "orjson":
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            return json_serializer
+        return orjson_serializer
+    if name == "json":
+        return json_serializer
+    raise ValueError(f"Unknown event serializer: {name}")
+
+
+class StreamSink:
+    """Serialize event records onto a text stream, one JSON line per record.
+
+    A single sink may be shared by many emitters (the warm worker runs several
+    sessions against one stdout), so writes are serialized with a lock to keep
+    lines from interleaving.
+    """
+
+    def __init__(self, stream: TextIO | None = None, serializer: Serializer | None = None) -> None:
+        self._stream = stream
+        self._lock = threading.Lock()
+        self.serializer = serializer or json_serializer
+        self.encode_seconds = 0.0
+        self.write_seconds = 0.0
+        self.bytes_written = 0
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream if self._stream is not None else sys.stdout
+
+    def write(self, record: dict[str, Any]) -> None:
+        started = time.perf_counter()
+        line = self.serializer(record) + "\n"
+        encoded = time.perf_counter()
+        with self._lock:
+            stream = self.stream
+            stream.write(line)
+            stream.flush()
+            self.encode_seconds += encoded - started
+            self.write_seconds += time.perf_counter() - encoded
+            self.bytes_written += len(line)
+
+    def stats(self) -> Dict[str, float]:
+        """Cumulative JSON encoding and stream write cost for this sink."""
+        return {
+            "encodeMs": self.encode_seconds * 1000,
+            "writeMs": self.write_seconds * 1000,
+            "bytes": self.bytes_written,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self.stream.flush()
+
+
+class _Pending:
+    __slots__ = ("record", "dropped")
+
+    def __init__(self, record: Dict[str, Any]) -> None:
+        self.record = record
+        self.dropped = False
+
+
+class BufferedSink(StreamSink):
+    """Queue records and write them in batches from a background thread.
+
+    ``write`` only enqueues, so the tournament loop is not blocked on the
+    consumer unless ``max_queue`` records are pending. The writer thread wakes
+    when ``flush_records`` records are queued or ``flush_interval`` seconds
+    have passed and writes the whole batch with a single flush. While records
+    wait in the queue a newer ``graph`` or ``metric`` record for the same
+    session supersedes the older one, which is dropped, and a ``graph``
+    keyframe also drops the session's queued ``graph_delta`` records, which
+    the keyframe replaces. Every other event type is written exactly once, in
+    emission order.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        serializer: Serializer | None = None,
+        max_queue: int = 10_000,
+        flush_interval: float = 0.02,
+        flush_records: int = 256,
+    ) -> None:
+        super().__init__(stream, serializer)
+        self.max_queue = max_queue
+        self.flush_interval = flush_interval
+        self.flush_records = flush_records
+        self.written = 0
+        self.coalesced = 0
+        self.batches = 0
+        self._queue: Deque[_Pending] = deque()
+        self._latest: Dict[Tuple[Any, str], _Pending] = {}
+        self._deltas: Dict[Any, List[_Pending]] = {}
+        self._live = 0
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+        self._thread.start()
+
+    def _drop(self, pending: Optional[_Pending]) -> None:
+        if pending is not None and not pending.dropped:
+            pending.dropped = True
+            self._live -= 1
+            self.coalesced += 1
+
+    def write(self, record: dict[str, Any]) -> None:
+        event = record.get("type")
+        session = record.get("sessionId")
+        with self._cond:
+            if self._error is not None:
+                raise self._error
+            if self._closed:
+                raise RuntimeError("Event sink is closed")
+            if event in COALESCIBLE_EVENTS:
+                self._drop(self._latest.get((session, event)))
+            if event == KEYFRAME_EVENT:
+                for delta in self._deltas.pop(session, ()):
+                    self._drop(delta)
+            while self._live >= self.max_queue and self._error is None:
+                self._cond.wait()
+            pending = _Pending(record)
+            self._queue.append(pending)
+            self._live += 1
+            if event in COALESCIBLE_EVENTS:
+                self._latest[(session, event)] = pending
+            elif event == DELTA_EVENT:
+                self._deltas.setdefault(session, []).append(pending)
+            if self._live == 1 or self._live >= self.flush_records:
+                self._cond.notify_all()
+
+    def _take_batch(self) -> list[_Pending]:
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            deadline = time.monotonic() + self.flush_interval
+            while not self._closed and self._live < self.flush_records:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = list(self._queue)
+            self._queue.clear()
+            self._latest.clear()
+            self._deltas.clear()
+            self._live = 0
+            self._cond.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            records = [pending.record for pending in batch if not pending.dropped]
+            if records:
+                try:
+                    started = time.perf_counter()
+                    chunk = "".join(self.serializer(record) + "\n" for record in records)
+                    encoded = time.perf_counter()
+                    with self._lock:
+                        stream = self.stream
+                        stream.write(chunk)
+                        stream.flush()
+                        self.encode_seconds += encoded - started
+                        self.write_seconds += time.perf_counter() - encoded
+                        self.bytes_written += len(chunk)
+                except BaseException as exc:
+                    with self._cond:
+                        self._error = exc
+                        self._cond.notify_all()
+                    return
+                self.written += len(records)
+                self.batches += 1
+            with self._cond:
+                if self._closed and not self._queue:
+                    return
+
+    def stats(self) -> Dict[str, float]:
+        return {**super().stats(), "written": self.written, "coalesced": self.coalesced, "batches": self.batches}
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        if self._error is None:
+            super().close()
+
+
+_STDOUT_SINK: Optional[StreamSink] = None
+_STDOUT_SINK_LOCK = threading.Lock()
+
+
+def default_sink() -> StreamSink:
+    """Shared stdout sink; buffered unless ``ORCHESTRATOR_EVENT_SINK=stream``."""
+    global _STDOUT_SINK
+    with _STDOUT_SINK_LOCK:
+        if _STDOUT_SINK is None:
+            serializer = get_serializer()
+            if os.environ.get("ORCHESTRATOR_EVENT_SINK", "buffered") == "stream":
+                _STDOUT_SINK = StreamSink(serializer=serializer)
+            else:
+                _STDOUT_SINK = BufferedSink(serializer=serializer)
+                atexit.register(_STDOUT_SINK.close)
+        return _STDOUT_SINK
 
 
 @dataclass
 class EventEmitter:
     session_id: str
+    sink: StreamSink = field(default_factory=default_sink)
+    counts: Dict[str, int] = field(default_factory=dict)
 
     def _write(self, event: str, payload: Any) -> None:
         record = {"type": event, "payload": payload, "sessionId": self.session_id}
-        sys.stdout.write(json.dumps(record) + "\n")
-        sys.stdout.flush()
+        self.counts[event] = self.counts.get(event, 0) + 1
+        self.sink.write(record)
 
     def emit_graph(self, snapshot: Any) -> None:
         self._write("graph", snapshot)
 
+    def emit_graph_delta(self, delta: Any) -> None:
+        self._write("graph_delta", delta)
+
     def emit_log(self, message: str) -> None:
         self._write("log", message)
 
     def emit_metrics(self, metrics: Iterable[Any]) -> None:
         self._write("metric", list(metrics))
 
-    def emit_complete(self) -> None:
-        self._write("complete", {"status": "done"})
+    def emit_complete(self, status: str = "done") -> None:
+        self._write("complete", {"status": status})
+
+    def emit_error(self, message: str) -> None:
+        self._write("error", message)
+
+    def emit_trace(self, trace: Dict[str, Any]) -> None:
+        self._write("trace", trace)
@@ -0,0 +1,51 @@
+"""Independent random streams derived from one session seed.
+
+Every stream is ``SeedSequence(entropy, spawn_key=key)`` for a key naming what
+it drives: the initial population, one chunk of one iteration's mutation, or
+one candidate in one iteration. A stream's draws depend only on the seed and
+its key, never on which thread or process consumes it or when, so mutation
+chunks and evaluations can run in parallel and a given seed still reproduces
+the tournament bit for bit. Without a seed, fresh entropy is drawn; passing
+that entropy back as the seed replays the run.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator, Tuple
+
+import numpy as np
+
+INITIAL = 0
+MUTATION = 1
+CANDIDATE = 2
+
+# Mutation chunks have a fixed size so the streams do not depend on worker count.
+CHUNK_ROWS = 4096
+
+
+class RngStreams:
+    def __init__(self, seed: int | None = None) -> None:
+        self.entropy: int = np.random.SeedSequence(seed).entropy
+
+    def generator(self, *key: int) -> np.random.Generator:
+        return np.random.default_rng(np.random.SeedSequence(self.entropy, spawn_key=key))
+
+    def initial(self) -> np.random.Generator:
+        return self.generator(INITIAL)
+
+    def mutation(self, iteration: int, chunk: int) -> np.random.Generator:
+        return self.generator(MUTATION, iteration, chunk)
+
+    def candidate_seed(self, iteration: int, row: int) -> int:
+        """A 128-bit seed for an evaluator's ``np.random.default_rng``."""
+        state = np.random.SeedSequence(self.entropy, spawn_key=(CANDIDATE, iteration, row)).generate_state(4)
+        return int.from_bytes(state.tobytes(), "little")
+
+    def mutation_chunks(
+        self, iteration: int, rows: np.ndarray | None, size: int
+    ) -> Iterator[Tuple[np.random.Generator, np.ndarray | slice]]:
+        """``(generator, rows)`` per chunk of ``rows``, or of all ``size`` rows."""
+        total = size if rows is None else len(rows)
+        for chunk, start in enumerate(range(0, total, CHUNK_ROWS)):
+            stop = min(start + CHUNK_ROWS, total)
+            yield self.mutation(iteration, chunk), slice(start, stop) if rows is None else rows[start:stop]
@@ -0,0 +1,200 @@
+"""Lightweight timing spans, counters and sampling capture for tournament sessions.
+
+A ``Tracer`` records nested spans (``iteration/mutate``), counters and, when
+asked, net traced allocations per span. Finished spans are flushed as ``trace``
+events once per iteration and aggregated into a per-session profile emitted at
+the end of the run. ``StackSampler`` optionally samples the session thread's
+Python stack to produce collapsed stacks for flame graphs.
+
+``tracemalloc`` is process-global: tracers that record allocations share one
+reference-counted session of it, and the figures they report (``allocKb``
+per span, ``tracedPeakKb``) cover every thread in the process, so they include
+allocations by other sessions running concurrently in the same worker.
+
+When tracing is disabled the orchestrator uses ``NULL_TRACER``, whose methods
+are no-ops and whose ``span`` returns a shared null context manager.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterator, List, Optional
+
+from .events import EventEmitter
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+def _acquire_tracemalloc() -> bool:
+    """Join the shared ``tracemalloc`` session; ``False`` if someone else started it."""
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if not _tracemalloc_users and tracemalloc.is_tracing():
+            return False
+        if not _tracemalloc_users:
+            tracemalloc.start()
+        _tracemalloc_users += 1
+        return True
+
+
+def _release_tracemalloc() -> None:
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if not _tracemalloc_users:
+            tracemalloc.stop()
+
+
+class NullTracer:
+    enabled = False
+
+    def span(self, name: str) -> contextlib.AbstractContextManager:
+        return _NULL_CONTEXT
+
+    def count(self, name: str, value: float = 1) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def finish(self, extra: Optional[Dict[str, Any]] = None) -> None:
+        pass
+
+
+NULL_TRACER = NullTracer()
+
+
+class Tracer:
+    enabled = True
+
+    def __init__(
+        self,
+        emitter: EventEmitter,
+        allocations: bool = False,
+        sampler: Optional["StackSampler"] = None,
+    ) -> None:
+        self.emitter = emitter
+        self.allocations = allocations
+        self.sampler = sampler
+        self.counters: Counter = Counter()
+        self._stack: List[str] = []
+        self._pending: List[Dict[str, Any]] = []
+        self._totals: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "alloc_kb": 0.0}
+        )
+        self._started = time.perf_counter()
+        self._owns_tracemalloc = allocations and _acquire_tracemalloc()
+        if sampler is not None:
+            sampler.start()
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        self._stack.append(name)
+        path = "/".join(self._stack)
+        allocated = tracemalloc.get_traced_memory()[0] if self.allocations else 0
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._stack.pop()
+            record: Dict[str, Any] = {
+                "name": path,
+                "startMs": (started - self._started) * 1000,
+                "durationMs": elapsed_ms,
+            }
+            totals = self._totals[path]
+            totals["count"] += 1
+            totals["total_ms"] += elapsed_ms
+            totals["max_ms"] = max(totals["max_ms"], elapsed_ms)
+            if self.allocations:
+                delta_kb = (tracemalloc.get_traced_memory()[0] - allocated) / 1024
+                record["allocKb"] = delta_kb
+                totals["alloc_kb"] += delta_kb
+            self._pending.append(record)
+
+    def count(self, name: str, value: float = 1) -> None:
+        self.counters[name] += value
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        spans, self._pending = self._pending, []
+        self.emitter.emit_trace({"spans": spans, "counters": dict(self.counters)})
+
+    def profile(self) -> Dict[str, Any]:
+        profile: Dict[str, Any] = {
+            "wallMs": (time.perf_counter() - self._started) * 1000,
+            "spans": {
+                path: {
+                    "count": int(totals["count"]),
+                    "totalMs": totals["total_ms"],
+                    "meanMs": totals["total_ms"] / totals["count"],
+                    "maxMs": totals["max_ms"],
+                    **({"allocKb": totals["alloc_kb"]} if self.allocations else {}),
+                }
+                for path, totals in self._totals.items()
+            },
+            "counters": dict(self.counters),
+        }
+        if self.allocations:
+            profile["tracedPeakKb"] = tracemalloc.get_traced_memory()[1] / 1024
+        if self.sampler is not None:
+            profile["samples"] = self.sampler.collapsed()
+        return profile
+
+    def finish(self, extra: Optional[Dict[str, Any]] = None) -> None:
+        self.flush()
+        if self.sampler is not None:
+            self.sampler.stop()
+        profile = self.profile()
+        if extra:
+            profile.update(extra)
+        if self._owns_tracemalloc:
+            self._owns_tracemalloc = False
+            _release_tracemalloc()
+        self.emitter.emit_trace({"profile": profile})
+
+
+class StackSampler:
+    """Samples one thread's Python stack every ``interval`` seconds."""
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.005, max_stacks: int = 200) -> None:
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                frame = frame.f_back
+            self.samples[";".join(reversed(names))] += 1
+
+    def collapsed(self) -> Dict[str, int]:
+        """Most frequent stacks in collapsed ``a;b;c -> count`` form."""
+        return dict(self.samples.most_common(self.max_stacks))
@@ -0,0 +1,162 @@
+"""Long-lived orchestrator worker that serves many sessions from one interpreter.
+
+Frames are newline-delimited JSON objects of the form
+``{"sessionId": "...", "payload": {...OrchestrateRequest...}}``; a frame of
+``{"sessionId": "...", "cancel": true}`` cancels a running or queued session.
+Every event a session produces carries its ``sessionId`` so the Node side can
+demultiplex the shared output stream.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Set, TextIO
+
+from .config import OrchestrateSpec, Settings
+from .orchestrator import TournamentOrchestrator, create_tournament
+from .scheduler import DEFAULT_SLOTS, EvaluationScheduler
+from .util.events import BufferedSink, EventEmitter, StreamSink, default_sink, get_serializer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SESSIONS = 4
+
+
+class FrameError(ValueError):
+    """Raised when a worker frame cannot be decoded into a session request."""
+
+
+def parse_frame(line: str) -> tuple[str, Optional[Dict[str, Any]]]:
+    try:
+        frame = json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise FrameError(f"Invalid frame: {exc}") from exc
+    if not isinstance(frame, dict):
+        raise FrameError("Frame must be a JSON object")
+    session_id = frame.get("sessionId")
+    payload = frame.get("payload")
+    if session_id and frame.get("cancel") is True:
+        return str(session_id), None
+    if not session_id or not isinstance(payload, dict):
+        raise FrameError("Frame requires 'sessionId' and an object 'payload'")
+    return str(session_id), payload
+
+
+class OrchestratorWorker:
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        evaluation_slots: int = DEFAULT_SLOTS,
+    ) -> None:
+        self.settings = settings or Settings.from_env()
+        # Evaluation slots are shared fairly across every session this worker runs.
+        self.scheduler = EvaluationScheduler(slots=evaluation_slots)
+        self.executor = ThreadPoolExecutor(max_workers=max_sessions, thread_name_prefix="session")
+        self._sessions: Dict[str, TournamentOrchestrator] = {}
+        # Sessions submitted but not yet registered, and those cancelled in that window.
+        self._queued: Set[str] = set()
+        self._cancelled: Set[str] = set()
+        self._sessions_lock = threading.Lock()
+
+    def submit(self, session_id: str, payload: Dict[str, Any], sink: StreamSink) -> Future:
+        with self._sessions_lock:
+            self._queued.add(session_id)
+        return self.executor.submit(self._run_session, session_id, payload, sink)
+
+    def _run_session(self, session_id: str, payload: Dict[str, Any], sink: StreamSink) -> None:
+        emitter = EventEmitter(session_id=session_id, sink=sink)
+        try:
+            with self._sessions_lock:
+                cancelled = session_id in self._cancelled
+            if cancelled:
+                emitter.emit_log("Tournament cancelled")
+                emitter.emit_complete(status="cancelled")
+                return
+            spec = OrchestrateSpec.from_request(payload, session_id=session_id)
+            orchestrator = create_tournament(spec, self.settings, emitter=emitter, scheduler=self.scheduler)
+            with self._sessions_lock:
+                self._sessions[session_id] = orchestrator
+                self._queued.discard(session_id)
+                cancelled = session_id in self._cancelled
+            if cancelled:
+                orchestrator.cancel()
+            orchestrator.run()
+        except Exception as exc:  # surface per-session failures without killing the worker
+            logger.exception("Session %s failed", session_id)
+            emitter.emit_error(f"Orchestrator session failed: {exc}")
+        finally:
+            with self._sessions_lock:
+                self._sessions.pop(session_id, None)
+                self._queued.discard(session_id)
+                self._cancelled.discard(session_id)
+
+    def cancel(self, session_id: str) -> None:
+        """Cancel a running session, or one still waiting for a session thread."""
+        with self._sessions_lock:
+            orchestrator = self._sessions.get(session_id)
+            if orchestrator is None and session_id in self._queued:
+                self._cancelled.add(session_id)
+        if orchestrator is not None:
+            orchestrator.cancel()
+
+    def serve_lines(self, lines: Iterable[str], sink: StreamSink) -> None:
+        pending: list[Future] = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                session_id, payload = parse_frame(line)
+            except FrameError as exc:
+                EventEmitter(session_id="worker", sink=sink).emit_error(str(exc))
+                continue
+            if payload is None:
+                self.cancel(session_id)
+                continue
+            pending.append(self.submit(session_id, payload, sink))
+            pending = [future for future in pending if not future.done()]
+        for future in pending:
+            future.result()
+
+    def serve_stream(self, stream: TextIO, sink: Optional[StreamSink] = None) -> None:
+        self.serve_lines(stream, sink or default_sink())
+
+    def serve_socket(self, path: str) -> None:
+        if os.path.exists(path):
+            os.unlink(path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen()
+        logger.info("Orchestrator worker listening on %s", path)
+        try:
+            while True:
+                connection, _ = server.accept()
+                threading.Thread(
+                    target=self._serve_connection,
+                    args=(connection,),
+                    name="worker-connection",
+                    daemon=True,
+                ).start()
+        finally:
+            server.close()
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def _serve_connection(self, connection: socket.socket) -> None:
+        with connection, connection.makefile("r", encoding="utf-8") as reader, connection.makefile(
+            "w", encoding="utf-8"
+        ) as writer:
+            sink = BufferedSink(writer, serializer=get_serializer())
+            try:
+                self.serve_lines(reader, sink)
+            finally:
+                sink.close()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
@@ -15,15 +15,31 @@ Pipeline:
  4) Convergent legal rewrite (low temp, JSON-schema structured outputs)
  5) Validators (antecedent basis map presence, claim-tree sanity, cross-refs)
  6) Assembly to Markdown (docx/pdf via pandoc optional)
+Steps 2-5 stream: each idea is scored, deduplicated and legalized as soon as
+its response arrives, while other prompts are still generating.
 
 Requirements:
-  pip install openai faiss-cpu trafilatura readability-lxml python-dotenv requests
+  pip install httpx faiss-cpu trafilatura readability-lxml python-dotenv
 Environment:
   export OPENAI_API_KEY=...
+  export OPENAI_BASE_URL=...   (optional; e.g. a proxy or a local stand-in)
+
+LLM and embedding calls go through ``patentgen.llm.AsyncOpenAIClient``: one
+shared request/token budget, AIMD concurrency and jittered retries, with
+per-call latency written to ``llm_metrics.json``.
+
+The corpus is fetched concurrently through ``patentgen.fetch.Fetcher`` (per-host
+limits, conditional requests, an on-disk HTTP cache under ``CACHE_DIR``).
+
+Importing this module has no side effects: heavy dependencies (numpy, faiss,
+httpx, trafilatura, readability), the OpenAI client and the build
+directories are created on first use, so the helpers can be used as a library
+or from workers without paying for (or requiring) the whole pipeline.
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import itertools
 import json
@@ -34,47 +50,29 @@ import re
 import textwrap
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-
-import faiss
-import numpy as np
-import requests
-
-try:
-    import trafilatura
-
-    HAS_TRA = True
-except Exception:
-    HAS_TRA = False
-
-try:
-    from readability import Document as ReadabilityDocument
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-    HAS_READABILITY = True
-except Exception:
-    HAS_READABILITY = False
+from patentgen.embed_cache import EmbeddingCache
+from patentgen.fetch import Fetcher, dedupe_by_id
+from patentgen.llm import AsyncOpenAIClient
 
-try:
-    from openai import OpenAI
-except Exception as exc:  # pragma: no cover - import guard
-    raise RuntimeError("Install openai: pip install openai") from exc
+if TYPE_CHECKING:
+    import faiss
+    import numpy as np
 
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
-
 PROJECT = "prnu_hardware_attest_ial3_universal_coverage"
 OUT = Path("build") / PROJECT
-OUT.mkdir(parents=True, exist_ok=True)
 TICKETS_DIR = OUT / "tickets"
-TICKETS_DIR.mkdir(exist_ok=True)
 CACHE_DIR = OUT / "cache"
-CACHE_DIR.mkdir(exist_ok=True)
 RAG_DIR = OUT / "rag"
-RAG_DIR.mkdir(exist_ok=True)
+# Embeddings are keyed by model and text hash, so one cache serves every run and project.
+EMBED_CACHE_DIR = Path(os.getenv("PATENTGEN_EMBED_CACHE", Path.home() / ".cache" / "patentgen" / "embeddings"))
 
 LLM_MODEL_DIVERGENT = "gpt-5.1"
 LLM_MODEL_CONVERGENT = "gpt-5.1"
 EMBED_MODEL = "text-embedding-3-large"
+EMBED_BATCH = 64
 
 DIVERGENT_TEMPS = [1.1, 1.3, 1.6]
 DIVERGENT_TOPP = [0.95, 0.98]
@@ -83,13 +81,31 @@ DIVERGENT_IDEAS_PER_RESP = 8
 CONVERGENT_TEMP = 0.1
 CONVERGENT_TOPP = 0.9
 
+LLM_REQUESTS_PER_MINUTE = 500
+LLM_TOKENS_PER_MINUTE = 800_000
+LLM_MAX_CONCURRENCY = 32
+
+RAG_QUERIES_PER_PROMPT = 3
+RAG_SNIPPETS_PER_QUERY = 2
+
 MAX_NEAR_DUPLICATES = 0.92
 KEEP_TOP_IDEAS = 80
+MAX_LEGALIZE = 40
+
+# Stages hand work over through queues of this size; a full queue pauses the
+# stage feeding it.
+PIPELINE_QUEUE_SIZE = 16
+LEGALIZE_WORKERS = 8
 
 USE_ARXIV = True
 USE_PATENTSVIEW = True
 USE_GENERIC_URLS = True
 
+FETCH_PER_HOST = 2
+FETCH_MAX_AGE = 6 * 3600
+# arXiv's API terms ask for at most one request every three seconds.
+FETCH_HOST_INTERVAL = {"export.arxiv.org": 3.0}
+
 GENERIC_URL_SEEDS = [
     "https://www.researchgate.net/",
     "https://signal.org/docs/",
@@ -120,7 +136,13 @@ def h16(*parts: object) -> str:
     return hasher.hexdigest()[:16]
 
 
+def ensure_output_dirs() -> None:
+    for directory in (OUT, TICKETS_DIR, CACHE_DIR, RAG_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
+
+
 def jdump(path: Path, obj: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(obj, indent=2, ensure_ascii=False))
 
 
@@ -128,49 +150,49 @@ def jload(path: Path) -> Any:
     return json.loads(path.read_text())
 
 
-class OpenAIClient:
-    def __init__(self) -> None:
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-    def respond_json(
-        self,
-        model: str,
-        prompt: str,
-        schema: dict,
-        temperature: float,
-        top_p: float,
-        max_tokens: int = 6000,
-    ) -> Dict[str, Any]:
-        response = self.client.responses.create(
-            model=model,
-            input=prompt,
-            response_format={"type": "json_schema", "json_schema": {"name": "schema", "schema": schema}},
-            temperature=temperature,
-            top_p=top_p,
-            max_output_tokens=max_tokens,
-        )
-        try:
-            return response.output_parsed if hasattr(response, "output_parsed") else json.loads(response.output_text)
-        except Exception:
-            return json.loads(response.output_text)
+class OpenAIClient(AsyncOpenAIClient):
+    """``AsyncOpenAIClient`` configured from the environment and the constants above."""
+
+    def __init__(self, api_key: Optional[str] = None, **overrides: Any) -> None:
+        options: Dict[str, Any] = {
+            "api_key": api_key or os.getenv("OPENAI_API_KEY"),
+            "base_url": os.getenv("OPENAI_BASE_URL"),
+            "embed_model": EMBED_MODEL,
+            "embed_cache": EmbeddingCache(EMBED_CACHE_DIR),
+            "embed_batch": EMBED_BATCH,
+            "requests_per_minute": LLM_REQUESTS_PER_MINUTE,
+            "tokens_per_minute": LLM_TOKENS_PER_MINUTE,
+            "max_concurrency": LLM_MAX_CONCURRENCY,
+        }
+        super().__init__(**{**options, **overrides})
+
 
-    def embed(self, texts: List[str]) -> List[List[float]]:
-        embedding = self.client.embeddings.create(model=EMBED_MODEL, input=texts)
-        data = embedding.data if hasattr(embedding, "data") else embedding["data"]
-        return [entry.embedding if hasattr(entry, "embedding") else entry["embedding"] for entry in data]
+_OAI: Optional[OpenAIClient] = None
 
 
-OAI = OpenAIClient()
+def oai() -> OpenAIClient:
+    """The shared client, created on first use."""
+    global _OAI
+    if _OAI is None:
+        _OAI = OpenAIClient()
+    return _OAI
 
 
-def fetch_arxiv(query: str, max_results: int = 20) -> List[Dict[str, str]]:
+def __getattr__(name: str) -> Any:
+    # ``OAI`` used to be a module-level instance; keep it importable.
+    if name == "OAI":
+        return oai()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def fetch_arxiv(fetcher: Fetcher, query: str, max_results: int = 20) -> List[Dict[str, str]]:
     if not USE_ARXIV:
         return []
     url = "http://export.arxiv.org/api/query"
     params = {"search_query": query, "start": 0, "max_results": max_results}
-    response = requests.get(url, params=params, timeout=25)
+    response = await fetcher.get(url, params=params)
     output: List[Dict[str, str]] = []
-    if response.status_code == 200:
+    if response.status == 200:
         entries = response.text.split("<entry>")
         for entry in entries[1:]:
             titles = re.findall(r"<title>(.*?)</title>", entry, re.S)
@@ -182,7 +204,7 @@ def fetch_arxiv(query: str, max_results: int = 20) -> List[Dict[str, str]]:
     return output
 
 
-def fetch_patentsview(keyword: str, max_results: int = 50) -> List[Dict[str, str]]:
+async def fetch_patentsview(fetcher: Fetcher, keyword: str, max_results: int = 50) -> List[Dict[str, str]]:
     if not USE_PATENTSVIEW:
         return []
     url = "https://search.patentsview.org/api/v1/patents/query"
@@ -194,9 +216,10 @@ def fetch_patentsview(keyword: str, max_results: int = 50) -> List[Dict[str, str
     }
     fields = ["patent_number", "patent_title", "patent_date", "patent_abstract"]
     payload = {"q": query, "f": fields, "o": {"per_page": max_results}}
+    response = await fetcher.post_json(url, payload)
+    if not response.ok:
+        return []
     try:
-        response = requests.post(url, json=payload, timeout=30)
-        response.raise_for_status()
         data = response.json()
         output = []
         for patent in data.get("patents", []):
@@ -209,37 +232,27 @@ def fetch_patentsview(keyword: str, max_results: int = 50) -> List[Dict[str, str
         return []
 
 
-def fetch_url(url: str, timeout: int = 25) -> Optional[str]:
-    try:
-        response = requests.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"})
-        response.raise_for_status()
-        html = response.text
-        if HAS_TRA:
-            text = trafilatura.extract(html) or ""
-            if len(text.strip()) >= 200:
-                return text
-        if HAS_READABILITY:
-            document = ReadabilityDocument(html)
-            text = document.summary()
-            text = re.sub("<[^>]+>", " ", text)
-            return text
-        return html[:8000]
-    except Exception:
+async def fetch_url(fetcher: Fetcher, url: str) -> Optional[str]:
+    response = await fetcher.get(url)
+    if not response.ok:
         return None
+    return (await fetcher.extract_many([response.text]))[0]
 
 
-def build_rag_corpus(seed_queries: List[str]) -> List[Dict[str, str]]:
+async def build_rag_corpus(seed_queries: List[str]) -> List[Dict[str, str]]:
     logging.info("Building RAG corpus...")
-    corpus: List[Dict[str, str]] = []
-    for query in seed_queries:
-        corpus.extend(fetch_arxiv(query, max_results=20))
-    for query in seed_queries:
-        corpus.extend(fetch_patentsview(query, max_results=40))
-    if USE_GENERIC_URLS:
-        for url in GENERIC_URL_SEEDS:
-            text = fetch_url(url)
-            if text:
-                corpus.append({"id": f"url:{h16(url)}", "text": text[:4000]})
+    urls = GENERIC_URL_SEEDS if USE_GENERIC_URLS else []
+    fetcher = Fetcher(
+        CACHE_DIR / "http", per_host=FETCH_PER_HOST, host_interval=FETCH_HOST_INTERVAL, max_age=FETCH_MAX_AGE
+    )
+    async with fetcher:
+        arxiv, patents, pages = await asyncio.gather(
+            asyncio.gather(*(fetch_arxiv(fetcher, query, max_results=20) for query in seed_queries)),
+            asyncio.gather(*(fetch_patentsview(fetcher, query, max_results=40) for query in seed_queries)),
+            asyncio.gather(*(fetch_url(fetcher, url) for url in urls)),
+        )
+    corpus: List[Dict[str, str]] = [doc for docs in arxiv + patents for doc in docs]
+    corpus.extend({"id": f"url:{h16(url)}", "text": text[:4000]} for url, text in zip(urls, pages) if text)
     user_rag = Path("local_rag_snippets.json")
     if user_rag.exists():
         try:
@@ -248,31 +261,67 @@ def build_rag_corpus(seed_queries: List[str]) -> List[Dict[str, str]]:
                 corpus.extend(extra)
         except Exception:
             pass
-    jdump(RAG_DIR / "corpus.json", corpus)
-    logging.info("RAG corpus size: %s", len(corpus))
-    return corpus
+    unique = dedupe_by_id(corpus)
+    jdump(RAG_DIR / "corpus.json", unique)
+    logging.info(
+        "RAG corpus size: %s (%s duplicate ids dropped); fetches: %s",
+        len(unique),
+        len(corpus) - len(unique),
+        fetcher.stats,
+    )
+    return unique
 
 
-def build_faiss(corpus_texts: List[str]) -> Tuple[faiss.IndexFlatIP, np.ndarray]:
+async def build_faiss(corpus_texts: List[str]) -> Tuple[faiss.IndexFlatIP, np.ndarray]:
+    import faiss
+
     logging.info("Embedding RAG corpus...")
-    embeddings: List[List[float]] = []
-    batch = 32
-    for start in range(0, len(corpus_texts), batch):
-        chunk = corpus_texts[start : start + batch]
-        embeddings.extend(OAI.embed(chunk))
-        time.sleep(0.05)
-    matrix = np.array(embeddings, dtype="float32")
+    matrix = await oai().embed_matrix(corpus_texts)
     faiss.normalize_L2(matrix)
     index = faiss.IndexFlatIP(matrix.shape[1])
     index.add(matrix)
     return index, matrix
 
 
-def rag_search(index: faiss.IndexFlatIP, matrix: np.ndarray, corpus: List[Dict[str, str]], query: str, k: int = 6) -> List[Dict[str, str]]:
-    query_vector = np.array(OAI.embed([query])[0], dtype="float32")
-    faiss.normalize_L2(query_vector.reshape(1, -1))
-    distances, indices = index.search(query_vector.reshape(1, -1), k)
-    return [corpus[idx] for idx in indices[0] if 0 <= idx < len(corpus)]
+async def rag_search_many(
+    index: faiss.IndexFlatIP, corpus: List[Dict[str, str]], queries: List[str], k: int = 6
+) -> Dict[str, List[Dict[str, str]]]:
+    """Top-``k`` documents for each distinct query, embedded and searched as one batch."""
+    import faiss
+
+    distinct = list(dict.fromkeys(queries))
+    if not distinct:
+        return {}
+    query_matrix = await oai().embed_matrix(distinct)
+    faiss.normalize_L2(query_matrix)
+    distances, indices = index.search(query_matrix, k)
+    return {query: [corpus[idx] for idx in row if 0 <= idx < len(corpus)] for query, row in zip(distinct, indices.tolist())}
+
+
+async def rag_search(
+    index: faiss.IndexFlatIP, matrix: np.ndarray, corpus: List[Dict[str, str]], query: str, k: int = 6
+) -> List[Dict[str, str]]:
+    return (await rag_search_many(index, corpus, [query], k))[query]
+
+
+def select_snippets(hits: Dict[str, List[Dict[str, str]]], queries: List[str], per_query: int) -> List[Dict[str, str]]:
+    """Up to ``per_query`` documents per query, in query order, each document id at most once.
+
+    A query whose best hits were already taken by an earlier query falls back
+    to its next-ranked documents.
+    """
+    seen = set()
+    snippets: List[Dict[str, str]] = []
+    for query in queries:
+        taken = 0
+        for doc in hits.get(query, []):
+            if taken == per_query:
+                break
+            if doc["id"] not in seen:
+                seen.add(doc["id"])
+                snippets.append(doc)
+                taken += 1
+    return snippets
 
 
 IDEA_SCHEMA = {
@@ -349,68 +398,38 @@ def mutate_idea(idea: Dict[str, Any]) -> Dict[str, Any]:
     return random.choice(mutations)(idea)
 
 
-def divergent_search(
-    corpus_idx: faiss.IndexFlatIP,
-    corpus_mat: np.ndarray,
-    corpus_docs: List[Dict[str, str]],
-    seed_queries: List[str],
-) -> List[Dict[str, Any]]:
-    pool: List[Dict[str, Any]] = []
-    for variant, temp, top_p in itertools.product(PROMPT_VARIANTS, DIVERGENT_TEMPS, DIVERGENT_TOPP):
-        rag_snippets: List[Dict[str, str]] = []
-        for query in random.sample(seed_queries, k=min(3, len(seed_queries))):
-            rag_snippets.extend(rag_search(corpus_idx, corpus_mat, corpus_docs, query, k=2))
-        rag_text = "\n".join([f"- {snippet['text'][:800]}" for snippet in rag_snippets[:6]])
-
-        prompt = textwrap.dedent(
-            f"""
-            {variant}
-
-            Brief:
-            {BRIEF}
-
-            Evidence snippets (non-binding, for plausibility and inspiration):
-            {rag_text}
-
-            Return {DIVERGENT_IDEAS_PER_RESP}–12 distinct, mechanism-specific ideas in JSON (schema enforced).
-            """
-        ).strip()
-
-        for _ in range(DIVERGENT_N_PER):
-            output = OAI.respond_json(
-                LLM_MODEL_DIVERGENT,
-                prompt,
-                IDEA_SCHEMA,
-                temperature=temp,
-                top_p=top_p,
-                max_tokens=6000,
-            )
-            for idea in output.get("ideas", []):
-                idea["_T"] = temp
-                idea["_P"] = top_p
-                idea["_variant"] = variant[:48]
-                pool.append(idea)
-            time.sleep(0.1)
-
-    logging.info("Divergent raw ideas: %s", len(pool))
-    texts = [idea["title"] + " :: " + idea.get("mechanism", "") for idea in pool]
-    embeddings = np.array(OAI.embed(texts), dtype="float32")
-    faiss.normalize_L2(embeddings)
-    kept: List[Dict[str, Any]] = []
-    used: List[int] = []
-    for idx in np.argsort([-score_novelty(idea) for idea in pool]).tolist():
-        if any(float(np.dot(embeddings[idx], embeddings[j])) > MAX_NEAR_DUPLICATES for j in used):
-            continue
-        kept.append(pool[idx])
-        used.append(idx)
-        if len(kept) >= KEEP_TOP_IDEAS:
-            break
+def divergent_prompt(variant: str, rag_snippets: List[Dict[str, str]]) -> str:
+    rag_text = "\n".join([f"- {snippet['text'][:800]}" for snippet in rag_snippets])
+    return textwrap.dedent(
+        f"""
+        {variant}
 
-    mutations = [mutate_idea(idea) for idea in random.sample(kept, k=min(30, len(kept)))]
-    final = kept + mutations
-    jdump(OUT / "divergent_ideas.json", final)
-    logging.info("Divergent ideas kept: %s", len(final))
-    return final
+        Brief:
+        {BRIEF}
+
+        Evidence snippets (non-binding, for plausibility and inspiration):
+        {rag_text}
+
+        Return {DIVERGENT_IDEAS_PER_RESP}–12 distinct, mechanism-specific ideas in JSON (schema enforced).
+        """
+    ).strip()
+
+
+async def divergent_samples(prompt: str, variant: str, temp: float, top_p: float) -> List[Dict[str, Any]]:
+    outputs = await asyncio.gather(
+        *(
+            oai().respond_json(LLM_MODEL_DIVERGENT, prompt, IDEA_SCHEMA, temperature=temp, top_p=top_p, max_tokens=6000)
+            for _ in range(DIVERGENT_N_PER)
+        )
+    )
+    ideas = []
+    for output in outputs:
+        for idea in output.get("ideas", []):
+            idea["_T"] = temp
+            idea["_P"] = top_p
+            idea["_variant"] = variant[:48]
+            ideas.append(idea)
+    return ideas
 
 
 CLAIMS_SCHEMA = {
@@ -448,7 +467,7 @@ DTD_SCHEMA = {
 }
 
 
-def legalize_idea(idea: Dict[str, Any], idx: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+async def legalize_idea(idea: Dict[str, Any], idx: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     system_prompt = textwrap.dedent(
         """You are drafting US patent claims and §112-supported description.
 - Keep explicit antecedent basis.
@@ -465,26 +484,29 @@ VALIDATION: {idea['validation_plan']}
 RISKS: {idea.get('risk_circumvention', '')}
 Include IAL3 strong-path variants (e.g., bootable USB trust root + TEE attest) and IL2 low-friction fallback where applicable."""
     )
-    claims = OAI.respond_json(
-        LLM_MODEL_CONVERGENT,
-        system_prompt + "\n\nDraft claims as JSON per schema.\n" + brief,
-        CLAIMS_SCHEMA,
-        temperature=CONVERGENT_TEMP,
-        top_p=CONVERGENT_TOPP,
-        max_tokens=8000,
-    )
-    jdump(TICKETS_DIR / f"CLM_{idx:04d}.json", claims)
-    dtd = OAI.respond_json(
-        LLM_MODEL_CONVERGENT,
-        system_prompt
-        + "\n\nDraft Detailed Description as JSON per schema with explicit paragraph IDs in [P###] markers.\n"
-        + brief,
-        DTD_SCHEMA,
-        temperature=CONVERGENT_TEMP,
-        top_p=CONVERGENT_TOPP,
-        max_tokens=12000,
+
+    async def draft(kind: str, instruction: str, schema: dict, max_tokens: int) -> Dict[str, Any]:
+        output = await oai().respond_json(
+            LLM_MODEL_CONVERGENT,
+            system_prompt + "\n\n" + instruction + "\n" + brief,
+            schema,
+            temperature=CONVERGENT_TEMP,
+            top_p=CONVERGENT_TOPP,
+            max_tokens=max_tokens,
+        )
+        jdump(TICKETS_DIR / f"{kind}_{idx:04d}.json", output)
+        return output
+
+    # Claims and description are drafted from the same brief, so they run together.
+    claims, dtd = await asyncio.gather(
+        draft("CLM", "Draft claims as JSON per schema.", CLAIMS_SCHEMA, 8000),
+        draft(
+            "DTD",
+            "Draft Detailed Description as JSON per schema with explicit paragraph IDs in [P###] markers.",
+            DTD_SCHEMA,
+            12000,
+        ),
     )
-    jdump(TICKETS_DIR / f"DTD_{idx:04d}.json", dtd)
     return claims, dtd
 
 
@@ -512,6 +534,151 @@ def validate_claims_and_map(clm: Dict[str, Any], dtd: Dict[str, Any]) -> List[st
     return errors
 
 
+class StageClock:
+    """First start and last finish of each pipeline stage."""
+
+    def __init__(self) -> None:
+        self.spans: Dict[str, List[float]] = {}
+
+    def start(self, stage: str) -> None:
+        self.spans.setdefault(stage, [time.perf_counter(), 0.0])
+
+    def finish(self, stage: str) -> None:
+        self.spans[stage][1] = time.perf_counter()
+
+    def summary(self) -> Dict[str, float]:
+        return {stage: round(end - begin, 3) for stage, (begin, end) in self.spans.items()}
+
+
+async def divergent_stage(
+    corpus_idx: faiss.IndexFlatIP,
+    corpus_mat: np.ndarray,
+    corpus_docs: List[Dict[str, str]],
+    seed_queries: List[str],
+    ideas_out: asyncio.Queue,
+    clock: StageClock,
+) -> None:
+    """Generate every prompt combination concurrently, queueing each one's ideas as they arrive."""
+    # Queries are sampled up front, in a fixed order, so concurrency does not
+    # change which evidence each prompt sees.
+    combos = [
+        (variant, temp, top_p, random.sample(seed_queries, k=min(RAG_QUERIES_PER_PROMPT, len(seed_queries))))
+        for variant, temp, top_p in itertools.product(PROMPT_VARIANTS, DIVERGENT_TEMPS, DIVERGENT_TOPP)
+    ]
+
+    async def generate(variant: str, temp: float, top_p: float, queries: List[str]) -> None:
+        prompt = divergent_prompt(variant, select_snippets(hits, queries, RAG_SNIPPETS_PER_QUERY))
+        await ideas_out.put(await divergent_samples(prompt, variant, temp, top_p))
+
+    clock.start("divergent")
+    try:
+        # Every seed query is retrieved once, deep enough that each prompt can
+        # replace hits another of its queries already contributed.
+        depth = min(RAG_SNIPPETS_PER_QUERY * RAG_QUERIES_PER_PROMPT, corpus_idx.ntotal)
+        hits = await rag_search_many(corpus_idx, corpus_docs, seed_queries, k=depth)
+        await asyncio.gather(*(generate(*combo) for combo in combos))
+    finally:
+        clock.finish("divergent")
+        await ideas_out.put(None)
+
+
+async def dedup_stage(ideas_in: asyncio.Queue, accepted_out: asyncio.Queue, clock: StageClock) -> List[Dict[str, Any]]:
+    """Admit novel, non-duplicate ideas to ``accepted_out`` as their batches arrive.
+
+    Within a batch the most novel ideas are tried first; against earlier
+    batches the first-arrived of two near-duplicates wins. The first
+    ``MAX_LEGALIZE`` admissions are queued for legalization at once, so
+    drafting overlaps generation; mutations fill any slots left at the end.
+    """
+    import numpy as np
+
+    from patentgen.dedup import DedupEngine
+
+    engine = DedupEngine(MAX_NEAR_DUPLICATES)
+    kept: List[Dict[str, Any]] = []
+    raw = 0
+    queued = 0
+    while (batch := await ideas_in.get()) is not None:
+        raw += len(batch)
+        if len(kept) >= KEEP_TOP_IDEAS or not batch:
+            continue
+        clock.start("dedup")
+        texts = [idea["title"] + " :: " + idea.get("mechanism", "") for idea in batch]
+        vectors = await oai().embed_matrix(texts)
+        ranked = np.argsort([-score_novelty(idea) for idea in batch], kind="stable")
+        rows = engine.add(vectors[ranked], limit=KEEP_TOP_IDEAS - len(kept))
+        admitted = [batch[int(ranked[row])] for row in rows]
+        kept.extend(admitted)
+        clock.finish("dedup")
+        for idea in admitted[: MAX_LEGALIZE - queued]:
+            await accepted_out.put(idea)
+            queued += 1
+
+    mutations = [mutate_idea(idea) for idea in random.sample(kept, k=min(30, len(kept)))]
+    for mutation in mutations[: MAX_LEGALIZE - queued]:
+        await accepted_out.put(mutation)
+    for _ in range(LEGALIZE_WORKERS):
+        await accepted_out.put(None)
+    final = kept + mutations
+    jdump(OUT / "divergent_ideas.json", final)
+    report = engine.report()
+    sizes = engine.cluster_sizes().tolist()
+    report["clusters"] = sorted(
+        ({"title": idea.get("title", ""), "size": size} for idea, size in zip(kept, sizes) if size > 1),
+        key=lambda cluster: -cluster["size"],
+    )
+    jdump(OUT / "dedup_clusters.json", report)
+    logging.info(
+        "Divergent raw ideas: %s, kept: %s, duplicates rejected: %s (largest cluster %s)",
+        raw,
+        len(final),
+        report["rejected"],
+        report["largest_cluster"],
+    )
+    return final
+
+
+async def legalize_stage(
+    accepted_in: asyncio.Queue, results: Dict[int, Tuple[Dict[str, Any], Dict[str, Any]]], clock: StageClock
+) -> None:
+    """Legalize queued ideas in queue order until the sentinel arrives."""
+    while (idea := await accepted_in.get()) is not None:
+        idx = len(results) + 1
+        results[idx] = ({}, {})
+        clock.start("legalize")
+        logging.info("Legalizing idea %s/%s: %s", idx, MAX_LEGALIZE, idea.get("title", "")[:80])
+        claims, dtd = await legalize_idea(idea, idx)
+        errors = validate_claims_and_map(claims, dtd)
+        if errors:
+            logging.warning("Validator warnings for idea %s:\n%s", idx, "\n".join(errors))
+        results[idx] = (claims, dtd)
+        clock.finish("legalize")
+
+
+async def stream_pipeline(
+    corpus_idx: faiss.IndexFlatIP,
+    corpus_mat: np.ndarray,
+    corpus_docs: List[Dict[str, str]],
+    seed_queries: List[str],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Run divergent generation, dedup and legalization as overlapping stages."""
+    ideas: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    accepted: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    results: Dict[int, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+    clock = StageClock()
+    started = time.perf_counter()
+    await asyncio.gather(
+        divergent_stage(corpus_idx, corpus_mat, corpus_docs, seed_queries, ideas, clock),
+        dedup_stage(ideas, accepted, clock),
+        *(legalize_stage(accepted, results, clock) for _ in range(LEGALIZE_WORKERS)),
+    )
+    timings = {**clock.summary(), "total": round(time.perf_counter() - started, 3)}
+    jdump(OUT / "pipeline_timings.json", timings)
+    logging.info("Pipeline stage spans (s): %s", timings)
+    packets = [results[idx] for idx in sorted(results)]
+    return [claims for claims, _ in packets], [dtd for _, dtd in packets]
+
+
 def assemble_markdown() -> Path:
     markdown: List[str] = []
     markdown.append("# COMPREHENSIVE SPEC: PRNU + HARDWARE/CRYPTO ATTESTATIONS + IAL3/IL2 FLOWS\n")
@@ -559,33 +726,38 @@ MANIFEST = {
         "consent-bound credential issuance revocation cryptographic receipts",
     ],
 }
-jdump(OUT / "manifest.json", MANIFEST)
 
 
-def main() -> None:
-    corpus = build_rag_corpus(MANIFEST["seed_queries"])
+async def run() -> None:
+    jdump(OUT / "manifest.json", MANIFEST)
+    corpus = await build_rag_corpus(MANIFEST["seed_queries"])
     corpus_texts = [doc["text"] for doc in corpus]
     if len(corpus_texts) == 0:
         logging.warning("RAG corpus is empty; continuing without web grounding.")
         corpus_texts = ["placeholder grounding"]
         corpus = [{"id": "placeholder", "text": "placeholder grounding"}]
-    index, matrix = build_faiss(corpus_texts)
-    ideas = divergent_search(index, matrix, corpus, MANIFEST["seed_queries"])
-    max_legalize = min(40, len(ideas))
-    all_claims: List[Dict[str, Any]] = []
-    all_dtds: List[Dict[str, Any]] = []
-    for idx, idea in enumerate(ideas[:max_legalize], start=1):
-        logging.info("Legalizing idea %s/%s: %s", idx, max_legalize, idea.get("title", "")[:80])
-        claims, dtd = legalize_idea(idea, idx)
-        errors = validate_claims_and_map(claims, dtd)
-        if errors:
-            logging.warning("Validator warnings:\n%s", "\n".join(errors))
-        all_claims.append(claims)
-        all_dtds.append(dtd)
-        time.sleep(0.1)
+    index, matrix = await build_faiss(corpus_texts)
+    all_claims, all_dtds = await stream_pipeline(index, matrix, corpus, MANIFEST["seed_queries"])
     jdump(OUT / "claims_packets.json", all_claims)
     jdump(OUT / "dtd_packets.json", all_dtds)
     assemble_markdown()
+
+
+async def run_with_client() -> None:
+    client = oai()
+    try:
+        await run()
+    finally:
+        await client.aclose()
+        summary = client.metrics.summary()
+        jdump(OUT / "llm_metrics.json", summary)
+        logging.info("LLM calls: %s", json.dumps(summary["kinds"]))
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    ensure_output_dirs()
+    asyncio.run(run_with_client())
     logging.info("Done. Convert to DOCX/PDF with: pandoc full_spec.md -o full_spec.docx")
 
 
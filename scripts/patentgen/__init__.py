@@ -0,0 +1,7 @@
+"""Building blocks for ``scripts/mega_patent_generator.py``."""
+
+from .embed_cache import EmbeddingCache
+from .fetch import Fetcher
+from .llm import AdaptiveConcurrency, APIError, AsyncOpenAIClient, CallMetrics, TokenBucket
+
+__all__ = ["AdaptiveConcurrency", "APIError", "AsyncOpenAIClient", "CallMetrics", "EmbeddingCache", "Fetcher", "TokenBucket"]
@@ -0,0 +1,140 @@
+"""Greedy near-duplicate filtering over embedding vectors.
+
+``DedupEngine.add`` admits rows in the order given and rejects a row whose
+cosine similarity to any admitted row exceeds the threshold, exactly like
+checking each candidate against every kept vector, but without a Python-level
+loop over pairs. Candidates are processed in blocks. Each block is compared
+with everything already kept in one search: by default a blocked matrix
+product over a growing buffer, or with ``backend="faiss"`` an incremental
+``IndexFlatIP`` (measurably slower on CPU for these shapes; see
+``benchmarks/bench_dedup.py``). Rows the kept set does not already cover are
+then compared with each other in one product, and a greedy pass admits rows,
+tightening the best match of later rows as each admission lands.
+
+A rejected row counts toward the cluster of the kept row it matched best, so
+``report`` can show how many duplicates each kept idea absorbed.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class DedupEngine:
+    def __init__(self, threshold: float, block_size: int = 2048, backend: str = "numpy") -> None:
+        if backend not in ("faiss", "numpy"):
+            raise ValueError(f"Unknown dedup backend: {backend}")
+        self.threshold = threshold
+        self.block_size = block_size
+        self.backend = backend
+        self.kept = 0
+        self.rejected = 0
+        self._index: Any = None
+        self._buffer: Optional[np.ndarray] = None
+        self._duplicates = np.zeros(0, dtype=np.int64)
+
+    def add(self, vectors: np.ndarray, limit: Optional[int] = None) -> List[int]:
+        """Admit rows of ``vectors`` greedily in order; returns the admitted row positions.
+
+        With ``limit``, stops after that many admissions; rows after the last
+        admission are left unexamined.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or not len(vectors):
+            return []
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, 1e-12)
+        admitted: List[int] = []
+        for start in range(0, len(vectors), self.block_size):
+            budget = None if limit is None else limit - len(admitted)
+            if budget == 0:
+                break
+            rows = self._admit_block(vectors[start : start + self.block_size], budget)
+            admitted.extend(start + row for row in rows)
+        return admitted
+
+    def _admit_block(self, block: np.ndarray, budget: Optional[int]) -> List[int]:
+        best, match = self._search(block)
+        # Only rows no kept vector already covers can be admitted or tighten a later match.
+        survivors = np.flatnonzero(best <= self.threshold)
+        similarity = block[survivors] @ block[survivors].T
+        rank = np.full(len(block), -1, dtype=np.int64)
+        rank[survivors] = np.arange(len(survivors))
+        admitted: List[int] = []
+        # Duplicates absorbed by rows admitted from this block, by admission order.
+        absorbed = np.zeros(len(block), dtype=np.int64)
+        for row in range(len(block)):
+            if best[row] > self.threshold:
+                if match[row] < self.kept:
+                    self._duplicates[match[row]] += 1
+                else:
+                    absorbed[match[row] - self.kept] += 1
+                self.rejected += 1
+                continue
+            kept_id = self.kept + len(admitted)
+            admitted.append(row)
+            if budget is not None and len(admitted) == budget:
+                break
+            later = survivors[rank[row] + 1 :]
+            scores = similarity[rank[row], rank[row] + 1 :]
+            closer = scores > best[later]
+            best[later[closer]] = scores[closer]
+            match[later[closer]] = kept_id
+        self._duplicates = np.concatenate([self._duplicates, absorbed[: len(admitted)]])
+        self._append(block[admitted])
+        return admitted
+
+    def _search(self, block: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        best = np.full(len(block), -np.inf, dtype=np.float32)
+        match = np.full(len(block), -1, dtype=np.int64)
+        if not self.kept:
+            return best, match
+        if self.backend == "faiss":
+            distances, indices = self._index.search(block, 1)
+            return distances[:, 0].copy(), indices[:, 0].astype(np.int64)
+        for start in range(0, self.kept, self.block_size):
+            scores = block @ self._buffer[start : min(start + self.block_size, self.kept)].T
+            top = scores.argmax(axis=1)
+            value = scores[np.arange(len(block)), top]
+            closer = value > best
+            best[closer] = value[closer]
+            match[closer] = start + top[closer]
+        return best, match
+
+    def _append(self, rows: np.ndarray) -> None:
+        if not len(rows):
+            return
+        if self.backend == "faiss":
+            if self._index is None:
+                import faiss
+
+                self._index = faiss.IndexFlatIP(rows.shape[1])
+            self._index.add(np.ascontiguousarray(rows))
+        else:
+            if self._buffer is None:
+                self._buffer = np.empty((max(self.block_size, len(rows)), rows.shape[1]), dtype=np.float32)
+            elif self.kept + len(rows) > len(self._buffer):
+                grown = np.empty((max(2 * len(self._buffer), self.kept + len(rows)), rows.shape[1]), dtype=np.float32)
+                grown[: self.kept] = self._buffer[: self.kept]
+                self._buffer = grown
+            self._buffer[self.kept : self.kept + len(rows)] = rows
+        self.kept += len(rows)
+
+    def cluster_sizes(self) -> np.ndarray:
+        """Size of each kept row's cluster: itself plus the duplicates it absorbed."""
+        return self._duplicates[: self.kept] + 1
+
+    def report(self) -> Dict[str, Any]:
+        sizes = self.cluster_sizes()
+        histogram = Counter(sizes[sizes > 1].tolist())
+        return {
+            "backend": self.backend,
+            "kept": self.kept,
+            "rejected": self.rejected,
+            "clusters_with_duplicates": int((sizes > 1).sum()),
+            "largest_cluster": int(sizes.max()) if len(sizes) else 0,
+            "cluster_size_histogram": {str(size): count for size, count in sorted(histogram.items())},
+        }
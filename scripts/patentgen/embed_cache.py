@@ -0,0 +1,147 @@
+"""Persistent embedding cache keyed by (model, text hash).
+
+Each model gets three files in the cache directory: ``<model>.f32`` holds the
+vectors as consecutive float32 rows, ``<model>.keys`` holds one text hash per
+line (line ``i`` names row ``i``), and ``<model>.json`` records the
+dimension. Vectors are read through a memory map, so lookups touch only the
+rows they need. Appends take an exclusive lock and write vectors before
+keys, so a reader never sees a key without its row and a crashed writer
+leaves at most an unkeyed tail, which the next append truncates. Any number
+of runs, projects and processes can share one directory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+class _ModelStore:
+    def __init__(self, directory: Path, model: str) -> None:
+        stem = re.sub(r"[^A-Za-z0-9._-]", "_", model)
+        self.vectors_path = directory / f"{stem}.f32"
+        self.keys_path = directory / f"{stem}.keys"
+        self.meta_path = directory / f"{stem}.json"
+        self.lock_path = directory / f"{stem}.lock"
+        self.dim = 0
+        self.count = 0
+        self.rows: Dict[str, int] = {}
+        self._offset = 0
+        self._matrix: np.ndarray | None = None
+
+    def refresh(self) -> None:
+        """Pick up rows appended since the last look, by this or another process."""
+        try:
+            size = self.keys_path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size == self._offset:
+            return
+        if not self.dim:
+            self.dim = int(json.loads(self.meta_path.read_text())["dim"])
+        with self.keys_path.open("rb") as handle:
+            handle.seek(self._offset)
+            data = handle.read()
+        complete = data.rfind(b"\n") + 1
+        for line in data[:complete].splitlines():
+            self.rows.setdefault(line.decode(), self.count)
+            self.count += 1
+        self._offset += complete
+        self._matrix = None
+
+    def matrix(self) -> np.ndarray:
+        import numpy as np
+
+        if self._matrix is None:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self.count, self.dim))
+        return self._matrix
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        with self.lock_path.open("a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def append(self, hashes: Sequence[str], vectors: np.ndarray) -> None:
+        import numpy as np
+
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self.locked():
+            self.refresh()
+            if not self.dim:
+                self.dim = int(vectors.shape[1])
+                self.meta_path.write_text(json.dumps({"dim": self.dim}))
+            if vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match cached {self.dim}")
+            seen = set(self.rows)
+            fresh = []
+            for index, key in enumerate(hashes):
+                if key not in seen:
+                    seen.add(key)
+                    fresh.append(index)
+            if not fresh:
+                return
+            # Drop any tail a crashed writer left past the last complete key.
+            with self.vectors_path.open("ab") as handle:
+                handle.truncate(self.count * self.dim * 4)
+                handle.write(vectors[fresh].tobytes())
+                handle.flush()
+                os.fsync(handle.fileno())
+            with self.keys_path.open("ab") as handle:
+                handle.truncate(self._offset)
+                handle.write("".join(hashes[index] + "\n" for index in fresh).encode())
+            self.refresh()
+
+
+class EmbeddingCache:
+    def __init__(self, directory: Path | str) -> None:
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+        self._stores: Dict[str, _ModelStore] = {}
+        self._lock = threading.Lock()
+
+    def _store(self, model: str) -> _ModelStore:
+        if model not in self._stores:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._stores[model] = _ModelStore(self.directory, model)
+        return self._stores[model]
+
+    def lookup(self, model: str, hashes: Sequence[str]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """``(vectors by hash, hashes not cached)``; missing hashes keep their order."""
+        with self._lock:
+            store = self._store(model)
+            store.refresh()
+            found = [key for key in hashes if key in store.rows]
+            missing = [key for key in hashes if key not in store.rows]
+            vectors = dict(zip(found, store.matrix()[[store.rows[key] for key in found]])) if found else {}
+        self.hits += len(found)
+        self.misses += len(missing)
+        return vectors, missing
+
+    def store(self, model: str, hashes: Sequence[str], vectors: np.ndarray) -> None:
+        with self._lock:
+            self._store(model).append(hashes, vectors)
@@ -0,0 +1,279 @@
+"""Concurrent, cached and polite HTTP fetching for the RAG corpus.
+
+``Fetcher`` shares one pooled ``httpx.AsyncClient`` across every request.
+It allows at most ``per_host`` requests in flight to any one host and spaces
+requests to hosts listed in ``host_interval``. Concurrent requests for the
+same URL and body share one network call. Responses are kept in an on-disk
+cache under ``cache_dir``, read and written in worker threads so disk I/O
+never stalls the event loop: an entry younger than ``max_age`` is served
+without touching the network, and an older one is revalidated with
+``If-None-Match`` / ``If-Modified-Since``, so a 304 costs only a round trip.
+
+``extract_many`` runs HTML-to-text extraction (``trafilatura``, then
+``readability``) in a worker pool so parsing never blocks the event loop or
+the network.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import hashlib
+import json
+import logging
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (compatible; patentgen corpus fetcher)"
+
+
+@functools.lru_cache(maxsize=None)
+def html_extractors() -> Tuple[Optional[Callable[[str], Optional[str]]], Optional[Any]]:
+    """``(trafilatura.extract, readability.Document)``, ``None`` where not installed."""
+    try:
+        import trafilatura
+
+        extract = trafilatura.extract
+    except Exception:
+        extract = None
+    try:
+        from readability import Document
+    except Exception:
+        Document = None
+    return extract, Document
+
+
+def extract_text(html: str) -> Optional[str]:
+    """Main text of ``html``: trafilatura when it finds enough, else readability, else raw HTML."""
+    try:
+        extract, ReadabilityDocument = html_extractors()
+        if extract is not None:
+            text = extract(html) or ""
+            if len(text.strip()) >= 200:
+                return text
+        if ReadabilityDocument is not None:
+            return re.sub("<[^>]+>", " ", ReadabilityDocument(html).summary())
+        return html[:8000]
+    except Exception:
+        return None
+
+
+def dedupe_by_id(docs: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
+    """``docs`` without later entries whose ``id`` was already seen."""
+    seen = set()
+    unique = []
+    for doc in docs:
+        if doc.get("id") not in seen:
+            seen.add(doc.get("id"))
+            unique.append(doc)
+    return unique
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int
+    body: bytes
+    from_cache: bool = False
+    revalidated: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class Fetcher:
+    def __init__(
+        self,
+        cache_dir: Path | str,
+        per_host: int = 2,
+        host_interval: Optional[Dict[str, float]] = None,
+        max_connections: int = 16,
+        max_age: float = 0.0,
+        timeout: float = 30.0,
+        extract_workers: int = 2,
+        extract_executor: Optional[Executor] = None,
+        transport: Any = None,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.per_host = per_host
+        self.host_interval = dict(host_interval or {})
+        self.max_connections = max_connections
+        self.max_age = max_age
+        self.timeout = timeout
+        self.extract_workers = extract_workers
+        self.stats = {"network": 0, "cache_fresh": 0, "not_modified": 0, "coalesced": 0, "errors": 0}
+        self._extract_executor = extract_executor
+        self._owns_executor = extract_executor is None
+        self._transport = transport
+        self._http: Any = None
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+        self._last_request: Dict[str, float] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    @property
+    def http(self) -> Any:
+        if self._http is None:
+            import httpx
+
+            self._http = httpx.AsyncClient(
+                headers={"User-Agent": USER_AGENT},
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.max_connections),
+                transport=self._transport,
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._owns_executor and self._extract_executor is not None:
+            self._extract_executor.shutdown(wait=False, cancel_futures=True)
+            self._extract_executor = None
+
+    async def __aenter__(self) -> "Fetcher":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> FetchResult:
+        return await self.request("GET", url, params=params)
+
+    async def post_json(self, url: str, payload: Any) -> FetchResult:
+        return await self.request("POST", url, body=json.dumps(payload, sort_keys=True).encode())
+
+    async def request(
+        self, method: str, url: str, params: Optional[Dict[str, Any]] = None, body: Optional[bytes] = None
+    ) -> FetchResult:
+        """Fetch through the cache; network failures come back as status 0."""
+        import httpx
+
+        full_url = str(httpx.URL(url, params=params)) if params else url
+        key = hashlib.sha256(f"{method} {full_url}\n".encode() + (body or b"")).hexdigest()[:32]
+        while (pending := self._pending.get(key)) is not None:
+            self.stats["coalesced"] += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # Only our own cancellation propagates; if just the owning request was
+                # cancelled, fetch again (or join whichever request now owns the key).
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            result = await self._fetch(method, full_url, body, key)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # retrieved here so an unawaited future does not warn
+            raise
+        finally:
+            del self._pending[key]
+
+    async def _fetch(self, method: str, url: str, body: Optional[bytes], key: str) -> FetchResult:
+        import httpx
+
+        meta_path, body_path = self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+        cached = await asyncio.to_thread(self._load, meta_path, body_path)
+        if cached is not None and time.time() - cached[0]["fetched_at"] < self.max_age:
+            self.stats["cache_fresh"] += 1
+            return FetchResult(url, cached[0]["status"], cached[1], from_cache=True)
+
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        if cached is not None:
+            if cached[0].get("etag"):
+                headers["If-None-Match"] = cached[0]["etag"]
+            if cached[0].get("last_modified"):
+                headers["If-Modified-Since"] = cached[0]["last_modified"]
+        host = urlsplit(url).netloc
+        async with self._host_slot(host):
+            self.stats["network"] += 1
+            try:
+                response = await self.http.request(method, url, content=body, headers=headers)
+            except httpx.HTTPError as exc:
+                self.stats["errors"] += 1
+                logger.warning("Fetch failed for %s: %r", url, exc)
+                if cached is not None:
+                    return FetchResult(url, cached[0]["status"], cached[1], from_cache=True)
+                return FetchResult(url, 0, b"")
+
+        if response.status_code == 304 and cached is not None:
+            self.stats["not_modified"] += 1
+            await asyncio.to_thread(self._store, meta_path, None, {**cached[0], "fetched_at": time.time()})
+            return FetchResult(url, cached[0]["status"], cached[1], from_cache=True, revalidated=True)
+        if response.is_success:
+            meta = {
+                "url": url,
+                "status": response.status_code,
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "fetched_at": time.time(),
+            }
+            await asyncio.to_thread(self._store, meta_path, response.content, meta)
+        return FetchResult(url, response.status_code, response.content)
+
+    @contextlib.asynccontextmanager
+    async def _host_slot(self, host: str) -> AsyncIterator[None]:
+        """One of ``host``'s slots, entered no sooner than its interval after the previous request."""
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host)
+            self._host_locks[host] = asyncio.Lock()
+        async with self._hosts[host]:
+            interval = self.host_interval.get(host, 0.0)
+            if interval:
+                async with self._host_locks[host]:
+                    wait = self._last_request.get(host, float("-inf")) + interval - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    self._last_request[host] = time.monotonic()
+            yield
+
+    def _load(self, meta_path: Path, body_path: Path) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        try:
+            return json.loads(meta_path.read_text()), body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, meta_path: Path, body: Optional[bytes], meta: Dict[str, Any]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if body is not None:
+            # Body first: metadata without its body reads as a miss, never as stale content.
+            temporary = meta_path.with_suffix(".body.tmp")
+            temporary.write_bytes(body)
+            temporary.replace(meta_path.with_suffix(".body"))
+        temporary = meta_path.with_suffix(".json.tmp")
+        temporary.write_text(json.dumps(meta))
+        temporary.replace(meta_path)
+
+    async def extract_many(self, htmls: List[str]) -> List[Optional[str]]:
+        """``extract_text`` for each document, run in the extraction worker pool."""
+        if self._extract_executor is None:
+            self._extract_executor = ProcessPoolExecutor(max_workers=self.extract_workers)
+        loop = asyncio.get_running_loop()
+        jobs = [loop.run_in_executor(self._extract_executor, extract_text, html) for html in htmls]
+        return list(await asyncio.gather(*jobs))
+
@@ -0,0 +1,424 @@
+"""Async OpenAI HTTP client with shared rate limits and adaptive concurrency.
+
+Before every attempt a call reserves one request and its estimated tokens from
+two ``TokenBucket``s shared by all callers, then waits for a slot from
+``AdaptiveConcurrency``. The slot limit grows by one per window of successful
+calls and halves on a 429 or 5xx (AIMD), so a burst of calls settles just under
+the account's real limits instead of hammering them. Throttled and failed
+attempts are retried with full-jitter exponential backoff, never shorter than
+the server's ``Retry-After``; unused token reservations are refunded from the
+reported usage. Every call's latency, attempts and tokens land in
+``CallMetrics``.
+
+``embed_matrix`` sends only texts that are neither in the ``EmbeddingCache``
+nor already being fetched by another caller, in concurrent batches.
+
+One client may serve several event loops, in turn or at once (for example,
+repeated ``asyncio.run`` calls). The rate limits and the AIMD limit are shared.
+The asyncio condition and the ``httpx`` connection pool are bound to a loop,
+so they are created lazily for each running loop.
+
+``httpx`` is imported on first request, so importing this module is cheap.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .embed_cache import EmbeddingCache, text_hash
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+
+
+class APIError(RuntimeError):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(f"OpenAI API error {status}: {message[:500]}")
+        self.status = status
+
+
+def retryable(status: int) -> bool:
+    return status == 429 or status >= 500
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def output_text(response: Dict[str, Any]) -> str:
+    """The concatenated ``output_text`` parts of a Responses API body."""
+    if isinstance(response.get("output_text"), str):
+        return response["output_text"]
+    return "".join(
+        part.get("text", "")
+        for item in response.get("output") or []
+        for part in item.get("content") or []
+        if part.get("type") == "output_text"
+    )
+
+
+class TokenBucket:
+    """Continuously refilling bucket shared across threads and event loops.
+
+    ``reserve`` always succeeds, possibly taking the level negative, and
+    returns how long the caller must wait for its reservation to be covered.
+    """
+
+    def __init__(self, per_minute: float, burst: float | None = None, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute if burst is None else burst)
+        self._clock = clock
+        self._level = self.capacity
+        self._stamp = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            now = self._clock()
+            self._level = min(self.capacity, self._level + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._level -= amount
+            return 0.0 if self._level >= 0 else -self._level / self.rate
+
+    def refund(self, amount: float) -> None:
+        with self._lock:
+            self._level = min(self.capacity, self._level + amount)
+
+    async def acquire(self, amount: float) -> None:
+        delay = self.reserve(amount)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def _notify_all(condition: asyncio.Condition) -> None:
+    async with condition:
+        condition.notify_all()
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight calls: +1 slot per ``limit`` successes, times ``decrease`` on throttling.
+
+    The limit is shared by every event loop using the instance; each loop gets
+    its own condition, and a release wakes waiters on all of them.
+    """
+
+    def __init__(self, initial: int = 8, minimum: int = 1, maximum: int = 64, decrease: float = 0.5) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.in_flight = 0
+        self.peak = 0
+        self.decreases = 0
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._conditions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Condition]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._conditions:
+                self._conditions[loop] = asyncio.Condition()
+            return self._conditions[loop]
+
+    def _enter(self) -> bool:
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            return True
+
+    async def acquire(self) -> int:
+        condition = self._condition()
+        async with condition:
+            await condition.wait_for(self._enter)
+            return self._epoch
+
+    async def release(self, epoch: int, throttled: bool = False) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if not throttled:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            elif epoch == self._epoch:
+                # Calls that started under the old limit report one congestion
+                # event between them, not one halving each.
+                self.limit = max(self.minimum, self.limit * self.decrease)
+                self._epoch += 1
+                self.decreases += 1
+            conditions = list(self._conditions.items())
+        current = asyncio.get_running_loop()
+        for loop, condition in conditions:
+            if loop is current:
+                await _notify_all(condition)
+            elif not loop.is_closed():
+                try:
+                    asyncio.run_coroutine_threadsafe(_notify_all(condition), loop)
+                except RuntimeError:  # closed since the check
+                    pass
+
+
+@dataclass
+class CallRecord:
+    kind: str
+    model: str
+    status: int
+    attempts: int
+    latency_s: float
+    tokens: int
+
+
+class CallMetrics:
+    def __init__(self) -> None:
+        self.records: List[CallRecord] = []
+        self.throttled = 0
+        self.server_errors = 0
+        self.transport_errors = 0
+        self.cached_embeddings = 0
+        self.coalesced_embeddings = 0
+
+    def summary(self) -> Dict[str, Any]:
+        kinds: Dict[str, Any] = {}
+        for kind in sorted({record.kind for record in self.records}):
+            records = [record for record in self.records if record.kind == kind]
+            latencies = sorted(record.latency_s for record in records)
+            kinds[kind] = {
+                "calls": len(records),
+                "failed": sum(record.status != 200 for record in records),
+                "retries": sum(record.attempts - 1 for record in records),
+                "tokens": sum(record.tokens for record in records),
+                "latency_p50_s": latencies[len(latencies) // 2],
+                "latency_p95_s": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                "latency_max_s": latencies[-1],
+            }
+        return {
+            "kinds": kinds,
+            "throttled": self.throttled,
+            "server_errors": self.server_errors,
+            "transport_errors": self.transport_errors,
+            "cached_embeddings": self.cached_embeddings,
+            "coalesced_embeddings": self.coalesced_embeddings,
+        }
+
+
+def _retry_after(headers: Any) -> float:
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value:
+            try:
+                return float(value) * scale
+            except ValueError:
+                continue
+    return 0.0
+
+
+class AsyncOpenAIClient:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        embed_model: str = "text-embedding-3-large",
+        embed_cache: Optional[EmbeddingCache] = None,
+        embed_batch: int = 256,
+        requests_per_minute: float | None = 500,
+        tokens_per_minute: float | None = 800_000,
+        initial_concurrency: int = 8,
+        max_concurrency: int = 64,
+        max_retries: int = 6,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        timeout: float = 180.0,
+        transport: Any = None,
+    ) -> None:
+        self.api_key = api_key
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        self.embed_model = embed_model
+        self.embed_cache = embed_cache
+        self.embed_batch = embed_batch
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = AdaptiveConcurrency(initial_concurrency, maximum=max_concurrency)
+        self.metrics = CallMetrics()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self._transport = transport
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+        self._rng = random.Random()
+        self._pending: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    @property
+    def http(self) -> Any:
+        """The running loop's ``httpx.AsyncClient``, created on first use in that loop."""
+        loop = asyncio.get_running_loop()
+        if loop not in self._clients:
+            import httpx
+
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._clients[loop] = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.concurrency.maximum),
+                transport=self._transport,
+            )
+        return self._clients[loop]
+
+    async def aclose(self) -> None:
+        """Close the running loop's HTTP client."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def __aenter__(self) -> "AsyncOpenAIClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    async def respond_json(
+        self,
+        model: str,
+        prompt: str,
+        schema: dict,
+        temperature: float,
+        top_p: float,
+        max_tokens: int = 6000,
+    ) -> Dict[str, Any]:
+        body = {
+            "model": model,
+            "input": prompt,
+            "text": {"format": {"type": "json_schema", "name": "schema", "schema": schema}},
+            "temperature": temperature,
+            "top_p": top_p,
+            "max_output_tokens": max_tokens,
+        }
+        response = await self._post("responses", "/responses", body, estimate_tokens(prompt) + max_tokens)
+        return json.loads(output_text(response))
+
+    async def embed(self, texts: List[str], model: Optional[str] = None) -> List[List[float]]:
+        if not texts:
+            return []
+        body = {"model": model or self.embed_model, "input": texts}
+        response = await self._post("embeddings", "/embeddings", body, sum(estimate_tokens(text) for text in texts))
+        data = sorted(response["data"], key=lambda entry: entry.get("index", 0))
+        if len(data) != len(texts):
+            # Callers pair vectors with texts by position; a short response must not shift them.
+            raise ValueError(f"Embeddings response has {len(data)} vectors for {len(texts)} inputs")
+        return [entry["embedding"] for entry in data]
+
+    async def embed_matrix(self, texts: Sequence[str], model: Optional[str] = None) -> np.ndarray:
+        """``(len(texts), dim)`` float32 embeddings, requesting only what is neither cached nor in flight."""
+        import numpy as np
+
+        model = model or self.embed_model
+        hashes = [text_hash(text) for text in texts]
+        distinct = list(dict.fromkeys(hashes))
+        vectors: Dict[str, Any] = {}
+        missing = distinct
+        if self.embed_cache is not None:
+            vectors, missing = self.embed_cache.lookup(model, distinct)
+            self.metrics.cached_embeddings += len(vectors)
+        waiting = {key: self._pending[(model, key)] for key in missing if (model, key) in self._pending}
+        self.metrics.coalesced_embeddings += len(waiting)
+        fetch = [key for key in missing if key not in waiting]
+        text_of = dict(zip(hashes, texts))
+        if fetch:
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in fetch}
+            self._pending.update({(model, key): future for key, future in futures.items()})
+            try:
+                batches = [fetch[start : start + self.embed_batch] for start in range(0, len(fetch), self.embed_batch)]
+                results = await asyncio.gather(*(self.embed([text_of[key] for key in batch], model) for batch in batches))
+                fetched = np.array([vector for result in results for vector in result], dtype=np.float32)
+                if self.embed_cache is not None:
+                    self.embed_cache.store(model, fetch, fetched)
+                for key, vector in zip(fetch, fetched, strict=True):
+                    futures[key].set_result(vector)
+                    vectors[key] = vector
+            except Exception as exc:
+                for future in futures.values():
+                    future.set_exception(exc)
+                    future.exception()  # retrieved here so unawaited futures do not warn
+                raise
+            finally:
+                for key, future in futures.items():
+                    future.cancel()
+                    del self._pending[(model, key)]
+        orphaned: List[str] = []
+        for key, future in waiting.items():
+            try:
+                # Shielded so cancelling this caller does not cancel the owner's request.
+                vectors[key] = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Only our own cancellation propagates; if just the owning call was
+                # cancelled, request the vector again.
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                orphaned.append(key)
+        if orphaned:
+            refetched = await self.embed_matrix([text_of[key] for key in orphaned], model)
+            vectors.update(zip(orphaned, refetched))
+        if not hashes:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([vectors[key] for key in hashes]).astype(np.float32, copy=False)
+
+    async def _post(self, kind: str, path: str, body: Dict[str, Any], tokens: int) -> Dict[str, Any]:
+        import httpx
+
+        started = time.perf_counter()
+        status, detail = 0, ""
+        for attempt in range(1, self.max_retries + 2):
+            if self.requests is not None:
+                await self.requests.acquire(1)
+            if self.tokens is not None:
+                await self.tokens.acquire(tokens)
+            epoch = await self.concurrency.acquire()
+            throttled, wait = False, 0.0
+            try:
+                response = await self.http.post(path, json=body)
+                status, detail = response.status_code, response.text
+                throttled = retryable(status)
+                wait = _retry_after(response.headers)
+            except httpx.TransportError as exc:
+                status, detail = 0, repr(exc)
+                self.metrics.transport_errors += 1
+            finally:
+                await self.concurrency.release(epoch, throttled)
+
+            if status == 200:
+                payload = response.json()
+                used = int((payload.get("usage") or {}).get("total_tokens") or tokens)
+                if self.tokens is not None and used < tokens:
+                    self.tokens.refund(tokens - used)
+                self._record(kind, body, status, attempt, started, used)
+                return payload
+            if self.tokens is not None:
+                self.tokens.refund(tokens)
+            if status == 429:
+                self.metrics.throttled += 1
+            elif status >= 500:
+                self.metrics.server_errors += 1
+            if (status and not throttled) or attempt > self.max_retries:
+                self._record(kind, body, status, attempt, started, 0)
+                raise APIError(status, detail)
+            ceiling = min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+            await asyncio.sleep(max(wait, self._rng.uniform(0, ceiling)))
+        raise AssertionError("unreachable")
+
+    def _record(self, kind: str, body: Dict[str, Any], status: int, attempts: int, started: float, tokens: int) -> None:
+        self.metrics.records.append(
+            CallRecord(kind, body["model"], status, attempts, time.perf_counter() - started, tokens)
+        )
@@ -0,0 +1,72 @@
+import asyncio
+
+from orchestrator_py.evaluation.cache import CachedEvaluator, EvaluationCache
+from orchestrator_py.evaluation.scoring import ScoreVector
+from orchestrator_py.population import VersionCandidate
+
+
+class CountingEvaluator:
+    version = "counting-1"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def evaluate(self, candidate):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return ScoreVector(0.9, 0.9, 0.9, 0.9, 0.9, 0.9, 0.1)
+
+
+def candidate(identifier, artifact):
+    score = ScoreVector(0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5)
+    return VersionCandidate(identifier, [], "", score, 1.0, "pending", artifact=artifact)
+
+
+def test_identical_artifacts_are_scored_once_and_persist(tmp_path):
+    inner = CountingEvaluator()
+    evaluator = CachedEvaluator(inner, EvaluationCache(tmp_path, capacity=1))
+
+    async def scenario(evaluator):
+        return await asyncio.gather(
+            evaluator.evaluate(candidate("v1", "print(1)")),
+            evaluator.evaluate(candidate("v2", "print(1)")),
+            evaluator.evaluate(candidate("v3", "print(2)")),
+        )
+
+    scores = asyncio.run(scenario(evaluator))
+    assert inner.calls == 2
+    assert scores[0] == scores[1]
+    assert (evaluator.hits, evaluator.misses) == (1, 2)
+
+    # A fresh process-level cache still finds both results on disk.
+    rerun = CachedEvaluator(inner, EvaluationCache(tmp_path))
+    asyncio.run(scenario(rerun))
+    assert inner.calls == 2
+    assert rerun.disk_hits == 2
+    assert {metric["name"] for metric in rerun.metrics()} >= {"eval_cache_hits", "eval_cache_misses"}
+
+
+class MeasuringEvaluator(CountingEvaluator):
+    version = "measuring-1"
+
+    async def measure(self, candidate):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"performance": 0.9, "memory": 0.8}
+
+
+def test_cache_hits_keep_the_candidate_s_unmeasured_dimensions(tmp_path):
+    inner = MeasuringEvaluator()
+    first, second = candidate("v1", "print(1)"), candidate("v2", "print(1)")
+    second.score = second.score.replace(readability=0.1, security=0.2)
+
+    async def scenario(evaluator):
+        return await asyncio.gather(evaluator.evaluate(first), evaluator.evaluate(second))
+
+    # The second pass reads the measured dimensions back from disk.
+    for _ in range(2):
+        evaluator = CachedEvaluator(inner, EvaluationCache(tmp_path))
+        scores = asyncio.run(scenario(evaluator))
+        assert scores[0] == first.score.replace(performance=0.9, memory=0.8)
+        assert scores[1] == second.score.replace(performance=0.9, memory=0.8)
+    assert inner.calls == 1 and evaluator.disk_hits == 1
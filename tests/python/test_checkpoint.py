@@ -0,0 +1,88 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+from orchestrator_py.config import Mode, OrchestrateSpec, Settings
+from orchestrator_py.orchestrator import TournamentOrchestrator
+from orchestrator_py.storage.checkpoint import CheckpointError, checkpoint_path, read_checkpoint
+from orchestrator_py.util.events import EventEmitter, StreamSink
+
+
+class Crash(Exception):
+    pass
+
+
+class CrashingOrchestrator(TournamentOrchestrator):
+    def _save_checkpoint(self, population, iteration):
+        super()._save_checkpoint(population, iteration)
+        if iteration == 3:
+            raise Crash
+
+
+def run(directory, cls=TournamentOrchestrator, resume=False, variants=40, **options):
+    output = io.StringIO()
+    spec = OrchestrateSpec(
+        task="t", mode=Mode.GUARDED, variants=variants, seed=21, session_id="s",
+        checkpoint_dir=str(directory), resume=resume, **options,
+    )
+    emitter = EventEmitter(session_id="s", sink=StreamSink(output))
+    cls(spec, Settings(*([None] * 10)), emitter=emitter).run()
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_resume_continues_from_the_last_checkpoint(tmp_path):
+    run(tmp_path / "full")
+    with pytest.raises(Crash):
+        run(tmp_path / "crashed", cls=CrashingOrchestrator)
+    assert read_checkpoint(checkpoint_path(tmp_path / "crashed", "s")).iteration == 3
+
+    records = run(tmp_path / "crashed", resume=True)
+    iterations = [r["payload"] for r in records if r["type"] == "log" and r["payload"].startswith("Iteration")]
+    assert iterations == ["Iteration 4: evaluating candidates", "Iteration 5: evaluating candidates"]
+    assert records[-1]["payload"] == {"status": "done"}
+
+    full = read_checkpoint(checkpoint_path(tmp_path / "full", "s"))
+    resumed = read_checkpoint(checkpoint_path(tmp_path / "crashed", "s"))
+    assert resumed.iteration == full.iteration == 5
+    assert resumed.rng_state == full.rng_state
+    np.testing.assert_array_equal(resumed.population.scores, full.population.scores)
+    np.testing.assert_array_equal(resumed.population.cost_usd, full.population.cost_usd)
+    assert resumed.lineage.labels == full.lineage.labels
+
+
+def test_resume_keeps_spending_the_same_budget(tmp_path):
+    def final_metrics(records):
+        final = [record["payload"] for record in records if record["type"] == "metric"][-1]
+        return {metric["name"]: metric["value"] for metric in final}
+
+    options = {"racing": True, "budget_evaluations": 75}
+    full = final_metrics(run(tmp_path / "full", **options))
+    with pytest.raises(Crash):
+        run(tmp_path / "crashed", cls=CrashingOrchestrator, **options)
+    assert read_checkpoint(checkpoint_path(tmp_path / "crashed", "s")).racing["evaluations"] == 40 + 20 + 10
+
+    resumed = final_metrics(run(tmp_path / "crashed", resume=True, **options))
+    assert resumed["racing_evaluations"] == full["racing_evaluations"] == 75
+    assert resumed["racing_spent_usd"] == pytest.approx(full["racing_spent_usd"])
+
+
+def test_resume_rejects_a_checkpoint_from_another_tournament(tmp_path):
+    run(tmp_path)
+    with pytest.raises(CheckpointError):
+        run(tmp_path, resume=True, variants=41)
+
+
+def test_checkpoint_path_rejects_session_ids_that_escape_the_directory(tmp_path):
+    assert checkpoint_path(tmp_path, "a1-b_2") == (tmp_path / "a1-b_2.ckpt").resolve()
+    for session_id in ("../escape", "/etc/passwd", "a/b", "", ".."):
+        with pytest.raises(CheckpointError):
+            checkpoint_path(tmp_path, session_id)
+
+
+def test_checkpoint_directory_comes_from_the_environment(tmp_path, monkeypatch):
+    payload = {"task": "t", "mode": "SAFE", "variants": 4, "checkpointDir": "/tmp/elsewhere"}
+    assert OrchestrateSpec.from_request(payload, "s").checkpoint_dir is None
+    monkeypatch.setenv("ORCHESTRATOR_CHECKPOINT_DIR", str(tmp_path))
+    assert OrchestrateSpec.from_request(payload, "s").checkpoint_dir == str(tmp_path)
@@ -0,0 +1,61 @@
+import io
+import json
+import threading
+import time
+
+from orchestrator_py.util.events import BufferedSink, EventEmitter
+
+
+class SlowStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, text):
+        self.release.wait()
+        return super().write(text)
+
+
+def test_buffered_sink_coalesces_state_events_and_keeps_log_order():
+    stream = SlowStream()
+    sink = BufferedSink(stream, flush_interval=0.001, flush_records=1)
+    emitter = EventEmitter(session_id="s", sink=sink)
+
+    emitter.emit_log("first")
+    time.sleep(0.05)  # writer is now blocked on the slow consumer
+    for index in range(50):
+        emitter.emit_metrics([{"name": "step", "value": index}])
+        emitter.emit_log(f"log {index}")
+    emitter.emit_complete()
+    stream.release.set()
+    sink.close()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    logs = [record["payload"] for record in records if record["type"] == "log"]
+    metrics = [record["payload"] for record in records if record["type"] == "metric"]
+    assert logs == ["first"] + [f"log {index}" for index in range(50)]
+    assert metrics == [[{"name": "step", "value": 49}]]
+    assert records[-1]["type"] == "complete"
+    assert sink.coalesced == 49
+
+
+def test_buffered_sink_drops_graph_deltas_a_newer_keyframe_replaces():
+    stream = SlowStream()
+    sink = BufferedSink(stream, flush_interval=0.001, flush_records=1)
+    session, other = EventEmitter(session_id="s", sink=sink), EventEmitter(session_id="o", sink=sink)
+
+    session.emit_log("first")
+    time.sleep(0.05)  # writer is now blocked on the slow consumer
+    session.emit_graph({"seq": 0})
+    session.emit_graph_delta({"seq": 1, "baseSeq": 0})
+    other.emit_graph_delta({"seq": 7, "baseSeq": 6})
+    session.emit_graph_delta({"seq": 2, "baseSeq": 1})
+    session.emit_graph({"seq": 3})
+    session.emit_graph_delta({"seq": 4, "baseSeq": 3})
+    stream.release.set()
+    sink.close()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    graph = [(record["sessionId"], record["type"], record["payload"]["seq"]) for record in records[1:]]
+    assert graph == [("o", "graph_delta", 7), ("s", "graph", 3), ("s", "graph_delta", 4)]
+    assert sink.coalesced == 3
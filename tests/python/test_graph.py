@@ -0,0 +1,68 @@
+import numpy as np
+
+from orchestrator_py.graph import GraphDiffer
+from orchestrator_py.population import PopulationStore
+
+
+def apply_delta(state, delta):
+    assert state["seq"] == delta["baseSeq"]
+    nodes = {node["id"]: node for node in state["nodes"] if node["id"] not in delta["nodes"]["remove"]}
+    nodes.update({node["id"]: node for node in delta["nodes"]["upsert"]})
+    edges = {edge["id"]: edge for edge in state["edges"] if edge["id"] not in delta["edges"]["remove"]}
+    edges.update({edge["id"]: edge for edge in delta["edges"]["upsert"]})
+    leaderboard = delta.get("leaderboard", [node["id"] for node in state["leaderboard"]])
+    return {
+        "seq": delta["seq"],
+        "nodes": list(nodes.values()),
+        "edges": list(edges.values()),
+        "leaderboard": [nodes[node_id] for node_id in leaderboard],
+        "pareto": delta.get("pareto", state["pareto"]),
+        "metrics": delta["metrics"],
+    }
+
+
+def test_deltas_rebuild_the_same_state_as_snapshots():
+    rng = np.random.default_rng(11)
+    store = PopulationStore.random(200, rng)
+    differ = GraphDiffer(mode="SAFE", keyframe_interval=3)
+    event, state = differ.next_event(store, [])
+    assert event == "graph"
+
+    kinds = []
+    for iteration in range(6):
+        rows = rng.choice(len(store), size=20, replace=False)
+        store.scores[rows, 0] = rng.uniform(0, 1, size=20)
+        store.parent[rows[:2]] = (rows[:2] + 1) % len(store)
+        event, payload = differ.next_event(store, [])
+        kinds.append(event)
+        if event == "graph":
+            state = payload
+            continue
+        assert len(payload["nodes"]["upsert"]) <= 20
+        state = apply_delta(state, payload)
+
+        expected = GraphDiffer(mode="SAFE").snapshot(store, [])
+        by_id = lambda items: {item["id"]: item for item in items}
+        assert by_id(state["nodes"]) == by_id(expected["nodes"])
+        assert by_id(state["edges"]) == by_id(expected["edges"])
+        assert [node["id"] for node in state["leaderboard"]] == [node["id"] for node in expected["leaderboard"]]
+        assert state["pareto"] == expected["pareto"]
+
+    assert kinds == ["graph_delta"] * 3 + ["graph"] + ["graph_delta"] * 2
+
+
+def test_partials_covering_every_row_keep_the_pareto_front_current():
+    rng = np.random.default_rng(5)
+    store = PopulationStore.random(40, rng)
+    differ = GraphDiffer(mode="POWER")
+    _, state = differ.next_event(store, [])
+
+    store.mutate(rng)
+    for row in range(len(store)):
+        partial = differ.partial(store, [row])
+        state = apply_delta(state, {**partial, "metrics": []})
+    assert state["pareto"] == GraphDiffer(mode="POWER").pareto_ids(store)
+
+    event, payload = differ.next_event(store, [])
+    assert event == "graph_delta" and "pareto" not in payload
+    assert apply_delta(state, payload)["pareto"] == GraphDiffer(mode="POWER").pareto_ids(store)
@@ -0,0 +1,78 @@
+import io
+import json
+import time
+
+from orchestrator_py.config import MODE_MAX_ISLANDS, Mode, OrchestrateSpec, Settings
+from orchestrator_py.islands import IslandTournament, neighbours
+from orchestrator_py.orchestrator import create_tournament
+from orchestrator_py.scheduler import EvaluationScheduler
+from orchestrator_py.util.events import EventEmitter, StreamSink
+
+
+def test_neighbours_follow_the_topology():
+    assert neighbours(2, 3, "ring") == [0]
+    assert neighbours(1, 3, "full") == [0, 2]
+    assert neighbours(0, 1, "ring") == []
+
+
+def test_islands_stream_one_merged_graph_with_migrations():
+    output = io.StringIO()
+    spec = OrchestrateSpec(
+        task="t", mode=Mode.SAFE, variants=6, seed=3, session_id="s", evaluator="synthetic",
+        islands=3, migrants=1, topology="ring",
+    )
+    tournament = IslandTournament(spec, Settings(*([None] * 10)), emitter=EventEmitter("s", sink=StreamSink(output)))
+    tournament.run()
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert records[-1]["payload"] == {"status": "done"}
+    graphs = [record["payload"] for record in records if record["type"] in ("graph", "graph_delta")]
+    assert [graph["seq"] for graph in graphs] == list(range(5))
+    assert len(graphs[0]["nodes"]) == 18
+    assert {node["id"] for node in graphs[0]["nodes"]} >= {"i0-v1", "i2-v6"}
+    metrics = {metric["name"]: metric["value"] for metric in records[-3]["payload"]}
+    assert metrics["migrations"] > 0
+
+
+class CountingScheduler(EvaluationScheduler):
+    def __init__(self):
+        super().__init__(slots=2)
+        self.grants = 0
+
+    async def acquire(self, session_id, cost=0.0):
+        ticket = await super().acquire(session_id, cost)
+        self.grants += 1
+        return ticket
+
+
+def test_island_evaluations_take_scheduler_slots():
+    output = io.StringIO()
+    spec = OrchestrateSpec(
+        task="t", mode=Mode.SAFE, variants=4, seed=3, session_id="s", evaluator="synthetic", islands=2,
+    )
+    scheduler = CountingScheduler()
+    emitter = EventEmitter("s", sink=StreamSink(output))
+    create_tournament(spec, Settings(*([None] * 10)), emitter=emitter, scheduler=scheduler).run()
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert records[-1]["payload"] == {"status": "done"}
+    assert scheduler.grants == 2 * 4 * 4  # islands × candidates × iterations
+    assert scheduler._in_use == 0 and "s" not in scheduler._sessions
+
+
+def test_islands_past_their_deadline_are_terminated():
+    output = io.StringIO()
+    spec = OrchestrateSpec(task="t", mode=Mode.SAFE, variants=4, seed=3, session_id="s", islands=2)
+    emitter = EventEmitter("s", sink=StreamSink(output))
+    started = time.perf_counter()
+    IslandTournament(spec, Settings(*([None] * 10)), emitter=emitter, deadline=0.0).run()
+
+    assert time.perf_counter() - started < 5
+    record = json.loads(output.getvalue().splitlines()[-1])
+    assert record["type"] == "error" and "deadline" in record["payload"]
+
+
+def test_island_count_is_clamped_per_mode():
+    payload = {"task": "t", "mode": "SAFE", "variants": 4, "islands": 64}
+    assert OrchestrateSpec.from_request(payload, "s").islands == MODE_MAX_ISLANDS[Mode.SAFE]
+    assert OrchestrateSpec.from_request({**payload, "islands": -3}, "s").islands == 1
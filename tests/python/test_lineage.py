@@ -0,0 +1,40 @@
+import numpy as np
+
+from orchestrator_py.lineage import LineageStore
+
+
+def brute_ancestors(parents, node):
+    found, stack = set(), list(parents[node])
+    while stack:
+        current = stack.pop()
+        if current not in found:
+            found.add(current)
+            stack.extend(parents[current])
+    return found
+
+
+def test_ancestry_queries_match_a_brute_force_walk():
+    rng = np.random.default_rng(9)
+    lineage = LineageStore(capacity=4)
+    lineage.add_generation([f"v{row}" for row in range(50)], np.full(50, -1))
+    parents = {row: [] for row in range(50)}
+    for generation in range(20):
+        start = len(lineage)
+        single = rng.integers(0, start, size=30)
+        lineage.add_generation([f"g{generation}-{index}" for index in range(30)], single)
+        parents.update({start + index: [int(parent)] for index, parent in enumerate(single)})
+        crossover = lineage.add(f"x{generation}", [f"v{generation}", lineage.labels[start]])
+        parents[crossover] = [generation, start]
+
+    winner = len(lineage) - 1
+    assert set(lineage.ancestors([winner]).tolist()) == brute_ancestors(parents, winner)
+    assert set(lineage.descendants([3]).tolist()) == {n for n in parents if 3 in brute_ancestors(parents, n)}
+    other = len(lineage) - 5
+    common = brute_ancestors(parents, winner) & brute_ancestors(parents, other)
+    assert set(lineage.common_ancestors([winner, other]).tolist()) == common
+    lowest = {node for node in common if not any(node in brute_ancestors(parents, c) for c in common)}
+    assert set(lineage.lowest_common_ancestors([winner, other]).tolist()) == lowest
+
+    subgraph = lineage.subgraph([winner], depth=1)
+    assert set(subgraph["nodes"]) == {lineage.labels[n] for n in [winner, *parents[winner]]}
+    assert {edge["target"] for edge in subgraph["edges"]} == {lineage.labels[winner]}
@@ -0,0 +1,105 @@
+import asyncio
+import io
+import json
+import tracemalloc
+
+from orchestrator_py.config import Mode, OrchestrateSpec, Settings
+from orchestrator_py.orchestrator import TournamentOrchestrator
+from orchestrator_py.util.events import EventEmitter, StreamSink
+from orchestrator_py.util.tracing import Tracer
+
+
+class SlowEvaluator:
+    version = "test"
+
+    def __init__(self, slow_ids=()):
+        self.slow_ids = set(slow_ids)
+        self.active = 0
+        self.peak = 0
+
+    async def evaluate(self, candidate):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(5 if candidate.identifier in self.slow_ids else 0.01)
+            return candidate.score
+        finally:
+            self.active -= 1
+
+
+def make_orchestrator(evaluator, variants=6, timeout=None):
+    output = io.StringIO()
+    spec = OrchestrateSpec(
+        task="t", mode=Mode.SAFE, variants=variants, seed=5, session_id="s", evaluation_timeout=timeout
+    )
+    emitter = EventEmitter(session_id="s", sink=StreamSink(output))
+    orchestrator = TournamentOrchestrator(spec, Settings(*([None] * 10)), emitter=emitter, evaluator=evaluator)
+    return orchestrator, output
+
+
+def events(output):
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_evaluations_respect_mode_concurrency_and_timeouts():
+    evaluator = SlowEvaluator(slow_ids={"v2"})
+    orchestrator, output = make_orchestrator(evaluator, timeout=0.1)
+    orchestrator.run()
+
+    assert evaluator.peak == orchestrator.spec.concurrency == 2
+    records = events(output)
+    assert records[-1]["payload"] == {"status": "done"}
+    assert any(record["type"] == "log" and "v2 timeout" in record["payload"] for record in records)
+    streamed = [record for record in records if record["type"] == "graph_delta" and "metrics" not in record["payload"]]
+    assert len(streamed) == 6 * 5
+
+
+def test_cancel_stops_the_tournament():
+    evaluator = SlowEvaluator(slow_ids={"v1", "v2", "v3"})
+    orchestrator, output = make_orchestrator(evaluator)
+
+    async def scenario():
+        run = asyncio.ensure_future(orchestrator.run_async())
+        await asyncio.sleep(0.05)
+        orchestrator.cancel()
+        await run
+
+    asyncio.run(scenario())
+    assert events(output)[-1]["payload"] == {"status": "cancelled"}
+    assert evaluator.active == 0
+
+
+def test_trace_events_and_final_profile():
+    orchestrator, output = make_orchestrator(SlowEvaluator())
+    orchestrator.spec.trace = True
+    orchestrator.spec.profile = True
+    orchestrator.run()
+
+    traces = [record["payload"] for record in events(output) if record["type"] == "trace"]
+    spans = {span["name"] for trace in traces[:-1] for span in trace["spans"]}
+    assert {"initial_population", "iteration/mutate", "iteration/evaluate", "iteration/graph"} <= spans
+    profile = traces[-1]["profile"]
+    assert profile["spans"]["iteration"]["count"] == 5
+    assert profile["counters"]["evaluations.scored"] == 6 * 5
+    assert profile["events"]["graph_delta"] > 0 and "encodeMs" in profile["sink"]
+    assert isinstance(profile["samples"], dict)
+    assert events(output)[-1]["type"] == "complete"
+
+
+def test_tracing_is_off_by_default():
+    orchestrator, output = make_orchestrator(SlowEvaluator())
+    orchestrator.run()
+    assert not [record for record in events(output) if record["type"] == "trace"]
+
+
+def test_overlapping_allocation_tracers_share_tracemalloc():
+    def tracer():
+        return Tracer(EventEmitter(session_id="s", sink=StreamSink(io.StringIO())), allocations=True)
+
+    first, second = tracer(), tracer()
+    first.finish()
+    assert tracemalloc.is_tracing()
+    with second.span("still_traced"):
+        pass
+    second.finish()
+    assert not tracemalloc.is_tracing()
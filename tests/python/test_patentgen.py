@@ -0,0 +1,440 @@
+import asyncio
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+SCRIPTS = Path(__file__).resolve().parents[2] / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+from patentgen.embed_cache import EmbeddingCache, text_hash  # noqa: E402
+from patentgen.llm import AsyncOpenAIClient, TokenBucket  # noqa: E402
+
+PROBE = """
+import json, sys
+sys.path.insert(0, {scripts!r})
+import mega_patent_generator
+print(json.dumps([name for name in ("numpy", "faiss", "openai", "requests", "httpx") if name in sys.modules]))
+"""
+
+
+def test_import_has_no_side_effects(tmp_path):
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(scripts=str(SCRIPTS))],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert json.loads(result.stdout) == []
+    assert list(tmp_path.iterdir()) == []
+
+
+class FakeOpenAI(ThreadingHTTPServer):
+    """Local stand-in for the OpenAI API that throttles its first ``failures`` requests
+    and leaves ``drop`` vectors out of every embeddings response."""
+
+    def __init__(self, failures: int = 0, delay: float = 0.0, drop: int = 0) -> None:
+        super().__init__(("127.0.0.1", 0), FakeHandler)
+        self.failures = failures
+        self.delay = delay
+        self.drop = drop
+        self.requests = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests += 1
+            throttle = server.requests <= server.failures
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+        time.sleep(server.delay)
+        if throttle:
+            status, payload = (429, {"error": "slow down"}) if server.requests % 2 else (503, {"error": "busy"})
+        elif self.path.endswith("/embeddings"):
+            status = 200
+            data = [{"index": i, "embedding": [float(len(text)), 1.0]} for i, text in enumerate(body["input"])]
+            data = data[: len(data) - server.drop]
+            payload = {"data": data[::-1], "usage": {"total_tokens": 3}}
+        else:
+            status = 200
+            text = json.dumps({"ideas": [{"title": body["input"]}]})
+            payload = {"output": [{"content": [{"type": "output_text", "text": text}]}], "usage": {"total_tokens": 7}}
+        with server.lock:
+            server.in_flight -= 1
+        encoded = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        if status == 429:
+            self.send_header("retry-after-ms", "5")
+        self.end_headers()
+        self.wfile.write(encoded)
+
+
+@pytest.fixture
+def fake_openai(request):
+    server = FakeOpenAI(**getattr(request, "param", {}))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server, **kwargs):
+    options = {"api_key": "test", "base_url": server.url, "backoff_base": 0.01, "requests_per_minute": None, "tokens_per_minute": None}
+    return AsyncOpenAIClient(**{**options, **kwargs})
+
+
+@pytest.mark.parametrize("fake_openai", [{"failures": 4}], indirect=True)
+def test_client_retries_throttling_and_backs_off_concurrency(fake_openai):
+    async def run():
+        async with _client(fake_openai, initial_concurrency=8) as client:
+            first = await client.respond_json("m", "hello", {}, temperature=1.0, top_p=1.0)
+            vectors = await client.embed(["a", "bbb"])
+            return client, first, vectors
+
+    client, first, vectors = asyncio.run(run())
+    assert first == {"ideas": [{"title": "hello"}]}
+    assert vectors == [[1.0, 1.0], [3.0, 1.0]]
+    summary = client.metrics.summary()
+    assert summary["kinds"]["responses"]["retries"] == 4
+    assert summary["throttled"] == 2 and summary["server_errors"] == 2
+    assert summary["kinds"]["responses"]["latency_max_s"] > 0
+    assert client.concurrency.decreases == 4 and client.concurrency.limit < 8
+
+
+@pytest.mark.parametrize("fake_openai", [{"delay": 0.02}], indirect=True)
+def test_client_caps_in_flight_calls(fake_openai):
+    async def run():
+        async with _client(fake_openai, initial_concurrency=3, max_concurrency=3) as client:
+            await asyncio.gather(*(client.embed([str(i)]) for i in range(12)))
+
+    asyncio.run(run())
+    assert fake_openai.requests == 12
+    assert fake_openai.peak <= 3
+
+
+@pytest.mark.parametrize("fake_openai", [{"delay": 0.01}], indirect=True)
+def test_client_serves_successive_event_loops(fake_openai):
+    client = _client(fake_openai, initial_concurrency=2)
+
+    async def run():
+        vectors = await asyncio.gather(*(client.embed([str(i)]) for i in range(4)))
+        await client.aclose()
+        return vectors
+
+    assert asyncio.run(run()) == asyncio.run(run())
+    assert fake_openai.requests == 8
+
+
+@pytest.mark.parametrize("fake_openai", [{"drop": 1, "delay": 0.05}], indirect=True)
+def test_embed_matrix_fails_every_waiter_on_a_short_response(fake_openai):
+    async def run(client):
+        return await asyncio.gather(
+            client.embed_matrix(["a", "bb"]), client.embed_matrix(["bb"]), return_exceptions=True
+        )
+
+    async def scenario():
+        async with _client(fake_openai) as client:
+            return client, await run(client)
+
+    client, results = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert not client._pending
+
+
+def test_token_bucket_reserves_ahead_and_refunds():
+    now = [0.0]
+    bucket = TokenBucket(per_minute=60, burst=2, clock=lambda: now[0])
+    assert bucket.reserve(2) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    bucket.refund(1)
+    now[0] = 1.0
+    assert bucket.reserve(1) == 0.0
+
+
+
+def test_embedding_cache_persists_and_survives_a_torn_append(tmp_path):
+    keys = [text_hash(text) for text in ("a", "b", "c")]
+    EmbeddingCache(tmp_path).store("m/1", keys[:2], np.array([[1, 2], [3, 4]]))
+    with open(tmp_path / "m_1.f32", "ab") as handle:
+        handle.write(b"\0" * 6)  # a writer died mid-row
+    cache = EmbeddingCache(tmp_path)
+    cache.store("m/1", keys[1:], np.array([[9, 9], [5, 6]]))
+    vectors, missing = EmbeddingCache(tmp_path).lookup("m/1", keys + [text_hash("d")])
+    assert missing == [text_hash("d")]
+    assert [vectors[key].tolist() for key in keys] == [[1, 2], [3, 4], [5, 6]]
+
+
+def test_embed_matrix_requests_only_uncached_texts_once(fake_openai, tmp_path):
+    async def run(client, batches):
+        return await asyncio.gather(*(client.embed_matrix(texts) for texts in batches))
+
+    async def first():
+        async with _client(fake_openai, embed_cache=EmbeddingCache(tmp_path), embed_batch=2) as client:
+            return client, await run(client, [["x", "yy", "x"], ["yy"], ["zzz"]])
+
+    client, (matrix, single, other) = asyncio.run(first())
+    assert matrix.tolist() == [[1, 1], [2, 1], [1, 1]] and single.tolist() == [[2, 1]]
+    assert fake_openai.requests == 2
+    assert client.metrics.coalesced_embeddings == 1
+
+    async def second():
+        async with _client(fake_openai, embed_cache=EmbeddingCache(tmp_path)) as client:
+            return client, await run(client, [["zzz", "x", "yy"]])
+
+    client, (matrix,) = asyncio.run(second())
+    assert matrix.tolist() == [[3, 1], [1, 1], [2, 1]]
+    assert fake_openai.requests == 2 and client.metrics.cached_embeddings == 3
+
+@pytest.mark.parametrize("fake_openai", [{"delay": 0.1}], indirect=True)
+def test_embed_matrix_waiters_survive_the_owning_call_being_cancelled(fake_openai):
+    async def run():
+        async with _client(fake_openai) as client:
+            owner = asyncio.create_task(client.embed_matrix(["abc"]))
+            await asyncio.sleep(0.03)
+            waiter = asyncio.create_task(client.embed_matrix(["abc"]))
+            await asyncio.sleep(0.03)
+            owner.cancel()
+            matrix = await waiter
+            return owner.cancelled(), matrix, client.metrics.coalesced_embeddings
+
+    cancelled, matrix, coalesced = asyncio.run(run())
+    assert cancelled and matrix.tolist() == [[3, 1]] and coalesced == 1
+    assert fake_openai.requests == 2
+
+
+class FakePipelineClient:
+    """In-process ``OpenAIClient`` stand-in that records when each kind of call runs."""
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.events = []
+        self.in_flight = {}
+        self.peak_per_idea = 0
+        self.embedded = []
+
+    async def embed_matrix(self, texts):
+        self.embedded.append(list(texts))
+        vectors = []
+        for text in texts:
+            seed = int(hashlib.sha256(text.encode()).hexdigest()[:16], 16)
+            vectors.append(np.random.default_rng(seed).standard_normal(64))
+        return np.array(vectors, dtype=np.float32)
+
+    async def respond_json(self, model, prompt, schema, temperature, top_p, max_tokens=6000):
+        if schema is self.generator.IDEA_SCHEMA:
+            await asyncio.sleep(0.01 + 0.02 * self.generator.DIVERGENT_TEMPS.index(temperature))
+            self.events.append(("idea", time.perf_counter()))
+            tag = f"{prompt[:20]}-{temperature}-{top_p}-{len(self.events)}"
+            return {
+                "ideas": [
+                    {"title": f"{tag}-{n}", "thesis": "t", "mechanism": f"temporal {tag} {n}", "validation_plan": "v"}
+                    for n in range(3)
+                ]
+                + [{"title": "same", "thesis": "t", "mechanism": "same spectral temporal", "validation_plan": "v"}]
+            }
+        title = prompt.split("TITLE: ")[1].split("\n")[0]
+        self.in_flight[title] = self.in_flight.get(title, 0) + 1
+        self.peak_per_idea = max(self.peak_per_idea, self.in_flight[title])
+        self.events.append(("legal", time.perf_counter()))
+        await asyncio.sleep(0.02)
+        self.in_flight[title] -= 1
+        if schema is self.generator.CLAIMS_SCHEMA:
+            return {"independent_claims": [], "dependent_claims": [], "claim_element_map": {}}
+        return {"sections": []}
+
+
+def test_pipeline_overlaps_stages_and_drafts_claims_with_description(tmp_path, monkeypatch):
+    import mega_patent_generator as generator
+
+    monkeypatch.chdir(tmp_path)
+    client = FakePipelineClient(generator)
+    monkeypatch.setattr(generator, "oai", lambda: client)
+
+    async def run():
+        corpus = [{"id": str(i), "text": f"document {i}"} for i in range(10)]
+        index, matrix = await generator.build_faiss([doc["text"] for doc in corpus])
+        return await generator.stream_pipeline(index, matrix, corpus, generator.MANIFEST["seed_queries"])
+
+    claims, dtds = asyncio.run(run())
+    assert len(claims) == len(dtds) == generator.MAX_LEGALIZE
+    assert client.embedded.count(generator.MANIFEST["seed_queries"]) == 1
+    assert sum(text in generator.MANIFEST["seed_queries"] for texts in client.embedded for text in texts) == 6
+    assert client.peak_per_idea == 2
+    # Legalization starts while later prompts are still generating ideas.
+    first_legal = min(stamp for kind, stamp in client.events if kind == "legal")
+    last_idea = max(stamp for kind, stamp in client.events if kind == "idea")
+    assert first_legal < last_idea
+    assert len(client.embedded) > 2
+    kept = json.loads((generator.OUT / "divergent_ideas.json").read_text())
+    # Mutations of a kept idea either extend its mechanism or add a circumvention risk.
+    originals = [
+        idea for idea in kept if idea["mechanism"] == "same spectral temporal" and "risk_circumvention" not in idea
+    ]
+    assert len(originals) == 1
+
+
+def test_select_snippets_dedupes_documents_across_queries():
+    import mega_patent_generator as generator
+
+    a, b, c, d = ({"id": name, "text": name} for name in "abcd")
+    hits = {"q1": [a, b, c], "q2": [b, a, d], "q3": [a]}
+    assert generator.select_snippets(hits, ["q1", "q2", "q3"], per_query=2) == [a, b, d]
+
+
+@pytest.mark.parametrize("backend", ["numpy", "faiss"])
+def test_dedup_engine_matches_pairwise_greedy_filter(backend):
+    from patentgen.dedup import DedupEngine
+
+    rng = np.random.default_rng(3)
+    centres = rng.standard_normal((60, 32))
+    vectors = (centres[rng.integers(0, 60, 500)] + 0.2 * rng.standard_normal((500, 32))).astype(np.float32)
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = []
+    for row in range(len(unit)):
+        if all(float(unit[row] @ unit[kept]) <= 0.92 for kept in expected):
+            expected.append(row)
+
+    engine = DedupEngine(0.92, block_size=64, backend=backend)
+    admitted = engine.add(vectors[:200]) + [200 + row for row in engine.add(vectors[200:])]
+    assert admitted == expected
+    assert engine.cluster_sizes().sum() == len(vectors)
+    assert engine.report()["rejected"] == len(vectors) - len(expected)
+    assert DedupEngine(0.92, block_size=64, backend=backend).add(vectors, limit=10) == expected[:10]
+
+
+class FakeWeb(ThreadingHTTPServer):
+    """Local stand-in for corpus sources: ETag-versioned pages and a JSON search endpoint."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), FakeWebHandler)
+        self.hits = []
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+
+class FakeWebHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=b"", etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits.append((self.path, self.headers.get("If-None-Match")))
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+        time.sleep(0.03)
+        with server.lock:
+            server.in_flight -= 1
+        if self.headers.get("If-None-Match") == '"v1"':
+            self._reply(304, etag='"v1"')
+        else:
+            self._reply(200, f"<html><body><p>{self.path}</p></body></html>".encode(), etag='"v1"')
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.hits.append((self.path, None))
+        self._reply(200, json.dumps({"echo": json.loads(body)}).encode())
+
+
+@pytest.fixture
+def fake_web():
+    server = FakeWeb()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetcher_caches_revalidates_and_coalesces(fake_web, tmp_path):
+    from patentgen.fetch import Fetcher
+
+    page = fake_web.url("/page/1")
+
+    async def run(max_age):
+        async with Fetcher(tmp_path, max_age=max_age) as fetcher:
+            results = await asyncio.gather(fetcher.get(page), fetcher.get(page), fetcher.get(page))
+            posted = await fetcher.post_json(fake_web.url("/api"), {"q": 1})
+            text = (await fetcher.extract_many([results[0].text]))[0]
+            return fetcher.stats, results[0], posted.json(), text
+
+    stats, first, posted, text = asyncio.run(run(0))
+    assert stats["network"] == 2 and stats["coalesced"] == 2
+    assert not first.from_cache and posted == {"echo": {"q": 1}} and "/page/1" in text
+
+    stats, again, _, _ = asyncio.run(run(0))
+    assert again.revalidated and again.body == first.body and stats["not_modified"] == 1
+    assert fake_web.hits.count(("/page/1", '"v1"')) == 1
+
+    stats, fresh, _, _ = asyncio.run(run(3600))
+    # Cache reads run in threads, so concurrent fresh hits coalesce too.
+    assert stats["network"] == 0 and stats["cache_fresh"] == 2 and stats["coalesced"] == 2
+    assert fresh.body == first.body
+
+
+def test_fetcher_waiters_refetch_when_the_owning_request_is_cancelled(fake_web, tmp_path):
+    from patentgen.fetch import Fetcher
+
+    async def run():
+        async with Fetcher(tmp_path) as fetcher:
+            owner = asyncio.create_task(fetcher.get(fake_web.url("/page/2")))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.create_task(fetcher.get(fake_web.url("/page/2")))
+            await asyncio.sleep(0.005)
+            owner.cancel()
+            return owner, await waiter
+
+    owner, result = asyncio.run(run())
+    assert owner.cancelled() and result.ok and "/page/2" in result.text
+
+
+def test_fetcher_limits_requests_per_host(fake_web, tmp_path):
+    from patentgen.fetch import Fetcher, dedupe_by_id
+
+    async def run():
+        async with Fetcher(tmp_path, per_host=2) as fetcher:
+            return await asyncio.gather(*(fetcher.get(fake_web.url(f"/page/{n}")) for n in range(8)))
+
+    assert all(result.ok for result in asyncio.run(run()))
+    assert fake_web.peak == 2
+    docs = [{"id": "a", "text": "1"}, {"id": "b", "text": "2"}, {"id": "a", "text": "3"}]
+    assert dedupe_by_id(docs) == docs[:2]
@@ -0,0 +1,21 @@
+import numpy as np
+
+from orchestrator_py.population import PopulationStore
+
+
+def test_mutation_clamps_scores_and_ranks_by_composite():
+    rng = np.random.default_rng(7)
+    store = PopulationStore.random(1000, rng)
+    for _ in range(5):
+        store.mutate(rng)
+    order = store.rank()
+
+    assert store.scores.dtype == np.float32
+    assert store.scores.min() >= 0.0 and store.scores.max() <= 1.0
+    assert store.cost_usd.min() >= 0.1
+    composite = store.composite()
+    assert np.all(np.diff(composite[order]) <= 0)
+
+    best = next(store.candidates())
+    assert best.identifier == f"v{order[0] + 1}"
+    assert abs(best.score.composite - float(composite[order[0]])) < 1e-5
@@ -0,0 +1,52 @@
+import io
+import json
+
+import numpy as np
+
+from orchestrator_py.config import Mode, OrchestrateSpec, Settings
+from orchestrator_py.orchestrator import TournamentOrchestrator
+from orchestrator_py.population import STATUS_CODES, PopulationStore
+from orchestrator_py.racing import SuccessiveHalving
+from orchestrator_py.util.events import EventEmitter, StreamSink
+
+
+def test_promotion_keeps_the_best_fraction_and_prunes_the_rest():
+    population = PopulationStore.random(8, np.random.default_rng(0))
+    race = SuccessiveHalving(8, iterations=3, eta=2.0)
+    assert len(race.charge(population, race.promote(population, 1))) == 8
+
+    survivors = race.promote(population, 2)
+    assert len(survivors) == 4
+    assert set(survivors.tolist()) == set(population.rank()[:4].tolist())
+    assert (population.status == STATUS_CODES["pruned"]).sum() == 4
+
+
+def test_usd_budget_pays_for_the_best_candidates_it_can_afford():
+    population = PopulationStore.random(6, np.random.default_rng(1))
+    population.cost_usd[:] = 1.0
+    race = SuccessiveHalving(6, iterations=2, eta=1.0, budget_usd=8.0)
+    assert len(race.charge(population, race.promote(population, 1))) == 6
+
+    paid = race.charge(population, race.promote(population, 2))
+    assert set(paid.tolist()) == set(population.rank()[:2].tolist())
+    metrics = {metric["name"]: metric["value"] for metric in race.metrics()}
+    assert metrics["racing_spent_usd"] == 8.0
+    assert metrics["racing_evaluations_saved"] == 4
+    assert metrics["racing_saved_usd"] == 4.0
+
+
+def test_racing_tournament_reports_savings_in_final_metrics():
+    output = io.StringIO()
+    spec = OrchestrateSpec(
+        task="t", mode=Mode.SAFE, variants=16, seed=2, session_id="s", racing=True, budget_evaluations=30
+    )
+    TournamentOrchestrator(spec, Settings(*([None] * 10)), emitter=EventEmitter("s", sink=StreamSink(output))).run()
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert records[-1]["payload"] == {"status": "done"}
+    final = [record["payload"] for record in records if record["type"] == "metric"][-1]
+    metrics = {metric["name"]: metric["value"] for metric in final}
+    # 16 + 8 + 4 evaluations fit the budget; the next rung's 2 do not.
+    assert metrics["racing_evaluations"] == 30
+    assert metrics["racing_evaluations_saved"] == 16 * 5 - 30
+    assert metrics["racing_pruned"] == 15
@@ -0,0 +1,29 @@
+import numpy as np
+
+from orchestrator_py.ranking import Leaderboard, pareto_front
+
+
+def test_leaderboard_tracks_updates_like_a_stable_sort():
+    rng = np.random.default_rng(3)
+    keys = np.round(rng.uniform(0, 1, size=1000), 2)  # plenty of ties
+    board = Leaderboard(keys)
+    for _ in range(200):
+        row = int(rng.integers(len(keys)))
+        keys[row] = round(float(rng.uniform(0, 1.2)), 2)
+        board.update(row, keys[row])
+    assert board.top(5) == np.argsort(-keys, kind="stable")[:5].tolist()
+    assert Leaderboard(keys[:3]).top(5) == np.argsort(-keys[:3], kind="stable").tolist()
+
+
+def test_pareto_front_matches_brute_force():
+    rng = np.random.default_rng(4)
+    scores = rng.uniform(0, 1, size=(3000, 7)).astype(np.float32)
+    scores[:, 0] = np.round(scores[:, 0], 1)
+    scores[-1] = scores[0]  # duplicates are both kept or both dropped
+    oriented = scores.astype(np.float64) * np.array([1, 1, 1, 1, 1, 1, -1])
+    expected = [
+        row
+        for row in range(len(scores))
+        if not ((oriented >= oriented[row]).all(axis=1) & (oriented > oriented[row]).any(axis=1)).any()
+    ]
+    assert pareto_front(scores, block=256).tolist() == expected
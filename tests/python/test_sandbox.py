@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+import pytest
+
+from orchestrator_py.evaluation.sandbox import WORKER_ENVIRONMENT, SandboxEvaluator, SandboxLimits
+from orchestrator_py.evaluation.scoring import ScoreVector
+from orchestrator_py.population import VersionCandidate
+
+PASSING = "def test_one():\n    assert 1 + 1 == 2\n\ndef test_two():\n    assert 1 + 1 == 3\n"
+SPINNING = "while True:\n    pass\n"
+
+
+def candidate(artifact):
+    score = ScoreVector(0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5)
+    return VersionCandidate("v1", [], "", score, 1.0, "pending", artifact=artifact)
+
+
+def test_sandbox_scores_tests_and_enforces_cpu_limit():
+    limits = SandboxLimits(cpu_seconds=0.5, wall_seconds=10, tasks_per_worker=1)
+    evaluator = SandboxEvaluator(workers=1, limits=limits)
+
+    async def scenario():
+        return (
+            await evaluator.evaluate(candidate(PASSING)),
+            await evaluator.evaluate(candidate(SPINNING)),
+        )
+
+    try:
+        passing, spinning = asyncio.run(scenario())
+    finally:
+        evaluator.close()
+
+    assert passing.tests == passing.correctness == 0.5
+    assert 0 < passing.memory < 1 and passing.performance > 0.9
+    assert spinning.correctness == spinning.performance == 0.0
+    assert evaluator.recycled == 2 and evaluator.failures == 1
+
+
+def test_workers_run_with_a_scrubbed_environment(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "secret")
+    evaluator = SandboxEvaluator(workers=1)
+    source = f"import os\n\ndef test_environment():\n    assert set(os.environ) <= {set(WORKER_ENVIRONMENT)!r}\n"
+    try:
+        measurement = asyncio.run(evaluator.run(source))
+    finally:
+        evaluator.close()
+    assert measurement["tests_passed"] == measurement["tests_total"] == 1
+
+
+def test_close_after_cancellation_joins_the_worker_thread():
+    evaluator = SandboxEvaluator(workers=1, limits=SandboxLimits(wall_seconds=30))
+
+    async def scenario():
+        task = asyncio.ensure_future(evaluator.run("import time\ntime.sleep(20)\n"))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    started = time.perf_counter()
+    evaluator.close()
+    assert time.perf_counter() - started < 5
+    assert evaluator._idle == [] and not evaluator._busy
+    with pytest.raises(RuntimeError):
+        asyncio.run(evaluator.run("pass"))
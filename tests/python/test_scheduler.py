@@ -0,0 +1,49 @@
+import asyncio
+
+from orchestrator_py.config import Mode
+from orchestrator_py.scheduler import EvaluationScheduler
+
+
+async def run_requests(scheduler, requests, hold=0.005):
+    granted, active, peak = [], {"now": 0}, {"value": 0}
+
+    async def request(session_id, cost):
+        async with scheduler.slot(session_id, cost):
+            granted.append(session_id)
+            active["now"] += 1
+            peak["value"] = max(peak["value"], active["now"])
+            await asyncio.sleep(hold)
+            active["now"] -= 1
+
+    await asyncio.gather(*(request(session_id, cost) for session_id, cost in requests))
+    return granted, peak["value"]
+
+
+def test_weighted_fair_queuing_keeps_safe_sessions_moving():
+    scheduler = EvaluationScheduler(slots=1)
+    scheduler.register("power", Mode.POWER)
+    scheduler.register("safe", Mode.SAFE)
+    requests = [("power", 0.0)] * 12 + [("safe", 0.0)] * 3
+    granted, _ = asyncio.run(run_requests(scheduler, requests))
+
+    safe_positions = [index for index, session in enumerate(granted) if session == "safe"]
+    # POWER has four times SAFE's weight: one SAFE grant per ~four POWER grants.
+    assert safe_positions == [5, 10, 14]
+    metrics = {metric["name"]: metric["value"] for metric in scheduler.metrics("safe")}
+    assert metrics["scheduler_queue_depth"] == 0 and metrics["scheduler_peak_queue_depth"] >= 12
+    # The session's own peak counts only its requests, not the POWER backlog.
+    assert metrics["scheduler_session_peak_queue_depth"] == 3
+    assert metrics["scheduler_max_wait_ms"] > 0
+
+
+def test_mode_slot_and_cost_quotas_cap_in_flight_work():
+    scheduler = EvaluationScheduler(slots=16, slot_quota={mode: 2 for mode in Mode})
+    scheduler.register("a", Mode.POWER)
+    scheduler.register("b", Mode.POWER)
+    _, peak = asyncio.run(run_requests(scheduler, [("a", 0.0), ("b", 0.0)] * 4))
+    assert peak == 2
+
+    scheduler = EvaluationScheduler(slots=16, cost_quota={mode: 1.0 for mode in Mode})
+    scheduler.register("a", Mode.SAFE)
+    _, peak = asyncio.run(run_requests(scheduler, [("a", 0.6)] * 4))
+    assert peak == 1
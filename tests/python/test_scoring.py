@@ -1,4 +1,7 @@
-from orchestrator_py.evaluation.scoring import ScoreVector
+import numpy as np
+import pytest
+
+from orchestrator_py.evaluation.scoring import SCORE_DIMENSIONS, ScoreVector, composite_batch, resolve_weights
 
 
 def test_composite_score_balances_dimensions():
@@ -13,3 +16,31 @@ def test_composite_score_balances_dimensions():
     )
     composite = vector.composite
     assert 0 < composite < 1
+
+
+def test_composite_is_cached_until_a_dimension_changes():
+    vector = ScoreVector(0.8, 0.9, 0.7, 0.6, 0.5, 0.4, 0.3)
+    before = vector.composite
+    vector.correctness = 0.3
+    assert vector.composite == pytest.approx(before - 0.5 * 0.4)
+    assert vector.replace(correctness=0.8).composite == pytest.approx(before)
+    assert vector.to_dict()["correctness"] == 0.3
+
+
+def test_composite_batch_matches_vectors_under_session_weights():
+    weights = resolve_weights({"cost": -1.0, "security": 0.0})
+    scores = np.random.default_rng(0).uniform(size=(5, len(SCORE_DIMENSIONS)))
+    batch = composite_batch(scores, weights)
+    vectors = [ScoreVector(*row, weights=weights) for row in scores.tolist()]
+    np.testing.assert_allclose(batch, [vector.composite for vector in vectors])
+    with pytest.raises(ValueError):
+        resolve_weights({"speed": 1.0})
+
+
+def test_values_are_read_only_and_weights_invalidate_the_composite():
+    vector = ScoreVector(0.8, 0.9, 0.7, 0.6, 0.5, 0.4, 0.3)
+    before = vector.composite
+    with pytest.raises(ValueError):
+        vector.values[0] = 0.0
+    vector.weights = resolve_weights({"correctness": 0.0})
+    assert vector.composite == pytest.approx(before - 0.8 * 0.4)
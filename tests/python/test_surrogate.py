@@ -0,0 +1,48 @@
+import io
+import json
+
+import numpy as np
+
+from orchestrator_py.config import Mode, OrchestrateSpec, Settings
+from orchestrator_py.evaluation.evaluator import SyntheticEvaluator
+from orchestrator_py.evaluation.surrogate import SurrogateScreen, features
+from orchestrator_py.orchestrator import TournamentOrchestrator
+from orchestrator_py.population import PopulationStore
+from orchestrator_py.util.events import EventEmitter, StreamSink
+
+
+def test_screen_learns_composites_and_skips_confidently_bad_rows():
+    rng = np.random.default_rng(0)
+    population = PopulationStore.random(64, rng)
+    rows = np.arange(64)
+    observed = population.composite() + rng.normal(0, 0.01, size=64)
+    screen = SurrogateScreen(warmup=32, audit_every=1000)
+    screen.observe(features(population, rows[:32]), observed[:32])
+    assert screen.screen(population, rows, cutoff=1.0)[1].size == 0  # still warming up
+
+    screen.observe(features(population, rows[32:]), observed[32:])
+    mean, std = screen.predict(features(population, rows))
+    np.testing.assert_allclose(mean, population.composite(), atol=0.05)
+
+    cutoff = float(np.sort(population.composite())[-5])
+    keep, skipped = screen.screen(population, rows, cutoff)
+    assert set(np.flatnonzero(population.composite() >= cutoff)) <= set(keep.tolist())
+    assert len(skipped) > 32
+    assert screen.metrics()[1] == {"name": "surrogate_evaluations_avoided", "value": float(len(skipped))}
+
+
+def test_surrogate_session_reports_avoided_evaluations_and_hit_rate():
+    output = io.StringIO()
+    spec = OrchestrateSpec(task="t", mode=Mode.POWER, variants=100, seed=1, session_id="s", surrogate=True)
+    orchestrator = TournamentOrchestrator(
+        spec, Settings(*([None] * 10)), emitter=EventEmitter("s", sink=StreamSink(output)),
+        evaluator=SyntheticEvaluator(latency=0),
+    )
+    orchestrator.run()
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    final = [record["payload"] for record in records if record["type"] == "metric"][-1]
+    metrics = {metric["name"]: metric["value"] for metric in final}
+    assert metrics["surrogate_evaluations_avoided"] > 0
+    assert metrics["surrogate_observations"] + metrics["surrogate_evaluations_avoided"] == 100 * 5
+    assert metrics["surrogate_audits"] > 0 and metrics["surrogate_hit_rate"] > 0.5
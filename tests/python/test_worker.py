@@ -0,0 +1,43 @@
+import io
+import json
+import threading
+
+from orchestrator_py.config import Settings
+from orchestrator_py.util.events import StreamSink
+from orchestrator_py.worker import OrchestratorWorker
+
+
+def test_worker_tags_events_with_session_ids():
+    settings = Settings(*([None] * 10))
+    worker = OrchestratorWorker(settings=settings, max_sessions=2)
+    output = io.StringIO()
+    frames = [
+        json.dumps({"sessionId": sid, "payload": {"task": "t", "mode": "SAFE", "variants": 1, "seed": 3}})
+        for sid in ("a", "b")
+    ]
+    worker.serve_lines(frames + ["not json"], StreamSink(output))
+    worker.shutdown()
+
+    events = [json.loads(line) for line in output.getvalue().splitlines()]
+    completed = {event["sessionId"] for event in events if event["type"] == "complete"}
+    assert completed == {"a", "b"}
+    assert any(event["type"] == "error" and event["sessionId"] == "worker" for event in events)
+
+
+def test_worker_cancels_sessions_still_waiting_for_a_thread():
+    settings = Settings(*([None] * 10))
+    worker = OrchestratorWorker(settings=settings, max_sessions=1)
+    output = io.StringIO()
+    busy = threading.Event()
+    worker.executor.submit(busy.wait)
+    future = worker.submit("queued", {"task": "t", "mode": "SAFE", "variants": 1, "seed": 3}, StreamSink(output))
+    worker.cancel("queued")
+    worker.cancel("unknown")
+    busy.set()
+    future.result()
+    worker.shutdown()
+
+    events = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [event["type"] for event in events] == ["log", "complete"]
+    assert events[-1]["payload"] == {"status": "cancelled"}
+    assert not worker._cancelled and not worker._queued